@@ -0,0 +1,360 @@
+"""
+Local JSON API over the model, for browser dashboards and editor plugins.
+
+A stdlib threaded HTTP server bound to 127.0.0.1. Every response carries an
+ETag built from the model's change counters (DataManager.get_versions()),
+so a poll with If-None-Match gets an empty 304 without touching the data.
+Model calls go through 'call' (in the app: run on the GUI thread, so they
+are serialized with the GUI) and 'on_change' runs after every change, e.g.
+to refresh the open window.
+
+    GET  /api/versions
+    GET  /api/categories
+    GET  /api/tasks?date=YYYY-MM-DD                  (default: today)
+    POST /api/tasks/<task id>/toggle                 {"date": ..., "completed": true|false}
+    GET  /api/tasks/<task id>/stats?date=&days=30
+    GET  /api/analytics/progress?end=&days=30
+    GET  /api/analytics/allocation?start=&end=       (both omitted: a typical week)
+    GET  /api/analytics/streaks?date=&days=30&limit=5
+    GET  /api/search?q=...&limit=30
+
+POSTs must send 'Content-Type: application/json', which browsers cannot do
+cross-site without a preflight; only localhost origins pass the preflight.
+
+Run without the app:  python -m app.api_server --port 8765
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from app.models.data_manager import DataManager, ExternalChangeError
+from app.models.data_lock import DataLockError
+
+ENV_VAR = "ZENITH_API"
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024
+_LOCAL_HOSTS = ("127.0.0.1", "localhost")
+_LOCAL_ORIGIN = re.compile(r"^https?://(127\.0\.0\.1|localhost)(:\d+)?$")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Parameters ---
+def _date(params: dict, name: str, default=None) -> date:
+    text = params.get(name)
+    if text is None:
+        return default or date.today()
+    try:
+        return date.fromisoformat(text)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"'{name}' must be a YYYY-MM-DD date.")
+
+
+def _int(params: dict, name: str, default: int, low: int = 1, high: int = 3660) -> int:
+    text = params.get(name)
+    if text is None:
+        return default
+    try:
+        value = int(text)
+    except ValueError:
+        raise ApiError(400, f"'{name}' must be a whole number.")
+    if not low <= value <= high:
+        raise ApiError(400, f"'{name}' must be between {low} and {high}.")
+    return value
+
+
+class ApiServer:
+    """Serves the model on http://127.0.0.1:<port>/api/ from a background thread."""
+
+    def __init__(self, model: DataManager, port: int = DEFAULT_PORT, call=None, on_change=None):
+        self.model = model
+        self.port = port
+        self.call = call or self._call_locked
+        self.on_change = on_change
+        self._instance = os.urandom(3).hex()  # ETags don't survive a restart
+        self._model_lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        # (method, path pattern, handler); handlers get (params, *path groups)
+        self._routes = [
+            ("GET", r"/api/versions", self._versions),
+            ("GET", r"/api/categories", self._categories),
+            ("GET", r"/api/tasks", self._tasks),
+            ("POST", r"/api/tasks/([^/]+)/toggle", self._toggle),
+            ("GET", r"/api/tasks/([^/]+)/stats", self._task_stats),
+            ("GET", r"/api/analytics/progress", self._progress),
+            ("GET", r"/api/analytics/allocation", self._allocation),
+            ("GET", r"/api/analytics/streaks", self._streaks),
+            ("GET", r"/api/search", self._search),
+        ]
+        self._routes = [(method, re.compile(pattern + "$"), handler)
+                        for method, pattern, handler in self._routes]
+
+    # --- Control ---
+    def start(self):
+        """Starts serving; raises OSError if the port is taken."""
+        if self._httpd is not None:
+            return
+        handler = type("Handler", (_RequestHandler,), {"api": self})
+        self._httpd = ThreadingHTTPServer((HOST, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]  # Resolved if 0 was asked for
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="api-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=1)
+        self._httpd = self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{HOST}:{self.port}/api/"
+
+    def _call_locked(self, fn):
+        """Default 'call' when there is no GUI: one model call at a time."""
+        with self._model_lock:
+            return fn()
+
+    # --- Requests ---
+    def etag(self) -> str:
+        """Changes whenever the model does (and at midnight, for 'today' defaults)."""
+        versions = self.model.get_versions()
+        return '"{}-{}-{}-{}-{}-{}"'.format(
+            self._instance, versions["routines"], versions["progress"],
+            versions["categories"], versions["recurrence"], date.today().toordinal())
+
+    def handle(self, method: str, path: str, query: dict, body: dict, if_none_match=None):
+        """Returns (status, payload or None, etag)."""
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            raise ApiError(404, f"No endpoint at {path}.")
+        if route_method != method:
+            raise ApiError(405, f"Use {route_method} for {path}.")
+        args = [unquote(group) for group in match.groups()]
+
+        # Completions saved by another program (e.g. the command line)
+        if self.model.progress_changed_on_disk():
+            self.call(self._sync_progress)
+
+        if method == "GET":
+            etag = self.etag()
+            if if_none_match == etag:
+                return 304, None, etag
+            return (200,) + self.call(lambda: (handler(query, *args), self.etag()))
+
+        def mutate():
+            result = handler(body, *args)
+            if self.on_change:
+                self.on_change()
+            return result, self.etag()
+        return (200,) + self.call(mutate)
+
+    def _sync_progress(self):
+        if self.model.reload_progress_if_changed() and self.on_change:
+            self.on_change()
+
+    # --- Endpoints (run through 'call') ---
+    def _versions(self, params):
+        return self.model.get_versions()
+
+    def _categories(self, params):
+        return [category.to_dict() for category in self.model.get_categories()]
+
+    def _tasks(self, params):
+        target = _date(params, "date")
+        tasks = self.model.get_tasks_for_display(target)
+        completed = sum(1 for task in tasks if task.completed)
+        return {
+            "date": target.isoformat(),
+            "template": self.model.get_template_name_for_date(target),
+            "completed": completed,
+            "total": len(tasks),
+            "progress": int(completed / len(tasks) * 100) if tasks else 0,
+            "tasks": [task.to_dict() for task in tasks],
+        }
+
+    def _toggle(self, body, task_id):
+        target = _date(body, "date")
+        task = next((t for t in self.model.get_tasks_for_display(target) if t.id == task_id), None)
+        if task is None:
+            raise ApiError(404, f"Task '{task_id}' is not scheduled on {target.isoformat()}.")
+        wanted = body.get("completed")
+        if wanted is not None and not isinstance(wanted, bool):
+            raise ApiError(400, "'completed' must be true or false.")
+        completed = task.completed
+        if wanted is None or wanted != completed:
+            completed = self.model.toggle_task_completion(target, task_id)
+        return {"date": target.isoformat(), "id": task_id, "completed": completed}
+
+    def _task_stats(self, params, task_id):
+        return self.model.get_task_stats(
+            task_id, _date(params, "date"), _int(params, "days", 30))
+
+    def _progress(self, params):
+        return self.model.get_progress_for_date_range(
+            _date(params, "end"), _int(params, "days", 30))
+
+    def _allocation(self, params):
+        if ("start" in params) != ("end" in params):
+            raise ApiError(400, "Give both 'start' and 'end', or neither.")
+        if "start" not in params:
+            return self.model.get_allocated_minutes_by_category()
+        start, end = _date(params, "start"), _date(params, "end")
+        if end < start or (end - start) > timedelta(days=36600):
+            raise ApiError(400, "'end' must be on or after 'start' (at most 100 years).")
+        return self.model.get_allocated_minutes_by_category(start, end)
+
+    def _streaks(self, params):
+        return self.model.get_streak_report(
+            _date(params, "date"), _int(params, "days", 30), _int(params, "limit", 5, high=100))
+
+    def _search(self, params):
+        return self.model.search_tasks(
+            params.get("q", ""), date.today(), _int(params, "limit", 30, high=500))
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    api = None  # Set on the per-server subclass
+    server_version = "ZenithAPI/1"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_OPTIONS(self):
+        """CORS preflight, answered for localhost pages only."""
+        if not self._local_origin():
+            self._send(403, {"error": "Origin not allowed."})
+            return
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Methods", "GET, POST")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, If-None-Match")
+        self.send_header("Access-Control-Max-Age", "600")
+        self._cors_headers()
+        self.end_headers()
+
+    def _dispatch(self, method: str):
+        try:
+            host = (self.headers.get("Host") or "").rsplit(":", 1)[0]
+            if host not in _LOCAL_HOSTS:  # DNS rebinding
+                raise ApiError(403, "Host not allowed.")
+            url = urlsplit(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            body = self._read_body() if method == "POST" else {}
+            status, payload, etag = self.api.handle(
+                method, url.path.rstrip("/") or "/", query, body,
+                self.headers.get("If-None-Match"))
+        except ApiError as e:
+            self._send(e.status, {"error": str(e)})
+        except ExternalChangeError as e:
+            self._send(409, {"error": str(e)})
+        except (DataLockError, TimeoutError) as e:
+            self._send(503, {"error": str(e)})
+        except Exception as e:
+            print(f"API error on {method} {self.path}: {e!r}", file=sys.stderr)
+            self._send(500, {"error": "Internal error."})
+        else:
+            self._send(status, payload, etag)
+
+    def _read_body(self) -> dict:
+        if self.headers.get_content_type() != "application/json":
+            raise ApiError(415, "POST requests must be 'application/json'.")
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ApiError(400, "Invalid Content-Length.")
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "Request body too large.")
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            body = json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ApiError(400, "Request body is not valid JSON.")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be a JSON object.")
+        return body
+
+    def _send(self, status: int, payload, etag: str = None):
+        raw = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self._cors_headers()
+        self.end_headers()
+        if raw:
+            self.wfile.write(raw)
+
+    def _local_origin(self):
+        origin = self.headers.get("Origin")
+        return origin if origin and _LOCAL_ORIGIN.match(origin) else None
+
+    def _cors_headers(self):
+        origin = self._local_origin()
+        if origin:
+            self.send_header("Access-Control-Allow-Origin", origin)
+            self.send_header("Access-Control-Expose-Headers", "ETag")
+            self.send_header("Vary", "Origin")
+
+    def log_message(self, format, *args):
+        pass  # Polling would flood the console
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.api_server", description="Serve the routines as a local JSON API.")
+    parser.add_argument("--data-dir", default="data",
+                        help="Directory containing the app's JSON files (default: data)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port on 127.0.0.1 (default: {DEFAULT_PORT})")
+    args = parser.parse_args(argv)
+
+    model = DataManager(
+        routines_file=os.path.join(args.data_dir, 'routines.json'),
+        progress_file=os.path.join(args.data_dir, 'progress.json'),
+        categories_file=os.path.join(args.data_dir, 'categories.json'),
+        settings_file=os.path.join(args.data_dir, 'settings.json')
+    )
+    server = ApiServer(model, args.port)
+    try:
+        server.start()
+    except OSError as e:
+        print(f"error: cannot listen on port {args.port}: {e}", file=sys.stderr)
+        return 1
+    print(f"Serving {server.url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        model.flush_analytics_cache()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
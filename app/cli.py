@@ -0,0 +1,183 @@
+"""
+Command line access to the routines, for scripts and status bars. Only the
+model is imported (no Qt), so a command runs in a few tens of milliseconds.
+
+Examples:
+    python -m app.cli list                          # today's tasks
+    python -m app.cli list --date yesterday --json
+    python -m app.cli toggle "Morning run"          # by name or task ID
+    python -m app.cli toggle task-42 --done         # no-op if already done
+    python -m app.cli stats --days 7 --json
+
+Saves take the same data lock and atomic write as the app, so this is safe
+while the app is open; the app picks up the change on its next save.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date, timedelta
+
+from app.models.data_manager import DataManager, ExternalChangeError
+from app.models.data_lock import DataLockError
+
+RELATIVE_DATES = {"today": 0, "yesterday": -1, "tomorrow": 1}
+
+
+class CliError(Exception):
+    """A user-facing failure; printed without a traceback."""
+
+
+def parse_date(text: str) -> date:
+    """'today', 'yesterday', 'tomorrow' or YYYY-MM-DD."""
+    if text in RELATIVE_DATES:
+        return date.today() + timedelta(days=RELATIVE_DATES[text])
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date '{text}', expected YYYY-MM-DD, today, yesterday or tomorrow")
+
+
+def open_model(data_dir: str) -> DataManager:
+    if not os.path.isdir(data_dir):
+        raise CliError(f"No data directory at '{data_dir}' (run the app once first).")
+    return DataManager(
+        routines_file=os.path.join(data_dir, 'routines.json'),
+        progress_file=os.path.join(data_dir, 'progress.json'),
+        categories_file=os.path.join(data_dir, 'categories.json'),
+        settings_file=os.path.join(data_dir, 'settings.json')
+    )
+
+
+def find_task(tasks: list, query: str):
+    """The day's task with this ID or name (exact, else a unique partial match)."""
+    for task in tasks:
+        if task.id == query:
+            return task
+    wanted = query.casefold()
+    exact = [task for task in tasks if task.name.casefold() == wanted]
+    matches = exact or [task for task in tasks if wanted in task.name.casefold()]
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        raise CliError(f"No task matching '{query}' on this day.")
+    names = ", ".join(f"{task.name} ({task.id})" for task in matches)
+    raise CliError(f"'{query}' matches several tasks: {names}")
+
+
+def _progress(tasks: list) -> dict:
+    completed = sum(1 for task in tasks if task.completed)
+    return {"completed": completed, "total": len(tasks),
+            "progress": int(completed / len(tasks) * 100) if tasks else 0}
+
+
+def _task_line(task) -> str:
+    data = task.to_dict()
+    times = f"{data['start_time'] or '--:--'}-{data['end_time'] or '--:--'}"
+    return f"[{'x' if task.completed else ' '}] {times}  {task.name}  ({task.category_name})"
+
+
+# --- Commands ---
+def cmd_list(model: DataManager, args) -> dict:
+    tasks = model.get_tasks_for_display(args.date)
+    result = {
+        "date": args.date.isoformat(),
+        "template": model.get_template_name_for_date(args.date),
+        **_progress(tasks),
+        "tasks": [task.to_dict() for task in tasks],
+    }
+    if not args.json:
+        print(f"{args.date:%A, %Y-%m-%d}: {result['completed']}/{result['total']} "
+              f"done ({result['progress']}%)")
+        for task in tasks:
+            print(_task_line(task))
+    return result
+
+
+def cmd_toggle(model: DataManager, args) -> dict:
+    task = find_task(model.get_tasks_for_display(args.date), args.task)
+    if args.state is None or args.state != task.completed:
+        task.completed = model.toggle_task_completion(args.date, task.id)
+    result = {"date": args.date.isoformat(), "task": task.to_dict()}
+    if not args.json:
+        print(f"{'Done' if task.completed else 'Not done'}: {task.name} ({args.date.isoformat()})")
+    return result
+
+
+def cmd_stats(model: DataManager, args) -> dict:
+    end = args.date
+    start = end - timedelta(days=args.days - 1)
+    daily = model.get_progress_for_date_range(end, args.days)
+    scheduled = [pct for pct in daily.values() if pct >= 0]
+    streaks = model.get_streak_report(end, args.days)["overall"]
+    allocation = model.get_allocated_minutes_by_category(start, end)
+    model.flush_analytics_cache()
+
+    result = {
+        "date": end.isoformat(),
+        "day": _progress(model.get_tasks_for_display(end)),
+        "range": {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "days": args.days,
+            "average_progress": round(sum(scheduled) / len(scheduled)) if scheduled else None,
+            "daily": dict(sorted(daily.items())),
+        },
+        "streak": streaks,
+        "allocated_minutes": dict(sorted(allocation.items(), key=lambda item: -item[1])),
+    }
+    if not args.json:
+        day, span = result["day"], result["range"]
+        print(f"{end.isoformat()}: {day['completed']}/{day['total']} done ({day['progress']}%)")
+        average, rate = span["average_progress"], streaks["completion_rate"]
+        print(f"Last {args.days} days: "
+              f"{'-' if average is None else f'{average}%'} average daily progress, "
+              f"{'-' if rate is None else f'{rate}%'} of days fully done")
+        print(f"Streak: {streaks['current_streak']} days (longest {streaks['longest_streak']})")
+        if allocation:
+            print("Time allocated:")
+            for name, minutes in result["allocated_minutes"].items():
+                print(f"  {name:<20} {minutes / 60:7.1f} h")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli", description="Work with your routines without the GUI.")
+    parser.add_argument("--data-dir", default="data",
+                        help="Directory containing the app's JSON files (default: data)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List a day's tasks")
+    toggle_parser = commands.add_parser("toggle", help="Toggle a task's completion")
+    toggle_parser.add_argument("task", help="Task ID or (part of) its name")
+    state = toggle_parser.add_mutually_exclusive_group()
+    state.add_argument("--done", dest="state", action="store_const", const=True,
+                       help="Mark as done instead of toggling")
+    state.add_argument("--not-done", dest="state", action="store_const", const=False,
+                       help="Mark as not done instead of toggling")
+    stats_parser = commands.add_parser("stats", help="Completion, streak and time allocation")
+    stats_parser.add_argument("--days", type=int, default=30,
+                              help="Length of the period ending on --date (default: 30)")
+    for sub in (list_parser, toggle_parser, stats_parser):
+        sub.add_argument("--date", type=parse_date, default=date.today(),
+                         help="YYYY-MM-DD, today, yesterday or tomorrow (default: today)")
+        sub.add_argument("--json", action="store_true", help="Print JSON instead of text")
+    args = parser.parse_args(argv)
+    if args.command == "stats" and args.days < 1:
+        parser.error("--days must be at least 1")
+
+    command = {"list": cmd_list, "toggle": cmd_toggle, "stats": cmd_stats}[args.command]
+    try:
+        result = command(open_model(args.data_dir), args)
+    except (CliError, ExternalChangeError, DataLockError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,15 @@
 from app.views.routine_editor_dialog import RoutineEditorDialog
 from app.views.analytics_view_dialog import AnalyticsViewDialog
+from app.views.category_manager_dialog import CategoryManagerDialog
 from app.utils.theme import get_theme, THEME_PALETTES
-from datetime import date
-from PyQt6.QtWidgets import QMessageBox  # Import QMessageBox here
+from app.utils.icons import get_icon
+from app.utils.reminders import ReminderScheduler, REMINDER_START
+from app.models.time_utils import format_time_12h
+from app.models.routine_session import StaleSessionError
+from app.models.data_manager import ExternalChangeError
+from app.models.data_lock import DataLockError
+from datetime import date, timedelta
+from PyQt6.QtWidgets import QMessageBox, QSystemTrayIcon  # Import QMessageBox here
 
 
 class AppController:
@@ -11,6 +18,10 @@ class AppController:
     def __init__(self, model, view):
         self.model = model
         self.view = view
+        self.reminders = ReminderScheduler(
+            self.model.get_tasks_for_display, parent=self.view)
+        self.tray_icon = None
+        self.view.stats_provider = self._task_stats
         self._connect_signals()
 
     def _connect_signals(self):
@@ -20,6 +31,9 @@ class AppController:
         self.view.completion_toggled.connect(self.toggle_completion)
         self.view.theme_changed.connect(self.handle_theme_change)
         self.view.analytics_requested.connect(self.show_analytics_dialog)
+        self.view.reminders_toggled.connect(self.set_reminders_enabled)
+        self.view.search_changed.connect(self.search_tasks)
+        self.reminders.reminder_due.connect(self._show_reminder)
 
     def init_app(self):
         """Loads initial settings and populates the view."""
@@ -32,6 +46,11 @@ class AppController:
         # THEN load the initial tasks
         self.update_task_list()
 
+        settings = self.model.load_settings()
+        reminders_enabled = settings.get("reminders_enabled", False)
+        self.view.set_reminders_enabled(reminders_enabled)
+        self._apply_reminders(reminders_enabled)
+
     def handle_theme_change(self, theme_name: str):
         """Applies the selected theme stylesheet and updates dynamic elements."""
         stylesheet = get_theme(theme_name)
@@ -39,28 +58,65 @@ class AppController:
         # --- FIX: Re-enabled update_theme_elements ---
         # Update icons based on the new theme
         self.view.update_theme_elements(theme_name)
-        self.model.save_settings({"theme": theme_name})  # Save preference
+        self._save(self.model.save_settings,
+                   {**self.model.load_settings(), "theme": theme_name})  # Save preference
+
+    def _save(self, change, *args) -> bool:
+        """Runs a model change that writes the data files; False if refused."""
+        try:
+            change(*args)
+        except (ExternalChangeError, DataLockError) as e:
+            self._save_failed(e)
+            return False
+        return True
+
+    def _save_failed(self, error):
+        """
+        Another program changed or is writing the data files, so nothing was
+        overwritten or changed in memory: tells the user and shows what is on
+        disk.
+        """
+        if isinstance(error, ExternalChangeError):
+            QMessageBox.warning(self.view, "Not Saved",
+                                f"{error}\nThe latest data has been loaded.")
+        else:
+            QMessageBox.warning(self.view, "Not Saved", f"{error}\nPlease try again.")
+        try:
+            self.model.reload()
+        except DataLockError:
+            pass  # Still being written; the next save checks again
+        self.update_task_list()
+        self.reminders.refresh()
 
     def update_task_list(self):
         # ... (same as before) ...
         current_date = self.view.get_current_date().toPyDate()
         tasks = self.model.get_tasks_for_display(current_date)
 
-        completed_count = sum(1 for task in tasks if task.get('completed'))
+        completed_count = sum(1 for task in tasks if task.completed)
         total_tasks = len(tasks)
         progress = int((completed_count / total_tasks * 100)
                        ) if total_tasks > 0 else 0
 
         self.view.display_tasks(tasks, progress)
 
+    def _task_stats(self, task_id: str) -> dict:
+        """A task card's tooltip stats, as of today whichever day is shown."""
+        return self.model.get_task_stats(task_id, date.today())
+
+    def refresh(self):
+        """Shows the model's current data after a change made elsewhere (e.g. the API)."""
+        self.update_task_list()
+        self.reminders.refresh()
+
     def show_routine_editor(self):
-        # ... (same as before) ...
-        routines_copy = self.model.get_all_routines().copy()
+        # The dialog edits a copy-on-write session, committed in one write
+        session = self.model.begin_routine_edit()
         categories = self.model.get_categories()
         uncat_id = self.model.get_uncategorized_id()
 
         dialog = RoutineEditorDialog(
-            routines_data=routines_copy,
+            routines_data=session,
             categories=categories,
             uncategorized_id=uncat_id,
             parent=self.view
@@ -68,48 +124,115 @@ class AppController:
         dialog.controller = self
 
         if dialog.exec():
-            updated_routines = dialog.get_updated_routines()
-            routines_changed = False
-            for day_name, tasks in updated_routines.items():
-                if self.model.routines.get(day_name) != tasks:
-                    self.model.save_routine_for_day(day_name, tasks)
-                    routines_changed = True
-            if routines_changed:
+            try:
+                changed = self.model.commit_routine_edit(
+                    dialog.get_updated_routines())
+            except StaleSessionError as e:
+                QMessageBox.warning(self.view, "Routines Not Saved", str(e))
+                return
+            except (ExternalChangeError, DataLockError) as e:
+                self._save_failed(e)
+                return
+            if changed:
                 self.update_task_list()
+                self.reminders.refresh()
 
-    def save_categories_and_update(self, categories: list):
-        # ... (same as before) ...
-        self.model.save_categories(categories)
-        self.update_task_list()
+    def search_tasks(self, query: str):
+        if query:
+            self.view.show_search_results(
+                self.model.search_tasks(query, date.today()))
+
+    def search_template_counts(self, query: str) -> dict:
+        return self.model.search_template_counts(query)
+
+    def manage_categories(self, parent=None) -> CategoryManagerDialog:
+        """Runs the category manager; returns it so callers can see what changed."""
+        dialog = CategoryManagerDialog(
+            self.model, self.model.get_uncategorized_id(), parent=parent or self.view)
+        dialog.exec()
+        if dialog.changed:
+            self.update_task_list()
+        return dialog
 
     def toggle_completion(self, task_id: str, is_completed: bool):
         # ... (same as before) ...
         current_date = self.view.get_current_date().toPyDate()
-        self.model.toggle_task_completion(current_date, task_id)
+        if not self._save(self.model.toggle_task_completion, current_date, task_id):
+            return
         self.update_task_list()
+        self.reminders.refresh()
+
+    # --- Reminders ---
+    def set_reminders_enabled(self, enabled: bool):
+        """Turns task reminders on or off and remembers the choice."""
+        self._save(self.model.save_settings,
+                   {**self.model.load_settings(), "reminders_enabled": enabled})
+        self._apply_reminders(enabled)
+
+    def _apply_reminders(self, enabled: bool):
+        if not enabled:
+            self.reminders.stop()
+            if self.tray_icon:
+                self.tray_icon.hide()
+            return
+        self.reminders.lead_minutes = self.model.load_settings().get(
+            "reminder_lead_minutes", 10)
+        self.reminders.start()
+        if self.tray_icon is None and QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(get_icon("bell_light"), self.view)
+            self.tray_icon.setToolTip("Zenith Routine Dashboard")
+            self.tray_icon.activated.connect(lambda _: self.view.activateWindow())
+        if self.tray_icon:
+            self.tray_icon.show()
+
+    def _show_reminder(self, kind: str, task):
+        name = task.name or 'Task'
+        if kind == REMINDER_START:
+            title = f"Up next: {name}"
+            message = f"Starts at {format_time_12h(task.start_minutes)}"
+        else:
+            title = f"Time's up: {name}"
+            message = f"Scheduled to end at {format_time_12h(task.end_minutes)}"
+        if self.tray_icon and self.tray_icon.isVisible():
+            self.tray_icon.showMessage(
+                title, message, QSystemTrayIcon.MessageIcon.Information)
+        else:
+            self.view.show_notice(title, message)
+
+    def _load_category_allocation(self, today: date) -> dict:
+        """Allocation minutes per category for each pie chart period."""
+        month_start = today.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        return {
+            "Typical Week": self.model.get_allocated_minutes_by_category(),
+            "This Month": self.model.get_allocated_minutes_by_category(
+                month_start, next_month - timedelta(days=1)),
+        }
 
     def show_analytics_dialog(self):
         # ... (same as before, including error handling) ...
         try:
             today = date.today()
-            weekly_progress = self.model.get_progress_for_date_range(today, 7)
-            category_allocation = self.model.get_allocated_time_by_category()
-            heatmap_progress = self.model.get_progress_for_date_range(
-                today, 35)
+            heatmap_years = self.model.get_tracked_years(today)
             current_theme_name = self.model.load_settings().get("theme", "dark")
             theme_palette = THEME_PALETTES.get(current_theme_name)
             categories = self.model.get_categories()
 
             dialog = AnalyticsViewDialog(
-                weekly_data=weekly_progress,
-                category_data=category_allocation,
-                heatmap_data=heatmap_progress,
+                # Loaders run in worker threads when their tab is first shown
+                progress_provider=self.model.get_progress_for_date_range,
+                first_tracked_date=self.model.get_first_tracked_date(today),
+                category_loader=lambda: self._load_category_allocation(today),
+                heatmap_years=heatmap_years,
+                streak_loader=lambda: self.model.get_streak_report(today),
                 categories=categories,
                 theme_palette=theme_palette,
                 parent=self.view
             )
             dialog.setStyleSheet(get_theme(current_theme_name))
             dialog.exec()
+            # Persist whatever the tabs computed for the next open
+            self.model.flush_analytics_cache()
         except ImportError:
             QMessageBox.critical(self.view, "Error",
                                  "PyQt6-Charts library is required for analytics but not found.\n"
@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import threading
+
+
+class AnalyticsCache:
+    """
+    A small persisted cache for analytics results.
+
+    Each entry is stored under a key (e.g. "progress_range:2024-05-01:7")
+    together with the fingerprint of the data it was computed from. A lookup
+    with a different fingerprint is a miss, and the entry is replaced on the
+    next put. When the serialized entries exceed 'max_bytes', the least
+    recently used ones are evicted.
+    """
+
+    def __init__(self, cache_file: str, max_bytes: int = 2_000_000):
+        self.cache_file = cache_file
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()  # Loaders run in worker threads
+        self._entries = {}
+        self._clock = 0  # Monotonic "last used" counter for LRU
+        self._total_bytes = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._entries = data.get("entries", {})
+            self._clock = data.get("clock", 0)
+        except (json.JSONDecodeError, OSError, AttributeError):
+            self._entries = {}
+            self._clock = 0
+        self._total_bytes = sum(entry.get("size", 0)
+                                for entry in self._entries.values())
+
+    def get(self, key: str, fingerprint: str, default=None):
+        """Returns the cached value, or 'default' if missing or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.get("fingerprint") != fingerprint:
+                return default
+            self._clock += 1
+            entry["used"] = self._clock
+            self._dirty = True
+            return entry["value"]
+
+    def put(self, key: str, fingerprint: str, value):
+        size = len(json.dumps(value, separators=(',', ':')))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._total_bytes -= old.get("size", 0)
+            if size > self.max_bytes:
+                return
+            self._clock += 1
+            self._entries[key] = {"fingerprint": fingerprint, "value": value,
+                                  "size": size, "used": self._clock}
+            self._total_bytes += size
+            self._evict()
+            self._dirty = True
+
+    def _evict(self):
+        """Drops least recently used entries until under the size limit."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key in sorted(self._entries, key=lambda k: self._entries[k]["used"]):
+            self._total_bytes -= self._entries.pop(key)["size"]
+            if self._total_bytes <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._total_bytes = 0
+            self._dirty = True
+
+    def flush(self):
+        """Writes the cache to disk if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"clock": self._clock, "entries": self._entries}
+            text = json.dumps(data, separators=(',', ':'))
+            self._dirty = False
+        # Atomic (unique temp file + rename), like the data files. The app,
+        # the command line and the API server may all flush; being a cache,
+        # the last complete write wins and no data lock is taken.
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(
+                prefix=os.path.basename(self.cache_file) + '.',
+                suffix='.tmp', dir=os.path.dirname(self.cache_file) or '.')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.cache_file)
+        except OSError as e:
+            print(f"Could not write analytics cache: {e}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
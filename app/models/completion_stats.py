@@ -0,0 +1,184 @@
+from array import array
+from datetime import date, timedelta
+
+
+class CompletionStats:
+    """
+    Per-task and overall completion analytics backed by prefix-sum arrays.
+
+    Day 'i' is 'origin + i days'. For every task ID the engine keeps:
+      - sched[i+1] - sched[i]: 1 if the task was scheduled on day i
+      - done[i+1] - done[i]:   1 if it was scheduled and completed on day i
+      - run[i]: length of the completion streak ending on day i (days on
+        which the task is not scheduled neither break nor extend a streak)
+    so any range rate is O(1) after a single build pass. The same arrays
+    exist for the whole plan (key None), where a day counts as "done" when
+    every scheduled task was completed.
+    """
+
+    OVERALL = None
+
+    def __init__(self, origin: date, end: date, task_ids: set, scheduled_for, progress: dict):
+        # scheduled_for(day) -> set of task IDs scheduled on that date
+        self.origin = origin
+        self.num_days = 0
+        self._scheduled_for = scheduled_for
+        self._progress = progress
+
+        self._sched = {tid: array('i', [0]) for tid in task_ids}
+        self._done = {tid: array('i', [0]) for tid in task_ids}
+        self._run = {tid: array('i') for tid in task_ids}
+        self._longest = dict.fromkeys(task_ids, 0)
+        self._sched[self.OVERALL] = array('i', [0])
+        self._done[self.OVERALL] = array('i', [0])
+        self._run[self.OVERALL] = array('i')
+        self._longest[self.OVERALL] = 0
+        # Overall per-day counts, needed to re-evaluate a day on toggle
+        self._day_total = array('i')
+        self._day_done = array('i')
+
+        self._extend_to(end)
+
+    # --- Build ---
+    def _extend_to(self, end: date):
+        """Appends days up to and including 'end'."""
+        while self.origin + timedelta(days=self.num_days) <= end:
+            self._append_day(self.origin + timedelta(days=self.num_days))
+
+    def _append_day(self, day: date):
+        i = self.num_days
+        scheduled = self._scheduled_for(day)
+        completed = set(self._progress.get(day.isoformat(), []))
+
+        done_count = 0
+        for tid in self._run:
+            if tid is self.OVERALL:
+                continue
+            is_scheduled = tid in scheduled
+            is_done = is_scheduled and tid in completed
+            done_count += is_done
+            self._push(tid, i, is_scheduled, is_done)
+
+        self._day_total.append(len(scheduled))
+        self._day_done.append(done_count)
+        has_tasks = len(scheduled) > 0
+        self._push(self.OVERALL, i, has_tasks,
+                   has_tasks and done_count == len(scheduled))
+        self.num_days += 1
+
+    def _push(self, key, i: int, is_scheduled: bool, is_done: bool):
+        self._sched[key].append(self._sched[key][-1] + is_scheduled)
+        self._done[key].append(self._done[key][-1] + is_done)
+        previous = self._run[key][i - 1] if i > 0 else 0
+        run = previous + 1 if is_done else (0 if is_scheduled else previous)
+        self._run[key].append(run)
+        if run > self._longest[key]:
+            self._longest[key] = run
+
+    # --- Incremental updates ---
+    def covers(self, day: date) -> bool:
+        return day >= self.origin
+
+    def apply_toggle(self, day: date, task_id: str, is_completed: bool):
+        """Updates the arrays after 'task_id' was (un)checked on 'day'."""
+        if task_id not in self._run or not self.covers(day):
+            return
+        self._extend_to(day)
+        i = (day - self.origin).days
+        if not self._is_scheduled(task_id, i):
+            return
+        if self._is_done(task_id, i) == is_completed:
+            return
+
+        delta = 1 if is_completed else -1
+        self._shift_done(task_id, i, delta)
+        self._day_done[i] += delta
+
+        # Re-evaluate whether the whole day is now complete
+        total = self._day_total[i]
+        day_complete = total > 0 and self._day_done[i] == total
+        if self._is_done(self.OVERALL, i) != day_complete:
+            self._shift_done(self.OVERALL, i, 1 if day_complete else -1)
+
+    def _shift_done(self, key, i: int, delta: int):
+        done = self._done[key]
+        for j in range(i + 1, len(done)):
+            done[j] += delta
+        self._recompute_runs(key, i)
+
+    def _recompute_runs(self, key, start: int):
+        """Recomputes streak runs from 'start' until they stop changing."""
+        run = self._run[key]
+        previous = run[start - 1] if start > 0 else 0
+        for j in range(start, self.num_days):
+            if self._is_done(key, j):
+                value = previous + 1
+            elif self._is_scheduled(key, j):
+                value = 0
+            else:
+                value = previous
+            if j > start and value == run[j]:
+                break
+            run[j] = value
+            previous = value
+        self._longest[key] = max(run) if len(run) else 0
+
+    # --- Queries ---
+    def _is_scheduled(self, key, i: int) -> bool:
+        sched = self._sched[key]
+        return sched[i + 1] - sched[i] > 0
+
+    def _is_done(self, key, i: int) -> bool:
+        done = self._done[key]
+        return done[i + 1] - done[i] > 0
+
+    def _clamp_range(self, start: date, end: date):
+        self._extend_to(end)
+        s = max((start - self.origin).days, 0)
+        e = (end - self.origin).days
+        return s, e
+
+    def counts(self, task_id, start: date, end: date):
+        """(completed, scheduled) for 'task_id' (None = overall) in a range."""
+        if task_id not in self._run:
+            return 0, 0
+        s, e = self._clamp_range(start, end)
+        if e < s:
+            return 0, 0
+        done, sched = self._done[task_id], self._sched[task_id]
+        return done[e + 1] - done[s], sched[e + 1] - sched[s]
+
+    def completion_rate(self, task_id, start: date, end: date):
+        """Completion percentage in [start, end], or None if never scheduled."""
+        completed, scheduled = self.counts(task_id, start, end)
+        if scheduled == 0:
+            return None
+        return int(completed / scheduled * 100)
+
+    def current_streak(self, task_id, today: date) -> int:
+        """
+        The streak ending today. A task that is scheduled but not yet done
+        today doesn't break the streak until the day is over.
+        """
+        if task_id not in self._run or not self.covers(today):
+            return 0
+        self._extend_to(today)
+        i = (today - self.origin).days
+        if self._is_scheduled(task_id, i) and not self._is_done(task_id, i):
+            return self._run[task_id][i - 1] if i > 0 else 0
+        return self._run[task_id][i]
+
+    def longest_streak(self, task_id) -> int:
+        return self._longest.get(task_id, 0)
+
+    def most_skipped(self, start: date, end: date, limit: int = 5) -> list:
+        """[(task_id, skipped, scheduled)] sorted by skipped count."""
+        results = []
+        for task_id in self._run:
+            if task_id is self.OVERALL:
+                continue
+            completed, scheduled = self.counts(task_id, start, end)
+            if scheduled > completed:
+                results.append((task_id, scheduled - completed, scheduled))
+        results.sort(key=lambda item: (-item[1], -item[2]))
+        return results[:limit]
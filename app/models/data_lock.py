@@ -0,0 +1,88 @@
+"""
+Advisory lock on the data directory.
+
+Every process that writes the data files (the app, the command line tool)
+takes an exclusive OS lock on '<data dir>/.lock' around each read-check-write,
+so two writers never interleave. The lock is re-entrant within a process
+and released by the OS if the holder dies. Qt-free.
+"""
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class DataLockError(RuntimeError):
+    """Raised when another process holds the data lock for too long."""
+
+
+class DataLock:
+    LOCK_NAME = '.lock'
+    POLL_S = 0.02
+
+    def __init__(self, data_dir: str, timeout: float = 5.0):
+        self.path = os.path.join(data_dir, self.LOCK_NAME)
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()  # Server/worker threads share the handle
+        self._depth = 0
+        self._file = None
+
+    def acquire(self):
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise DataLockError("The data files are busy in this process.")
+        if self._depth == 0:
+            try:
+                self._lock_file()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_file()
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    # --- OS lock ---
+    def _lock_file(self):
+        handle = open(self.path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                self._file = handle
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    raise DataLockError(
+                        f"Another program is writing the data files ({self.path}).")
+                time.sleep(self.POLL_S)
+
+    def _unlock_file(self):
+        handle, self._file = self._file, None
+        try:
+            if fcntl:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            handle.close()
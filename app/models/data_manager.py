@@ -1,57 +1,242 @@
+import hashlib
 import json
 import os
+import sys
+import threading
 import uuid
+from bisect import insort
+from contextlib import contextmanager
+from functools import wraps
 from datetime import date, timedelta
+from .completion_stats import CompletionStats
+from .analytics_cache import AnalyticsCache
+from .time_utils import duration_minutes
+from .records import Task, Category, DisplayTask
+from .intervals import find_conflicts, RoutineConflictError
+from .recurrence import RecurrenceIndex, RecurrenceError, validate_rule, WEEKDAYS
+from .routine_session import RoutineEditSession
+from .search_index import SearchIndex
+from .data_lock import DataLock
+
+
+class CategoryError(ValueError):
+    """Raised for an invalid category change (duplicate name, protected category)."""
+
+
+class ExternalChangeError(RuntimeError):
+    """Raised instead of overwriting a data file another program changed."""
+
+    def __init__(self, filepath: str):
+        super().__init__(
+            f"{os.path.basename(filepath)} was changed by another program, so "
+            "this change was not saved.")
+        self.filepath = filepath
+
+
+def _synchronized(method):
+    """
+    Runs a DataManager method under its model lock. Analytics loaders call
+    the model from worker threads while the GUI thread changes it, and the
+    lazily built indexes and caches are not safe to share otherwise.
+    """
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._model_lock:
+            return method(self, *args, **kwargs)
+    return locked
 
 
 class DataManager:
     """Handles loading/saving all app data."""
 
     DEFAULT_CATEGORIES = [
-        {"id": "cat-001", "name": "Uncategorized", "color": "#A0A0B0"},
-        {"id": "cat-002", "name": "Study", "color": "#3B82F6"},
-        {"id": "cat-003", "name": "Work", "color": "#10B981"},
-        {"id": "cat-004", "name": "Health", "color": "#F59E0B"},
-        {"id": "cat-005", "name": "Spiritual", "color": "#8A5CF5"}
+        Category("cat-001", "Uncategorized", "#A0A0B0"),
+        Category("cat-002", "Study", "#3B82F6"),
+        Category("cat-003", "Work", "#10B981"),
+        Category("cat-004", "Health", "#F59E0B"),
+        Category("cat-005", "Spiritual", "#8A5CF5")
     ]
-    UNCATEGORIZED_ID = DEFAULT_CATEGORIES[0]["id"]
+    UNCATEGORIZED_ID = DEFAULT_CATEGORIES[0].id
+    WEEKDAYS = WEEKDAYS
 
     def __init__(self, routines_file, progress_file, categories_file, settings_file):
         self.routines_file = routines_file
         self.progress_file = progress_file
         self.categories_file = categories_file
         self.settings_file = settings_file
+        # Recurrence rules live next to the routines
+        self.recurrence_file = os.path.join(
+            os.path.dirname(self.routines_file), 'recurrence.json')
 
         self._ensure_data_dir_exists()
-
-        self.routines = self._load_json(
-            self.routines_file, default={"default": []})
+        # Held around every check-and-write, shared with other processes
+        self._lock = DataLock(os.path.dirname(self.routines_file))
+        # Held by every method that reads derived data or changes the model
+        self._model_lock = threading.RLock()
+
+        # Content digest and (mtime, size) of each data file, kept current on every save
+        self._digests = {}
+        self._signatures = {}
+        with self._lock:
+            self._load_data()
+
+        # Bumped on every change, used to invalidate derived data
+        self._routines_version = 0
+        self._progress_version = 0
+        self._categories_version = 0
+        self._recurrence_version = 0
+        # Date -> template resolution; dropped when rules or template names change
+        self._recurrence_index = None
+        # template name -> {category_id: minutes}, dropped per changed template
+        self._allocation_cache = {}
+        # Streak / completion-rate engine, rebuilt when the schedule changes
+        self._completion_stats = None
+        # Search index and task ID -> sorted completion dates, built on first use
+        self._search_index = None
+        self._completion_dates = None
+        # Persisted analytics results, keyed by data fingerprints
+        self.analytics_cache = AnalyticsCache(os.path.join(
+            os.path.dirname(self.routines_file), 'analytics_cache.json'))
+
+    def _load_data(self):
+        # Records from here on; dicts only in the files (times parsed once)
+        self.routines = {
+            name: [Task.from_dict(task) for task in tasks]
+            for name, tasks in self._load_json(
+                self.routines_file, default={"default": []}).items()
+        }
         self.progress = self._load_json(self.progress_file, default={})
-        self.categories = self._load_json(
-            self.categories_file, default=self.DEFAULT_CATEGORIES)
+        self.categories = [
+            Category.from_dict(cat) for cat in self._load_json(
+                self.categories_file,
+                default=lambda: [cat.to_dict() for cat in self.DEFAULT_CATEGORIES])
+        ]
+        self._index_categories()
         self.settings = self._load_json(
             self.settings_file, default={"theme": "dark"})
+        self.recurrence_rules = self._load_recurrence_rules()
+
+    def _load_recurrence_rules(self) -> list:
+        """The valid rules from the file; invalid ones are skipped with a warning."""
+        rules = self._load_json(self.recurrence_file, default=[])
+        if not isinstance(rules, list):
+            print(f"Ignoring {self.recurrence_file}: expected a list of rules",
+                  file=sys.stderr)
+            return []
+        valid = []
+        for position, rule in enumerate(rules, 1):
+            try:
+                valid.append(validate_rule(rule if isinstance(rule, dict) else {}))
+            except RecurrenceError as e:
+                print(f"Ignoring recurrence rule {position} in {self.recurrence_file}: {e}",
+                      file=sys.stderr)
+        return valid
+
+    @_synchronized
+    def reload(self):
+        """Re-reads every data file (e.g. after another program changed them)."""
+        with self._lock:
+            self._load_data()
+        self._routines_version += 1
+        self._progress_version += 1
+        self._categories_version += 1
+        self._recurrence_version += 1
+        self._recurrence_index = None
+        self._allocation_cache = {}
+        self._completion_stats = None
+        self._search_index = None
+        self._completion_dates = None
 
     def _ensure_data_dir_exists(self):
         os.makedirs(os.path.dirname(self.routines_file), exist_ok=True)
 
+    @staticmethod
+    def _digest(raw: bytes) -> str:
+        return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+    @staticmethod
+    def _signature(filepath):
+        """(mtime, size) of a file, or None if it doesn't exist."""
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _changed_on_disk(self, filepath) -> bool:
+        """Whether the file differs from what was last loaded or saved here."""
+        signature = self._signature(filepath)
+        if signature == self._signatures.get(filepath):
+            return False
+        try:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b""
+        if self._digest(raw) != self._digests.get(filepath):
+            return True
+        self._signatures[filepath] = signature  # Touched, same content
+        return False
+
     def _load_json(self, filepath, default):
+        self._digests[filepath] = self._digest(b"")
+        self._signatures[filepath] = None
         if not os.path.exists(filepath):
             if callable(default):
                 return default()
             return default
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+                self._signatures[filepath] = (
+                    os.fstat(f.fileno()).st_mtime_ns, len(raw))
+            data = json.loads(raw.decode('utf-8'))
+            self._digests[filepath] = self._digest(raw)
+            return data
+        except (json.JSONDecodeError, UnicodeDecodeError, FileNotFoundError):
             if callable(default):
                 return default()
             return default
 
+    def _write_json(self, filepath, data):
+        """
+        Writes 'data' to 'filepath' atomically (temp file + rename, so a
+        crash never leaves a half-written file) and records its digest.
+        Raises ExternalChangeError instead if another program changed the
+        file since it was loaded, and DataLockError if one is writing now.
+        """
+        raw = json.dumps(data, indent=4).encode('utf-8')
+        with self._lock:
+            if self._changed_on_disk(filepath):
+                raise ExternalChangeError(filepath)
+            temp_path = filepath + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(raw)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, filepath)
+            self._digests[filepath] = self._digest(raw)
+            self._signatures[filepath] = self._signature(filepath)
+
+    @contextmanager
+    def _saving(self, *filepaths):
+        """
+        Holds the data lock around a change and its write, checking first
+        that no other program changed the files: a refused save raises
+        before anything in memory is touched.
+        """
+        with self._lock:
+            for filepath in filepaths:
+                if self._changed_on_disk(filepath):
+                    raise ExternalChangeError(filepath)
+            yield
+
     # --- Routines ---
     def _save_routines(self):
-        with open(self.routines_file, 'w', encoding='utf-8') as f:
-            json.dump(self.routines, f, indent=4)
+        self._write_json(self.routines_file, {
+            day_name: [task.to_dict() for task in tasks]
+            for day_name, tasks in self.routines.items()
+        })
 
     def get_routine_for_day(self, day_name: str):
         return self.routines.get(day_name, self.routines.get("default", []))
@@ -59,51 +244,173 @@ class DataManager:
     def get_all_routines(self):
         return self.routines
 
-    def save_routine_for_day(self, day_name: str, tasks: list):
+    def _resolution_index(self) -> RecurrenceIndex:
+        """The compiled recurrence rules, rebuilt only after a change."""
+        if self._recurrence_index is None:
+            self._recurrence_index = RecurrenceIndex(
+                self.recurrence_rules, self.routines.keys())
+        return self._recurrence_index
+
+    @_synchronized
+    def get_template_name_for_date(self, target_date: date) -> str:
+        """The template in effect on a date, after recurrence rules."""
+        return self._resolution_index().resolve(target_date)
+
+    @_synchronized
+    def get_routine_for_date(self, target_date: date):
+        return self.routines.get(self.get_template_name_for_date(target_date), [])
+
+    # --- Recurrence Rules ---
+    def get_recurrence_rules(self):
+        return self.recurrence_rules
+
+    @_synchronized
+    def save_recurrence_rules(self, rules: list):
+        """Validates and saves the rules; raises RecurrenceError if one is malformed."""
+        rules = [validate_rule(rule) for rule in rules]
+        with self._saving(self.recurrence_file):
+            self.recurrence_rules = rules
+            self._recurrence_version += 1
+            self._recurrence_index = None
+            self._completion_stats = None
+            self._write_json(self.recurrence_file, self.recurrence_rules)
+
+    @staticmethod
+    def find_conflicts(tasks: list) -> list:
+        """Pairs of overlapping tasks in a template (midnight-aware sweep)."""
+        return find_conflicts(tasks)
+
+    def _prepare_template(self, tasks: list) -> list:
+        """Fills in missing IDs/categories and returns the overlapping pairs."""
         for task in tasks:
-            if 'id' not in task or not task['id']:
-                task['id'] = str(uuid.uuid4())
-            if 'category' not in task:
+            if not task.id:
+                task.id = str(uuid.uuid4())
+            if task.category is None:
                 # Ensure category exists
-                task['category'] = self.UNCATEGORIZED_ID
-        self.routines[day_name] = tasks
-        self._save_routines()
+                task.category = self.UNCATEGORIZED_ID
+        return find_conflicts(tasks)
+
+    def _apply_template_changes(self, changes: dict):
+        """
+        Installs changed templates, writes routines.json once and drops only
+        the derived data those templates affect.
+        """
+        with self._saving(self.routines_file):
+            names_changed = any(name not in self.routines for name in changes)
+            schedule_changed = names_changed
+            for name, tasks in changes.items():
+                old_ids = {t.id for t in self.routines.get(name, [])}
+                if old_ids != {t.id for t in tasks}:
+                    schedule_changed = True
+                self._allocation_cache.pop(name, None)
+                self.routines[name] = tasks
+                if self._search_index is not None:
+                    self._search_index.set_template(name, tasks)
+
+            if names_changed:
+                self._recurrence_index = None
+            if schedule_changed:
+                # Time-only edits keep the streak engine
+                self._completion_stats = None
+            self._routines_version += 1
+            self._save_routines()
+
+    @_synchronized
+    def save_routine_for_day(self, day_name: str, tasks: list, allow_conflicts: bool = True):
+        """
+        Saves a template and returns its overlapping task pairs. With
+        'allow_conflicts=False' an overlapping template is rejected with
+        RoutineConflictError instead.
+        """
+        conflicts = self._prepare_template(tasks)
+        if conflicts and not allow_conflicts:
+            raise RoutineConflictError(conflicts)
+        self._apply_template_changes({day_name: tasks})
+        return conflicts
+
+    # --- Editing Sessions ---
+    @_synchronized
+    def begin_routine_edit(self) -> RoutineEditSession:
+        """Starts a copy-on-write editing session over the templates."""
+        return RoutineEditSession(self.routines)
+
+    @_synchronized
+    def commit_routine_edit(self, session: RoutineEditSession, allow_conflicts: bool = True) -> dict:
+        """
+        Applies every changed template of 'session' in one write. Returns
+        {template name: overlapping pairs} for the changed templates; with
+        'allow_conflicts=False' nothing is saved if any of them overlaps.
+        Raises StaleSessionError if a template changed since it was copied.
+        """
+        changes = session.diff()
+        if not changes:
+            return {}
+        session.check_base(self.routines, changes)
+        conflicts = {name: self._prepare_template(tasks)
+                     for name, tasks in changes.items()}
+        if not allow_conflicts:
+            found = [pair for pairs in conflicts.values() for pair in pairs]
+            if found:
+                raise RoutineConflictError(found)
+        self._apply_template_changes(changes)
+        return conflicts
 
     # --- Progress ---
     def _save_progress(self):
-        with open(self.progress_file, 'w', encoding='utf-8') as f:
-            json.dump(self.progress, f, indent=4)
-
-    def get_tasks_for_display(self, target_date: date):
-        day_name = target_date.strftime('%A')
-        date_str = target_date.isoformat()
-
-        tasks_template = self.get_routine_for_day(day_name)
-        completed_ids = set(self.progress.get(date_str, []))
-
-        # Get a quick lookup map for category colors
-        category_map = {cat['id']: cat for cat in self.categories}
-        uncategorized = category_map.get(
-            self.UNCATEGORIZED_ID, {"name": "Uncategorized", "color": "#A0A0B0"})
-
-        display_tasks = []
-        for task_template in tasks_template:
-            task = task_template.copy()
-            task_id = task.get('id')
-
-            # Get category info
-            category_id = task.get('category', self.UNCATEGORIZED_ID)
-            category_info = category_map.get(category_id, uncategorized)
-
-            task['completed'] = task_id in completed_ids
-            task['category_name'] = category_info['name']
-            task['category_color'] = category_info['color']
-
-            display_tasks.append(task)
-
-        return sorted(display_tasks, key=lambda x: x.get('start_time', '00:00'))
+        self._write_json(self.progress_file, self.progress)
+
+    def _category_map(self) -> dict:
+        return {cat.id: cat for cat in self.categories}
+
+    def _uncategorized(self, category_map: dict) -> Category:
+        return category_map.get(self.UNCATEGORIZED_ID) or self.DEFAULT_CATEGORIES[0]
+
+    @_synchronized
+    def get_tasks_for_display(self, target_date: date) -> list:
+        """The day's tasks as DisplayTask records, sorted by start time."""
+        completed_ids = set(self.progress.get(target_date.isoformat(), ()))
+        category_map = self._category_map()
+        uncategorized = self._uncategorized(category_map)
+
+        display_tasks = [
+            DisplayTask.from_task(task, category_map.get(task.category, uncategorized),
+                                  task.id in completed_ids)
+            for task in self.get_routine_for_date(target_date)
+        ]
+        return sorted(display_tasks, key=lambda x: x.start_minutes or 0)
+
+    @_synchronized
+    def toggle_task_completion(self, target_date: date, task_id: str) -> bool:
+        """
+        Flips a task's completion on a date, saves and returns the new state.
+        Completions recorded by another program meanwhile are read in first,
+        not overwritten.
+        """
+        with self._lock:
+            if self._changed_on_disk(self.progress_file):
+                self._reload_progress()
+            return self._toggle_task_completion(target_date, task_id)
+
+    def progress_changed_on_disk(self) -> bool:
+        """Cheap check (one stat) for completions saved by another program."""
+        return self._signature(self.progress_file) != self._signatures.get(self.progress_file)
+
+    @_synchronized
+    def reload_progress_if_changed(self) -> bool:
+        """Reads in completions another program saved; True if there were any."""
+        with self._lock:
+            if not self._changed_on_disk(self.progress_file):
+                return False
+            self._reload_progress()
+            return True
+
+    def _reload_progress(self):
+        self.progress = self._load_json(self.progress_file, default={})
+        self._progress_version += 1
+        self._completion_stats = None
+        self._completion_dates = None
 
-    def toggle_task_completion(self, target_date: date, task_id: str):
+    def _toggle_task_completion(self, target_date: date, task_id: str):
         date_str = target_date.isoformat()
         if date_str not in self.progress:
             self.progress[date_str] = []
@@ -112,81 +419,470 @@ class DataManager:
             self.progress[date_str].remove(task_id)
         else:
             self.progress[date_str].append(task_id)
+        self._progress_version += 1
+        if self._completion_dates is not None:
+            dates = self._completion_dates.setdefault(task_id, [])
+            if task_id in self.progress[date_str]:
+                insort(dates, date_str)
+            elif date_str in dates:
+                dates.remove(date_str)
+
+        # Keep the streak engine in sync without a full rebuild
+        if self._completion_stats is not None:
+            if self._completion_stats.covers(target_date):
+                self._completion_stats.apply_toggle(
+                    target_date, task_id, task_id in self.progress[date_str])
+            else:
+                self._completion_stats = None
         self._save_progress()
+        return task_id in self.progress[date_str]
 
     # --- Categories ---
     def get_categories(self):
         return self.categories
 
+    def _index_categories(self):
+        # Case-folded name -> category ID, for O(1) uniqueness checks
+        self._category_ids_by_name = {
+            cat.name.casefold(): cat.id for cat in self.categories}
+
+    def _categories_changed(self):
+        self._categories_version += 1
+        if self._search_index is not None:
+            self._search_index.set_categories(self.categories)
+        self._write_json(self.categories_file, [cat.to_dict() for cat in self.categories])
+
+    @_synchronized
     def save_categories(self, categories: list):
-        self.categories = categories
-        with open(self.categories_file, 'w', encoding='utf-8') as f:
-            json.dump(self.categories, f, indent=4)
+        with self._saving(self.categories_file):
+            self.categories = categories
+            self._index_categories()
+            self._categories_changed()
+
+    def category_name_taken(self, name: str, exclude_id: str = None) -> bool:
+        """Whether another category already uses 'name' (case-insensitive)."""
+        owner = self._category_ids_by_name.get(name.strip().casefold())
+        return owner is not None and owner != exclude_id
+
+    def _check_category_name(self, name: str, exclude_id: str = None) -> str:
+        name = name.strip()
+        if not name:
+            raise CategoryError("Category name cannot be empty.")
+        if self.category_name_taken(name, exclude_id):
+            raise CategoryError(f"A category named '{name}' already exists.")
+        return name
+
+    @_synchronized
+    def add_category(self, name: str, color: str) -> Category:
+        name = self._check_category_name(name)
+        category = Category(f"cat-{uuid.uuid4()}", name, color)
+        with self._saving(self.categories_file):
+            self.categories.append(category)
+            self._category_ids_by_name[name.casefold()] = category.id
+            self._categories_changed()
+        return category
+
+    @_synchronized
+    def update_category(self, category_id: str, name: str, color: str):
+        if category_id == self.UNCATEGORIZED_ID:
+            raise CategoryError(
+                "The default 'Uncategorized' category cannot be modified.")
+        name = self._check_category_name(name, exclude_id=category_id)
+        category = next(
+            (c for c in self.categories if c.id == category_id), None)
+        if category is None:
+            raise CategoryError("Category not found.")
+        with self._saving(self.categories_file):
+            self._category_ids_by_name.pop(category.name.casefold(), None)
+            category.name = name
+            category.color = color
+            self._category_ids_by_name[name.casefold()] = category_id
+            self._categories_changed()
+
+    @_synchronized
+    def delete_category(self, category_id: str) -> int:
+        """Deletes a category, moving its tasks to 'Uncategorized'."""
+        return self.merge_categories([category_id], self.UNCATEGORIZED_ID)
+
+    @_synchronized
+    def merge_categories(self, source_ids, target_id: str) -> int:
+        """
+        Moves every task of the 'source_ids' categories to 'target_id' in one
+        pass over all templates and removes the sources. Each file is written
+        once, categories.json first: if routines.json then fails, the tasks
+        keep their old categories (shown as 'Uncategorized') in memory as on
+        disk. Returns the number of reassigned tasks.
+        """
+        sources = set(source_ids) - {target_id}
+        if self.UNCATEGORIZED_ID in sources:
+            raise CategoryError(
+                "The default 'Uncategorized' category cannot be deleted.")
+        if not any(c.id == target_id for c in self.categories):
+            raise CategoryError("Target category not found.")
+        if not sources:
+            return 0
+
+        with self._saving(self.routines_file, self.categories_file):
+            self.categories = [c for c in self.categories if c.id not in sources]
+            self._index_categories()
+            self._categories_changed()
+
+            moved = {}  # Template name -> its reassigned tasks
+            for name, tasks in self.routines.items():
+                for task in tasks:
+                    if task.category in sources:
+                        moved.setdefault(name, []).append((task, task.category))
+                        task.category = target_id
+            if not moved:
+                return 0
+            try:
+                self._save_routines()
+            except BaseException:
+                for reassigned in moved.values():
+                    for task, source_id in reassigned:
+                        task.category = source_id
+                raise
+            self._routines_version += 1
+            for name in moved:
+                self._allocation_cache.pop(name, None)
+                if self._search_index is not None:
+                    self._search_index.set_template(name, self.routines[name])
+        return sum(len(reassigned) for reassigned in moved.values())
 
     def get_uncategorized_id(self):
         return self.UNCATEGORIZED_ID
 
+    def get_versions(self) -> dict:
+        """Returns the in-memory change counters of each data set."""
+        return {
+            "routines": self._routines_version,
+            "progress": self._progress_version,
+            "categories": self._categories_version,
+            "recurrence": self._recurrence_version,
+        }
+
     # --- Settings ---
     def load_settings(self):
         return self.settings
 
+    @_synchronized
     def save_settings(self, settings: dict):
-        self.settings = settings
-        with open(self.settings_file, 'w', encoding='utf-8') as f:
-            json.dump(self.settings, f, indent=4)
+        with self._saving(self.settings_file):
+            self.settings = settings
+            self._write_json(self.settings_file, self.settings)
+
+    # --- Analytics Cache ---
+    def _fingerprint(self, *filepaths) -> str:
+        """Identifies the current content of the given data files."""
+        return "-".join(self._digests.get(path, "") for path in filepaths)
+
+    def _cached(self, key: str, filepaths: tuple, compute):
+        """Returns a persisted result for 'key', computing it on a miss."""
+        fingerprint = self._fingerprint(*filepaths)
+        value = self.analytics_cache.get(key, fingerprint)
+        if value is None:
+            value = compute()
+            self.analytics_cache.put(key, fingerprint, value)
+        return value
+
+    def flush_analytics_cache(self):
+        self.analytics_cache.flush()
 
     # --- Analytics Data ---
+    @_synchronized
     def get_progress_for_date_range(self, end_date: date, days: int):
         """Returns progress data for the last 'days' ending at 'end_date'."""
+        return self._cached(
+            f"progress_range:{end_date.isoformat()}:{days}",
+            (self.routines_file, self.recurrence_file, self.progress_file),
+            lambda: self._compute_progress_for_date_range(end_date, days))
+
+    def _compute_progress_for_date_range(self, end_date: date, days: int):
         progress_map = {}
         for i in range(days):
             target_date = end_date - timedelta(days=i)
             date_str = target_date.isoformat()
 
-            tasks = self.get_tasks_for_display(target_date)
+            # Only counts are needed, so no display records are built
+            tasks = self.get_routine_for_date(target_date)
             total_tasks = len(tasks)
 
             if total_tasks == 0:
                 progress_map[date_str] = -1  # -1 indicates a day with no tasks
                 continue
 
-            completed_count = sum(1 for task in tasks if task.get('completed'))
+            completed_ids = set(self.progress.get(date_str, ()))
+            completed_count = sum(1 for task in tasks if task.id in completed_ids)
             percentage = int((completed_count / total_tasks * 100))
             progress_map[date_str] = percentage
 
         return progress_map
 
-    def get_allocated_time_by_category(self):
-        """Calculates total time (in hours) allocated per category in routines."""
-        from datetime import datetime
-        category_time = {}
-
-        routines = self.get_all_routines()
-        category_map = {cat['id']: cat for cat in self.categories}
-        uncategorized_name = category_map.get(
-            self.UNCATEGORIZED_ID, {"name": "Uncategorized"})['name']
-
-        all_tasks = []
-        for day, tasks in routines.items():
-            all_tasks.extend(tasks)
-
-        for task in all_tasks:
-            category_id = task.get('category', self.UNCATEGORIZED_ID)
-            category_name = category_map.get(
-                category_id, {"name": uncategorized_name})['name']
-
+    @_synchronized
+    def get_first_tracked_date(self, today: date) -> date:
+        """The earliest date with recorded progress (or 'today')."""
+        first = today
+        for date_str in self.progress:
             try:
-                t1 = datetime.strptime(
-                    task.get('start_time', '00:00'), '%H:%M')
-                t2 = datetime.strptime(task.get('end_time', '00:00'), '%H:%M')
-                duration_hours = (t2 - t1).total_seconds() / 3600
-                if duration_hours < 0:  # Handle overnight tasks simply
-                    duration_hours += 24
+                first = min(first, date.fromisoformat(date_str))
             except ValueError:
-                duration_hours = 0
-
-            if category_name not in category_time:
-                category_time[category_name] = 0
-            category_time[category_name] += duration_hours
+                continue
+        return first
+
+    @_synchronized
+    def get_tracked_years(self, today: date):
+        """Returns every year from the first recorded progress up to 'today'."""
+        return list(range(self.get_first_tracked_date(today).year, today.year + 1))
+
+    def _effective_template_name(self, day_name: str) -> str:
+        """The template that actually applies on a weekday."""
+        return day_name if day_name in self.routines else "default"
+
+    def _template_allocation(self, template_name: str) -> dict:
+        """Minutes per category ID for one template, cached until it changes."""
+        allocation = self._allocation_cache.get(template_name)
+        if allocation is None:
+            allocation = {}
+            for task in self.routines.get(template_name, []):
+                category_id = task.category or self.UNCATEGORIZED_ID
+                allocation[category_id] = allocation.get(category_id, 0) + duration_minutes(
+                    task.start_minutes, task.end_minutes)
+            self._allocation_cache[template_name] = allocation
+        return allocation
+
+    def _allocation_by_name(self, template_counts: dict) -> dict:
+        """
+        Combines per-template allocations weighted by how often each template
+        occurs, keyed by category name.
+        """
+        category_map = {cat.id: cat.name for cat in self.categories}
+        uncategorized_name = category_map.get(
+            self.UNCATEGORIZED_ID, "Uncategorized")
 
-        return category_time
+        result = {}
+        for template, count in template_counts.items():
+            if count <= 0:
+                continue
+            for category_id, minutes in self._template_allocation(template).items():
+                name = category_map.get(category_id, uncategorized_name)
+                result[name] = result.get(name, 0) + minutes * count
+        return result
+
+    @_synchronized
+    def get_allocated_minutes_for_day(self, day_name: str) -> dict:
+        """Minutes per category name for the template in effect on 'day_name'."""
+        return self._allocation_by_name({self._effective_template_name(day_name): 1})
+
+    @_synchronized
+    def get_allocated_minutes_by_category(self, start_date: date = None, end_date: date = None) -> dict:
+        """
+        Minutes per category name. Without dates this is a typical week (each
+        weekday resolved to its own template); with dates it covers every day
+        from 'start_date' to 'end_date' inclusive.
+        """
+        key = (f"allocation:{start_date.isoformat()}:{end_date.isoformat()}"
+               if start_date and end_date else "allocation:week")
+        return self._cached(
+            key, (self.routines_file, self.recurrence_file, self.categories_file),
+            lambda: self._compute_allocated_minutes(start_date, end_date))
+
+    def _compute_allocated_minutes(self, start_date: date, end_date: date) -> dict:
+        if start_date is None or end_date is None:
+            return self._allocation_by_name(self._weekday_template_counts(
+                {day: 1 for day in self.WEEKDAYS}))
+
+        total_days = (end_date - start_date).days + 1
+        if total_days <= 0:
+            return {}
+        index = self._resolution_index()
+        if index.has_rules:
+            # Memoized O(1) lookups per date
+            template_counts = {}
+            for i in range(total_days):
+                template = index.resolve(start_date + timedelta(days=i))
+                template_counts[template] = template_counts.get(template, 0) + 1
+            return self._allocation_by_name(template_counts)
+
+        full_weeks, remainder = divmod(total_days, 7)
+        weekday_counts = {day: full_weeks for day in self.WEEKDAYS}
+        first_weekday = start_date.weekday()
+        for i in range(remainder):
+            weekday_counts[self.WEEKDAYS[(first_weekday + i) % 7]] += 1
+        return self._allocation_by_name(self._weekday_template_counts(weekday_counts))
+
+    def _weekday_template_counts(self, weekday_counts: dict) -> dict:
+        """Maps weekday occurrence counts onto the templates they use."""
+        template_counts = {}
+        for day_name, count in weekday_counts.items():
+            template = self._effective_template_name(day_name)
+            template_counts[template] = template_counts.get(template, 0) + count
+        return template_counts
+
+    @_synchronized
+    def get_allocated_time_by_category(self):
+        """Calculates weekly time (in hours) allocated per category in routines."""
+        return {name: minutes / 60
+                for name, minutes in self.get_allocated_minutes_by_category().items()}
+
+    # --- Streaks & Completion Rates ---
+    def _get_completion_stats(self, today: date) -> CompletionStats:
+        """Returns the streak engine, building it on first use."""
+        if self._completion_stats is None:
+            scheduled_by_template = {
+                name: {task.id for task in tasks if task.id}
+                for name, tasks in self.routines.items()
+            }
+            scheduled_by_template.setdefault("default", set())
+            index = self._resolution_index()
+            origin = self.get_first_tracked_date(today)
+            self._completion_stats = CompletionStats(
+                origin, today, set().union(*scheduled_by_template.values()),
+                lambda day: scheduled_by_template[index.resolve(day)],
+                self.progress)
+        return self._completion_stats
+
+    def _task_names(self) -> dict:
+        """Maps task IDs to names across all templates."""
+        names = {}
+        for tasks in self.routines.values():
+            for task in tasks:
+                if task.id:
+                    names[task.id] = task.name or 'Unnamed Task'
+        return names
+
+    @_synchronized
+    def get_task_stats(self, task_id: str, today: date, days: int = 30) -> dict:
+        """Current/longest streak and recent completion rate for one task."""
+        stats = self._get_completion_stats(today)
+        return {
+            "current_streak": stats.current_streak(task_id, today),
+            "longest_streak": stats.longest_streak(task_id),
+            "completion_rate": stats.completion_rate(
+                task_id, today - timedelta(days=days - 1), today),
+        }
+
+    @_synchronized
+    def get_completion_rate(self, task_id, start_date: date, end_date: date):
+        """Completion % of a task (None = all tasks) in a date range."""
+        stats = self._get_completion_stats(end_date)
+        return stats.completion_rate(task_id, start_date, end_date)
+
+    # --- Search ---
+    def _get_search_index(self) -> SearchIndex:
+        if self._search_index is None:
+            index = SearchIndex()
+            index.set_categories(self.categories)
+            for name, tasks in self.routines.items():
+                index.set_template(name, tasks)
+            self._search_index = index
+        return self._search_index
+
+    def _get_completion_dates(self) -> dict:
+        """Task ID -> sorted ISO dates it was completed on."""
+        if self._completion_dates is None:
+            dates = {}
+            for date_str in sorted(self.progress):
+                for task_id in self.progress[date_str]:
+                    dates.setdefault(task_id, []).append(date_str)
+            self._completion_dates = dates
+        return self._completion_dates
+
+    def _template_order(self, name: str):
+        if name == "default":
+            return (0, "")
+        if name in self.WEEKDAYS:
+            return (1 + self.WEEKDAYS.index(name), "")
+        return (8, name.casefold())
+
+    @_synchronized
+    def search_tasks(self, query: str, today: date, limit: int = 30) -> list:
+        """
+        Tasks whose name, notes or category match every word of 'query',
+        with the templates containing them and their completion history.
+        """
+        by_task = {}
+        for template, task_id in self._get_search_index().search(query):
+            by_task.setdefault(task_id, []).append(template)
+
+        category_map = self._category_map()
+        uncategorized = self._uncategorized(category_map)
+        results = []
+        for task_id, templates in by_task.items():
+            templates.sort(key=self._template_order)
+            task = next(t for t in self.routines[templates[0]] if t.id == task_id)
+            category = category_map.get(task.category, uncategorized)
+            results.append({
+                "id": task_id,
+                "name": task.name,
+                "notes": task.notes,
+                "category_name": category.name,
+                "category_color": category.color,
+                "templates": templates,
+            })
+        results.sort(key=lambda r: r["name"].casefold())
+        results = results[:limit]
+
+        # History only for the results actually returned
+        stats = self._get_completion_stats(today)
+        completion_dates = self._get_completion_dates()
+        for result in results:
+            completed, scheduled = stats.counts(result["id"], stats.origin, today)
+            dates = completion_dates.get(result["id"], [])
+            result["history"] = {
+                "completed": completed,
+                "scheduled": scheduled,
+                "completion_rate": int(completed / scheduled * 100) if scheduled else None,
+                "current_streak": stats.current_streak(result["id"], today),
+                "last_completed": dates[-1] if dates else None,
+            }
+        return results
+
+    @_synchronized
+    def search_template_counts(self, query: str) -> dict:
+        """Number of matching tasks per template."""
+        counts = {}
+        for template, _ in self._get_search_index().search(query):
+            counts[template] = counts.get(template, 0) + 1
+        return counts
+
+    @_synchronized
+    def get_streak_report(self, today: date, days: int = 30, limit: int = 5) -> dict:
+        """Overall and per-task streaks, rates and most skipped tasks."""
+        return self._cached(
+            f"streaks:{today.isoformat()}:{days}:{limit}",
+            (self.routines_file, self.recurrence_file, self.progress_file),
+            lambda: self._compute_streak_report(today, days, limit))
+
+    def _compute_streak_report(self, today: date, days: int, limit: int) -> dict:
+        stats = self._get_completion_stats(today)
+        start = today - timedelta(days=days - 1)
+        names = self._task_names()
+
+        tasks = []
+        for task_id, name in names.items():
+            rate = stats.completion_rate(task_id, start, today)
+            if rate is None and stats.longest_streak(task_id) == 0:
+                continue  # Never scheduled
+            tasks.append({
+                "id": task_id,
+                "name": name,
+                "current_streak": stats.current_streak(task_id, today),
+                "longest_streak": stats.longest_streak(task_id),
+                "completion_rate": rate,
+            })
+        tasks.sort(key=lambda t: (-t["current_streak"], t["name"].lower()))
+
+        return {
+            "days": days,
+            "overall": {
+                "current_streak": stats.current_streak(stats.OVERALL, today),
+                "longest_streak": stats.longest_streak(stats.OVERALL),
+                "completion_rate": stats.completion_rate(stats.OVERALL, start, today),
+            },
+            "tasks": tasks,
+            "most_skipped": [
+                {"id": task_id, "name": names.get(task_id, task_id),
+                 "skipped": skipped, "scheduled": scheduled}
+                for task_id, skipped, scheduled in stats.most_skipped(start, today, limit)
+            ],
+        }
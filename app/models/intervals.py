@@ -0,0 +1,198 @@
+"""
+Interval helpers for a template's tasks. Each task covers [start, end) in
+minutes since midnight; a task whose end is at or before its start runs
+past midnight and is split into [start, 1440) and [0, end).
+"""
+from bisect import bisect_left, bisect_right
+from .time_utils import MINUTES_PER_DAY
+
+
+class RoutineConflictError(ValueError):
+    """Raised when a template is saved with overlapping tasks."""
+
+    def __init__(self, conflicts: list):
+        self.conflicts = conflicts
+        names = ", ".join(f"'{a.name}' / '{b.name}'"
+                          for a, b in conflicts[:3])
+        super().__init__(f"{len(conflicts)} overlapping task(s): {names}")
+
+
+def task_segments(start, end) -> list:
+    """Splits a start-end interval into non-wrapping [start, end) segments."""
+    if start is None or end is None or start == end:
+        return []
+    if start < end:
+        return [(start, end)]
+    segments = [(start, MINUTES_PER_DAY)]
+    if end > 0:
+        segments.append((0, end))
+    return segments
+
+
+def find_conflicts(tasks: list) -> list:
+    """
+    Returns pairs of overlapping tasks in one sweep over the sorted segments
+    (O(n log n)). Every task that overlaps another appears in at least one
+    pair; the pair names the task it overlaps with the latest end.
+    """
+    segments = []
+    for task in tasks:
+        for seg_start, seg_end in task_segments(task.start_minutes, task.end_minutes):
+            segments.append((seg_start, seg_end, task))
+    segments.sort(key=lambda seg: (seg[0], seg[1]))
+
+    conflicts = []
+    seen = set()
+    max_end = -1
+    holder = None  # Task owning 'max_end'
+    for seg_start, seg_end, task in segments:
+        if seg_start < max_end and holder is not task:
+            key = (min(id(holder), id(task)), max(id(holder), id(task)))
+            if key not in seen:
+                seen.add(key)
+                conflicts.append((holder, task))
+        if seg_end > max_end:
+            max_end = seg_end
+            holder = task
+    return conflicts
+
+
+def conflicting_ids(conflicts: list) -> set:
+    """IDs of every task involved in a conflict."""
+    ids = set()
+    for a, b in conflicts:
+        ids.add(a.id)
+        ids.add(b.id)
+    return ids
+
+
+class IntervalIndex:
+    """
+    A sorted index over a template's task segments. 'overlapping' answers
+    "which tasks intersect [start, end)?" in O(log n + k) using a running
+    maximum of segment ends, so a dialog can re-check on every keystroke.
+    The free gaps of the day are precomputed once for the slot queries.
+    """
+
+    def __init__(self, tasks: list, exclude_id=None):
+        segments = []
+        for task in tasks:
+            if exclude_id is not None and task.id == exclude_id:
+                continue
+            for seg_start, seg_end in task_segments(task.start_minutes, task.end_minutes):
+                segments.append((seg_start, seg_end, task))
+        segments.sort(key=lambda seg: (seg[0], seg[1]))
+
+        self._starts = [seg[0] for seg in segments]
+        self._ends = [seg[1] for seg in segments]
+        self._tasks = [seg[2] for seg in segments]
+        # _max_ends[i] = max end of segments[0..i]
+        self._max_ends = []
+        running = -1
+        for seg_end in self._ends:
+            running = max(running, seg_end)
+            self._max_ends.append(running)
+
+        self._gaps = self._compute_gaps()
+        self._gap_starts = [gap[0] for gap in self._gaps]
+
+    def _compute_gaps(self) -> list:
+        """
+        Free (start, end) gaps in circular order. A gap running through
+        midnight is reported once, with 'end' past 1440.
+        """
+        gaps = []
+        cursor = 0
+        for seg_start, seg_end in zip(self._starts, self._ends):
+            if seg_start > cursor:
+                gaps.append((cursor, seg_start))
+            cursor = max(cursor, seg_end)
+        if cursor < MINUTES_PER_DAY:
+            gaps.append((cursor, MINUTES_PER_DAY))
+
+        if not self._starts:
+            return [(0, MINUTES_PER_DAY)]
+        # Join the gap ending at midnight with the one starting at 00:00
+        if len(gaps) >= 2 and gaps[0][0] == 0 and gaps[-1][1] == MINUTES_PER_DAY:
+            wrapped = (gaps[-1][0], MINUTES_PER_DAY + gaps[0][1])
+            gaps = gaps[1:-1] + [wrapped]
+        return gaps
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _overlapping_segment(self, start: int, end: int) -> list:
+        # Candidates start before 'end'; walk back while some may reach 'start'
+        found = []
+        i = bisect_left(self._starts, end) - 1
+        while i >= 0 and self._max_ends[i] > start:
+            if self._ends[i] > start:
+                found.append(self._tasks[i])
+            i -= 1
+        return found
+
+    def overlapping(self, start, end) -> list:
+        """Tasks overlapping the (possibly midnight-crossing) interval."""
+        found = []
+        for seg_start, seg_end in task_segments(start, end):
+            for task in self._overlapping_segment(seg_start, seg_end):
+                if not any(task is other for other in found):
+                    found.append(task)
+        return found
+
+    # --- Free slots ---
+    def free_slots(self, min_length: int = 1) -> list:
+        """
+        All free (start, end) slots of at least 'min_length' minutes, in
+        minutes since midnight. A slot crossing midnight has end < start.
+        """
+        return [(start, end % MINUTES_PER_DAY if end > MINUTES_PER_DAY else end)
+                for start, end in self._gaps if end - start >= min_length]
+
+    def first_free_slot(self, length: int, after: int = 0):
+        """
+        The earliest (start, end) slot of 'length' minutes starting at or
+        after 'after', wrapping past midnight; None if the day is too full.
+        """
+        if not self._gaps:
+            return None
+        after %= MINUTES_PER_DAY
+        # Start from the last gap beginning at or before 'after', or from the
+        # midnight-crossing gap if 'after' falls in its early-morning part
+        first = bisect_right(self._gap_starts, after) - 1
+        if first < 0:
+            last_end = self._gaps[-1][1]
+            first = len(self._gaps) - 1 if last_end > MINUTES_PER_DAY + after else 0
+        order = self._gaps[first:] + self._gaps[:first]
+        for i, (gap_start, gap_end) in enumerate(order):
+            start = gap_start
+            if i == 0:
+                # 'after' may fall inside the first gap (or inside a
+                # midnight-crossing gap stored with end > 1440)
+                if gap_start <= after < gap_end:
+                    start = after
+                elif gap_start <= after + MINUTES_PER_DAY < gap_end:
+                    start = after + MINUTES_PER_DAY
+                elif gap_end <= after:
+                    continue
+            if gap_end - start >= length:
+                return (start % MINUTES_PER_DAY, (start + length) % MINUTES_PER_DAY)
+        # Wrapped all the way round: the first gap again, from its beginning
+        # (which precedes 'after' circularly, even when the gap crosses midnight)
+        gap_start, gap_end = order[0]
+        if gap_end - gap_start >= length:
+            return (gap_start % MINUTES_PER_DAY, (gap_start + length) % MINUTES_PER_DAY)
+        return None
+
+    def task_before(self, minute: int):
+        """The task whose segment ends latest at or before 'minute'."""
+        best = None
+        best_end = -1
+        i = bisect_right(self._starts, minute) - 1
+        while i >= 0:
+            if best_end < self._ends[i] <= minute:
+                best, best_end = self._tasks[i], self._ends[i]
+            if self._max_ends[i] <= best_end:
+                break
+            i -= 1
+        return best
@@ -0,0 +1,153 @@
+"""
+Slotted record types for the model's data: template tasks, categories and
+the per-day display entries built from them. The JSON files keep their dict
+shape; records are made with from_dict() when a file is loaded and turned
+back with to_dict() when it is saved, so nothing past that boundary deals
+in dicts. Unknown keys in a task are kept in 'extra' and written back, as
+are time strings that don't parse (until a valid time is set); fields the
+file left out stay out while they keep their default value.
+"""
+from .time_utils import MINUTES_PER_DAY, parse_time, format_time
+
+# JSON key -> value it has in memory when missing from the file
+_TASK_DEFAULTS = {'id': None, 'name': '', 'start_time': None, 'end_time': None,
+                  'notes': '', 'category': None}
+_TASK_KEYS = frozenset(_TASK_DEFAULTS)
+_absent_keys = {}  # One shared tuple per combination of missing keys
+
+
+def _shared_absent(data: dict):
+    absent = tuple(key for key in _TASK_DEFAULTS if key not in data)
+    return _absent_keys.setdefault(absent, absent) if absent else None
+
+
+class Task:
+    """One task of a template; times are minutes since midnight (None if unset)."""
+    __slots__ = ('id', 'name', 'start_minutes', 'end_minutes', 'notes', 'category', 'extra',
+                 'absent')
+
+    def __init__(self, id=None, name: str = "", start_minutes=None, end_minutes=None,
+                 notes: str = "", category=None, extra: dict = None, absent: tuple = None):
+        self.id = id
+        self.name = name
+        self.start_minutes = start_minutes
+        self.end_minutes = end_minutes
+        self.notes = notes
+        self.category = category
+        self.extra = extra
+        self.absent = absent  # JSON keys missing from the file
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Task":
+        extra = {key: value for key, value in data.items() if key not in _TASK_KEYS}
+        start, end = parse_time(data.get('start_time')), parse_time(data.get('end_time'))
+        # Keep unparseable values rather than overwriting them with null
+        for key, minutes in (('start_time', start), ('end_time', end)):
+            if minutes is None and data.get(key) is not None:
+                extra[key] = data[key]
+        return cls(data.get('id'), data.get('name') or '', start, end,
+                   data.get('notes') or '', data.get('category'), extra or None,
+                   _shared_absent(data))
+
+    def to_dict(self) -> dict:
+        """The JSON shape ("HH:mm" times)."""
+        data = dict(self.extra) if self.extra else {}
+        data.update({
+            "id": self.id,
+            "name": self.name,
+            # Without minutes, an unparsed original (kept in 'extra') is written back
+            "start_time": (format_time(self.start_minutes) if self.start_minutes is not None
+                           else data.get('start_time')),
+            "end_time": (format_time(self.end_minutes) if self.end_minutes is not None
+                         else data.get('end_time')),
+            "notes": self.notes,
+            "category": self.category,
+        })
+        if self.absent:
+            for key in self.absent:
+                if data[key] == _TASK_DEFAULTS[key]:
+                    del data[key]
+        return data
+
+    def copy(self) -> "Task":
+        return Task(self.id, self.name, self.start_minutes, self.end_minutes,
+                    self.notes, self.category, dict(self.extra) if self.extra else None,
+                    self.absent)
+
+    def update(self, changes: dict):
+        """Sets the given fields, e.g. {'category': 'cat-002'}."""
+        for field, value in changes.items():
+            setattr(self, field, value)
+
+    def set_times(self, start: int, end: int) -> "Task":
+        """Sets both times from minutes (wrapped into one day)."""
+        self.start_minutes = start % MINUTES_PER_DAY
+        self.end_minutes = end % MINUTES_PER_DAY
+        return self
+
+    def _fields(self) -> tuple:
+        return (self.id, self.name, self.start_minutes, self.end_minutes,
+                self.notes, self.category, self.extra)
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None  # Mutable
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self.id!r}, name={self.name!r})"
+
+
+class DisplayTask(Task):
+    """A task as shown on one day: its category resolved and completion state."""
+    __slots__ = ('completed', 'category_name', 'category_color')
+
+    @classmethod
+    def from_task(cls, task: Task, category: "Category", completed: bool) -> "DisplayTask":
+        entry = cls(task.id, task.name, task.start_minutes, task.end_minutes,
+                    task.notes, category.id, task.extra)
+        entry.completed = completed
+        entry.category_name = category.name
+        entry.category_color = category.color
+        return entry
+
+    def to_dict(self) -> dict:
+        """The task's JSON shape plus its state on the day."""
+        data = super().to_dict()
+        data.update({
+            "completed": self.completed,
+            "category_name": self.category_name,
+            "category_color": self.category_color,
+        })
+        return data
+
+
+class Category:
+    __slots__ = ('id', 'name', 'color')
+
+    def __init__(self, id: str, name: str, color: str):
+        self.id = id
+        self.name = name
+        self.color = color
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Category":
+        return cls(data['id'], data.get('name') or '', data.get('color') or "#A0A0B0")
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "name": self.name, "color": self.color}
+
+    def copy(self) -> "Category":
+        return Category(self.id, self.name, self.color)
+
+    def __eq__(self, other):
+        if not isinstance(other, Category):
+            return NotImplemented
+        return (self.id, self.name, self.color) == (other.id, other.name, other.color)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Category(id={self.id!r}, name={self.name!r})"
@@ -0,0 +1,188 @@
+"""
+Recurrence rules choosing the template of a date, beyond the weekday
+overrides in routines.json. Rules are stored in recurrence.json as a list:
+
+    {"type": "date", "date": "2025-12-25", "template": "Holiday"}
+    {"type": "range", "start": "2025-12-20", "end": "2026-01-02", "template": "Holiday"}
+    {"type": "monthly", "day": 1, "template": "Admin"}
+    {"type": "interval", "every": 3, "start": "2025-01-06", "template": "Gym"}
+    {"type": "week_parity", "parity": "odd", "weekdays": ["Monday"], "template": "Sprint"}
+
+The most specific rule type wins, in the order above; among rules of one
+type the first listed wins. A monthly day past the end of a month applies
+on its last day. Week parity uses ISO week numbers; without 'weekdays' it
+covers the whole week. Dates no rule matches fall back to the weekday
+template, then "default".
+"""
+from bisect import bisect_right
+from calendar import monthrange
+from datetime import date
+
+RULE_TYPES = ("date", "range", "monthly", "interval", "week_parity")
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday",
+            "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class RecurrenceError(ValueError):
+    """Raised for a malformed recurrence rule."""
+
+
+def _parse_date(rule: dict, key: str) -> date:
+    try:
+        return date.fromisoformat(rule[key])
+    except (KeyError, TypeError, ValueError):
+        raise RecurrenceError(f"Rule needs a valid '{key}' date (YYYY-MM-DD)")
+
+
+def validate_rule(rule: dict) -> dict:
+    """Checks a rule and returns it with normalized values."""
+    rule_type = rule.get('type')
+    if rule_type not in RULE_TYPES:
+        raise RecurrenceError(f"Unknown rule type '{rule_type}'")
+    if not rule.get('template'):
+        raise RecurrenceError("Rule needs a 'template'")
+    rule = dict(rule)
+
+    if rule_type == "date":
+        _parse_date(rule, 'date')
+    elif rule_type == "range":
+        if _parse_date(rule, 'end') < _parse_date(rule, 'start'):
+            raise RecurrenceError("Range ends before it starts")
+    elif rule_type == "monthly":
+        if not isinstance(rule.get('day'), int) or not 1 <= rule['day'] <= 31:
+            raise RecurrenceError("Monthly rule needs a 'day' from 1 to 31")
+    elif rule_type == "interval":
+        if not isinstance(rule.get('every'), int) or rule['every'] < 1:
+            raise RecurrenceError("Interval rule needs 'every' >= 1")
+        _parse_date(rule, 'start')
+    elif rule_type == "week_parity":
+        if rule.get('parity') not in ("odd", "even"):
+            raise RecurrenceError("Week parity must be 'odd' or 'even'")
+        weekdays = rule.get('weekdays') or WEEKDAYS
+        unknown = [d for d in weekdays if d not in WEEKDAYS]
+        if unknown:
+            raise RecurrenceError(f"Unknown weekday(s): {', '.join(unknown)}")
+        rule['weekdays'] = list(weekdays)
+    return rule
+
+
+class RecurrenceIndex:
+    """
+    Rules compiled into lookup tables, so resolving a date costs a few dict
+    lookups and one bisect regardless of how many rules exist:
+      - one-off dates: dict by ordinal
+      - ranges: flattened into disjoint sorted segments (bisect)
+      - monthly: dict by day of month
+      - intervals: dict by period, then by residue
+      - week parity: dict by (parity, weekday)
+    Results are memoized per date.
+    """
+
+    def __init__(self, rules: list, templates, weekdays: list = WEEKDAYS):
+        templates = set(templates)
+        # Rules naming a missing template are ignored
+        rules = [r for r in rules if r.get('template') in templates]
+        self.has_rules = bool(rules)
+
+        self._dates = {}
+        ranges = []
+        self._monthly = {}
+        self._intervals = {}  # every -> {residue: [(rule index, start_ordinal, template)]}
+        self._parity = {}  # (is_odd, weekday index) -> template
+        for position, rule in enumerate(rules):
+            rule_type, template = rule['type'], rule['template']
+            if rule_type == "date":
+                self._dates.setdefault(
+                    date.fromisoformat(rule['date']).toordinal(), template)
+            elif rule_type == "range":
+                ranges.append((date.fromisoformat(rule['start']).toordinal(),
+                               date.fromisoformat(rule['end']).toordinal() + 1,
+                               template))
+            elif rule_type == "monthly":
+                self._monthly.setdefault(rule['day'], template)
+            elif rule_type == "interval":
+                start = date.fromisoformat(rule['start']).toordinal()
+                by_residue = self._intervals.setdefault(rule['every'], {})
+                by_residue.setdefault(start % rule['every'], []).append(
+                    (position, start, template))
+            elif rule_type == "week_parity":
+                is_odd = rule['parity'] == "odd"
+                for weekday in rule.get('weekdays') or WEEKDAYS:
+                    self._parity.setdefault(
+                        (is_odd, WEEKDAYS.index(weekday)), template)
+
+        self._range_starts, self._range_ends, self._range_templates = \
+            self._flatten_ranges(ranges)
+        self._monthly_days = sorted(self._monthly)
+        # Weekday fallback: the weekday's own template, else "default"
+        self._weekday_templates = [d if d in templates else "default"
+                                   for d in weekdays]
+        self._memo = {}
+
+    @staticmethod
+    def _flatten_ranges(ranges: list):
+        """
+        Turns possibly overlapping [start, end) ranges (earlier wins) into
+        disjoint sorted segments, merging neighbours with the same template.
+        """
+        points = sorted({p for start, end, _ in ranges for p in (start, end)})
+        starts, ends, templates = [], [], []
+        for seg_start, seg_end in zip(points, points[1:]):
+            template = next((t for start, end, t in ranges
+                             if start <= seg_start and seg_end <= end), None)
+            if template is None:
+                continue
+            if ends and ends[-1] == seg_start and templates[-1] == template:
+                ends[-1] = seg_end
+            else:
+                starts.append(seg_start)
+                ends.append(seg_end)
+                templates.append(template)
+        return starts, ends, templates
+
+    def resolve(self, day: date) -> str:
+        """The name of the template in effect on 'day'."""
+        ordinal = day.toordinal()
+        template = self._memo.get(ordinal)
+        if template is None:
+            template = self._resolve(day, ordinal)
+            self._memo[ordinal] = template
+        return template
+
+    def _resolve(self, day: date, ordinal: int) -> str:
+        template = self._dates.get(ordinal)
+        if template:
+            return template
+
+        i = bisect_right(self._range_starts, ordinal) - 1
+        if i >= 0 and ordinal < self._range_ends[i]:
+            return self._range_templates[i]
+
+        if self._monthly:
+            template = self._monthly.get(day.day)
+            if template:
+                return template
+            # Last day of a short month also takes the days it lacks
+            if day.day == monthrange(day.year, day.month)[1]:
+                j = bisect_right(self._monthly_days, day.day)
+                if j < len(self._monthly_days):
+                    return self._monthly[self._monthly_days[j]]
+
+        # The first listed of the matching interval rules, across every period
+        best = None
+        for every, by_residue in self._intervals.items():
+            for position, start, template in by_residue.get(ordinal % every, ()):
+                if start <= ordinal:
+                    if best is None or position < best[0]:
+                        best = (position, template)
+                    break  # Kept in list order within a residue
+        if best:
+            return best[1]
+
+        if self._parity:
+            is_odd = day.isocalendar()[1] % 2 == 1
+            template = self._parity.get((is_odd, day.weekday()))
+            if template:
+                return template
+
+        return self._weekday_templates[day.weekday()]
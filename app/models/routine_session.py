@@ -0,0 +1,66 @@
+class StaleSessionError(RuntimeError):
+    """Raised when a template was changed elsewhere while a session edited it."""
+
+
+class RoutineEditSession:
+    """
+    Copy-on-write working set over the model's templates. Reads see the live
+    lists; the first 'edit(name)' copies that one template (task dicts
+    included), so the model is never mutated until the session is committed
+    with DataManager.commit_routine_edit().
+    """
+
+    def __init__(self, routines: dict):
+        self._base = routines
+        self._working = {}  # name -> copied task list
+        self._copied_from = {}  # name -> base list the copy was made from
+
+    def __contains__(self, name) -> bool:
+        return name in self._working or name in self._base
+
+    def __iter__(self):
+        yield from self._base
+        for name in self._working:
+            if name not in self._base:
+                yield name
+
+    def get(self, name, default=None):
+        """The template's tasks (the live list until edited; don't mutate it)."""
+        if name in self._working:
+            return self._working[name]
+        return self._base.get(name, default)
+
+    def edit(self, name, inherit_from=None) -> list:
+        """
+        A writable copy of the template, made on first use. A template that
+        doesn't exist yet starts as a copy of 'inherit_from' if given (e.g. a
+        new weekday override starting from "default").
+        """
+        if name not in self._working:
+            base = self._base.get(name)
+            self._copied_from[name] = base
+            source = base if base is not None else self.get(inherit_from, [])
+            self._working[name] = [task.copy() for task in source]
+        return self._working[name]
+
+    def reassign_categories(self, mapping: dict):
+        """Applies {old category ID: new ID} to the templates copied so far."""
+        for tasks in self._working.values():
+            for task in tasks:
+                if task.category in mapping:
+                    task.category = mapping[task.category]
+
+    def diff(self) -> dict:
+        """Templates whose tasks differ from the model's, by name."""
+        changes = {}
+        for name, tasks in self._working.items():
+            if tasks != self._base.get(name):
+                changes[name] = tasks
+        return changes
+
+    def check_base(self, routines: dict, names):
+        """Raises StaleSessionError if one of 'names' was replaced meanwhile."""
+        for name in names:
+            if routines.get(name) is not self._copied_from.get(name):
+                raise StaleSessionError(
+                    f"The '{name}' template was changed while it was being edited")
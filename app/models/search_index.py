@@ -0,0 +1,121 @@
+"""
+In-memory inverted index over task names, notes and category names.
+
+Each task of each template is a document keyed by (template, task ID).
+Postings map a case-folded word to the documents containing it; category
+words map to category IDs, and documents are grouped by category, so a
+category rename only touches the category postings. A query matches
+documents containing every query word, the last word as a prefix (so
+results update while typing); prefixes are found by bisecting the sorted
+vocabulary.
+"""
+import re
+from bisect import bisect_left, insort
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list:
+    return _WORD_RE.findall(text.casefold()) if text else []
+
+
+class _Postings:
+    """word -> set of keys, with a sorted vocabulary for prefix lookups."""
+
+    def __init__(self):
+        self._postings = {}
+        self._vocabulary = []  # Sorted; may hold words whose set emptied
+
+    def add(self, word: str, key):
+        keys = self._postings.get(word)
+        if keys is None:
+            keys = self._postings[word] = set()
+            insort(self._vocabulary, word)
+        keys.add(key)
+
+    def discard(self, word: str, key):
+        keys = self._postings.get(word)
+        if keys is not None:
+            keys.discard(key)
+
+    def exact(self, word: str) -> set:
+        return self._postings.get(word, set())
+
+    def prefixed(self, prefix: str) -> set:
+        found = set()
+        i = bisect_left(self._vocabulary, prefix)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(prefix):
+            found |= self._postings[self._vocabulary[i]]
+            i += 1
+        return found
+
+
+class SearchIndex:
+    def __init__(self):
+        self._words = _Postings()  # word -> {(template, task_id)}
+        self._category_words = _Postings()  # word -> {category_id}
+        self._docs = {}  # (template, task_id) -> (words, category_id)
+        self._docs_by_template = {}  # template -> {doc keys}
+        self._docs_by_category = {}  # category_id -> {doc keys}
+        self._category_tokens = {}  # category_id -> words
+
+    # --- Maintenance ---
+    def set_template(self, template: str, tasks: list):
+        """(Re)indexes one template's tasks, dropping its previous entries."""
+        self.remove_template(template)
+        keys = self._docs_by_template.setdefault(template, set())
+        for task in tasks:
+            key = (template, task.id)
+            words = set(tokenize(task.name)) | set(tokenize(task.notes))
+            category_id = task.category
+            self._docs[key] = (words, category_id)
+            keys.add(key)
+            self._docs_by_category.setdefault(category_id, set()).add(key)
+            for word in words:
+                self._words.add(word, key)
+
+    def remove_template(self, template: str):
+        for key in self._docs_by_template.pop(template, ()):
+            words, category_id = self._docs.pop(key)
+            for word in words:
+                self._words.discard(word, key)
+            self._docs_by_category.get(category_id, set()).discard(key)
+
+    def set_categories(self, categories: list):
+        """Re-indexes category names (tasks are grouped by category ID)."""
+        for category_id, words in self._category_tokens.items():
+            for word in words:
+                self._category_words.discard(word, category_id)
+        self._category_tokens = {}
+        for category in categories:
+            words = set(tokenize(category.name))
+            self._category_tokens[category.id] = words
+            for word in words:
+                self._category_words.add(word, category.id)
+
+    # --- Queries ---
+    def _matching(self, word: str, prefix: bool) -> set:
+        if prefix:
+            docs = set(self._words.prefixed(word))
+            category_ids = self._category_words.prefixed(word)
+        else:
+            docs = set(self._words.exact(word))
+            category_ids = self._category_words.exact(word)
+        for category_id in category_ids:
+            docs |= self._docs_by_category.get(category_id, set())
+        return docs
+
+    def search(self, query: str) -> set:
+        """(template, task ID) keys matching every word of 'query'."""
+        words = tokenize(query)
+        if not words:
+            return set()
+        # Rarest-first would need sizes up front; the prefix word is usually
+        # the broadest, so intersect the exact words first
+        result = None
+        for i, word in enumerate(words):
+            docs = self._matching(word, prefix=(i == len(words) - 1))
+            result = docs if result is None else result & docs
+            if not result:
+                return set()
+        return result
@@ -0,0 +1,134 @@
+"""
+Deterministic synthetic datasets in the data/ layout, for benchmarks.
+
+The same (seed, size) always produces byte-identical files: a "default"
+template plus an override per weekday (about half of each override's tasks
+are shared with "default", as when a weekday is edited from it), a few
+extra templates applied by recurrence rules, and a daily completion
+history ending at 'end_date'.
+"""
+import json
+import os
+import random
+from datetime import date, timedelta
+from .recurrence import RecurrenceIndex, WEEKDAYS
+from .time_utils import MINUTES_PER_DAY, format_time
+
+# Fixed so that generated files don't depend on when they were made
+DEFAULT_END_DATE = date(2025, 12, 31)
+
+SIZES = {
+    "small": {"years": 1, "categories": 8, "tasks_per_day": 20},
+    "medium": {"years": 3, "categories": 24, "tasks_per_day": 100},
+    "large": {"years": 5, "categories": 48, "tasks_per_day": 300},
+}
+
+_WORDS = ("Read", "Review", "Write", "Plan", "Call", "Gym", "Walk", "Study",
+          "Email", "Cook", "Clean", "Practice", "Meditate", "Code", "Draft",
+          "Budget", "Stretch", "Journal", "Research", "Meeting")
+_EXTRA_TEMPLATES = ("Holiday", "Gym Day", "Admin")
+
+
+def _make_categories(rng: random.Random, count: int) -> list:
+    categories = [{"id": "cat-001", "name": "Uncategorized", "color": "#A0A0B0"}]
+    for i in range(2, count + 1):
+        categories.append({
+            "id": f"cat-{i:03d}",
+            "name": f"{rng.choice(_WORDS)} {i}",
+            "color": f"#{rng.randrange(0x1000000):06X}",
+        })
+    return categories
+
+
+def _make_tasks(rng: random.Random, prefix: str, count: int, categories: list) -> list:
+    """'count' back-to-back tasks spread over the day, with random lengths."""
+    tasks = []
+    slot = MINUTES_PER_DAY // max(count, 1)
+    start = 0
+    for i in range(count):
+        length = rng.randint(max(1, slot // 2), max(1, slot))
+        tasks.append({
+            "id": f"task-{prefix}-{i:04d}",
+            "name": f"{rng.choice(_WORDS)} {rng.choice(_WORDS).lower()} {i}",
+            "start_time": format_time(start),
+            "end_time": format_time(start + length),
+            "notes": rng.choice(("", "", f"Notes for {prefix} {i}")),
+            "category": rng.choice(categories)["id"],
+        })
+        start += slot
+    return tasks
+
+
+def generate_routines(rng: random.Random, tasks_per_day: int, categories: list) -> dict:
+    default = _make_tasks(rng, "default", tasks_per_day, categories)
+    routines = {"default": default}
+    for day_name in WEEKDAYS:
+        own = _make_tasks(rng, day_name.lower(), tasks_per_day, categories)
+        # Keep the default task in every other slot
+        routines[day_name] = [default[i] if i % 2 == 0 else own[i]
+                              for i in range(tasks_per_day)]
+    for name in _EXTRA_TEMPLATES:
+        routines[name] = _make_tasks(
+            rng, name.lower().replace(' ', '-'), max(1, tasks_per_day // 2), categories)
+    return routines
+
+
+def generate_recurrence_rules(end_date: date) -> list:
+    return [
+        {"type": "range", "start": date(end_date.year, 12, 20).isoformat(),
+         "end": date(end_date.year, 12, 31).isoformat(), "template": "Holiday"},
+        {"type": "monthly", "day": 1, "template": "Admin"},
+        {"type": "interval", "every": 3,
+         "start": date(end_date.year, 1, 1).isoformat(), "template": "Gym Day"},
+    ]
+
+
+def generate_progress(rng: random.Random, routines: dict, rules: list,
+                      end_date: date, days: int, completion_rate: float) -> dict:
+    """Completes a 'completion_rate' share of each day's tasks, on average."""
+    index = RecurrenceIndex(rules, routines)
+    progress = {}
+    for i in range(days):
+        day = end_date - timedelta(days=i)
+        task_ids = [task["id"] for task in routines.get(index.resolve(day), [])]
+        # Vary day to day so streaks and trends aren't flat
+        rate = min(1.0, max(0.0, rng.gauss(completion_rate, 0.15)))
+        completed = [task_id for task_id in task_ids if rng.random() < rate]
+        if completed:
+            progress[day.isoformat()] = completed
+    return progress
+
+
+def generate_dataset(data_dir: str, years: int = 1, categories: int = 8,
+                     tasks_per_day: int = 20, completion_rate: float = 0.7,
+                     seed: int = 0, end_date: date = DEFAULT_END_DATE) -> dict:
+    """
+    Writes routines/progress/categories/settings/recurrence JSON files into
+    'data_dir' and returns their paths (keyword arguments of DataManager).
+    """
+    rng = random.Random(seed)
+    category_list = _make_categories(rng, categories)
+    routines = generate_routines(rng, tasks_per_day, category_list)
+    rules = generate_recurrence_rules(end_date)
+    progress = generate_progress(rng, routines, rules, end_date,
+                                 years * 365, completion_rate)
+
+    os.makedirs(data_dir, exist_ok=True)
+    paths = {
+        "routines_file": os.path.join(data_dir, "routines.json"),
+        "progress_file": os.path.join(data_dir, "progress.json"),
+        "categories_file": os.path.join(data_dir, "categories.json"),
+        "settings_file": os.path.join(data_dir, "settings.json"),
+    }
+    contents = {
+        "routines_file": routines,
+        "progress_file": progress,
+        "categories_file": category_list,
+        "settings_file": {"theme": "dark"},
+    }
+    for key, path in paths.items():
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(contents[key], f, indent=4)
+    with open(os.path.join(data_dir, "recurrence.json"), 'w', encoding='utf-8') as f:
+        json.dump(rules, f, indent=4)
+    return paths
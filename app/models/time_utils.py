@@ -0,0 +1,61 @@
+"""
+Time-of-day helpers. Tasks store "HH:mm" strings on disk, but in memory
+they only carry integer minutes since midnight (Task.start_minutes /
+end_minutes, parsed once on load). Consumers compare and do arithmetic on
+the integers and look up pre-formatted labels here.
+"""
+
+MINUTES_PER_DAY = 24 * 60
+
+# "9:00 AM"-style labels for every minute of the day, built once
+_LABELS_12H = tuple(
+    f"{(m // 60) % 12 or 12}:{m % 60:02d} {'AM' if m < 12 * 60 else 'PM'}"
+    for m in range(MINUTES_PER_DAY)
+)
+
+
+def parse_time(time_str):
+    """Parses "HH:mm" into minutes since midnight, or None if invalid."""
+    try:
+        hours, minutes = time_str.split(':')
+        hours, minutes = int(hours), int(minutes)
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        return None
+    return hours * 60 + minutes
+
+
+def format_time(minutes) -> str:
+    """Formats minutes since midnight as "HH:mm" (the on-disk format)."""
+    minutes %= MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_time_12h(minutes) -> str:
+    """Pre-formatted 12-hour label, or "" for a missing time."""
+    if minutes is None:
+        return ""
+    return _LABELS_12H[minutes % MINUTES_PER_DAY]
+
+
+def duration_minutes(start, end) -> int:
+    """
+    Length of a start-end interval; end < start wraps past midnight and
+    equal times are an empty task (as in intervals.task_segments).
+    """
+    if start is None or end is None:
+        return 0
+    duration = end - start
+    if duration < 0:  # Overnight task, e.g. 23:00 - 01:00
+        duration += MINUTES_PER_DAY
+    return duration
+
+
+def is_time_within(now: int, start, end) -> bool:
+    """Whether 'now' falls in [start, end), handling midnight crossings."""
+    if start is None or end is None or start == end:
+        return False
+    if start < end:
+        return start <= now < end
+    return now >= start or now < end
@@ -0,0 +1,191 @@
+"""
+Qt object census and leak detection (a diagnostics mode).
+
+After each tracked user action (navigating days, toggling a task, closing
+a dialog), once the event loop has gone quiet and pending deleteLater()s
+have run, the census counts live QObjects by class and Python objects by
+type. Counts swing with what is on screen (days have different numbers of
+tasks), so growth is judged on their floor: the last WINDOW censuses are
+split into BLOCKS, and a class whose per-block minimum rose in every block,
+by at least MIN_GROWTH and MIN_RELATIVE_GROWTH of its count overall (so
+caches warming up in large populations are not reported), is flagged as a
+suspected leak. The full
+timeline can be dumped as JSON.
+"""
+import gc
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+ENV_VAR = "ZENITH_CENSUS"
+
+
+def count_qobjects() -> Counter:
+    """Live QObjects by class: the object trees of the app and its windows,
+    plus any other QObject a Python reference keeps alive."""
+    app = QApplication.instance()
+    seen = set()
+    counts = Counter()
+
+    def visit(obj):
+        if sip.isdeleted(obj):
+            return
+        address = sip.unwrapinstance(obj)
+        if address not in seen:
+            seen.add(address)
+            counts[type(obj).__name__] += 1
+
+    roots = [app] + app.topLevelWidgets() if app else []
+    for root in roots:
+        visit(root)
+        for child in root.findChildren(QObject):
+            visit(child)
+    for obj in gc.get_objects():
+        if isinstance(obj, QObject):
+            visit(obj)
+    return counts
+
+
+def count_python_objects() -> Counter:
+    """GC-tracked Python objects by type (after a full collection)."""
+    gc.collect()
+    return Counter(type(obj).__qualname__ for obj in gc.get_objects())
+
+
+def _rss_bytes():
+    """Current resident set size on Linux, else None."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class ObjectCensus(QObject):
+    SETTLE_MS = 500  # Quiet time after an action before counting
+    WINDOW = 12  # Censuses judged for growth
+    BLOCKS = 3  # ...in blocks whose minimums must keep rising
+    MIN_GROWTH = 5  # ...by at least this much overall
+    MIN_RELATIVE_GROWTH = 0.01  # ...and this fraction of the count
+    MAX_SAMPLES = 200  # Timeline entries kept
+
+    def __init__(self, report_file: str = None, parent=None):
+        super().__init__(parent)
+        self.report_file = report_file
+        self.samples = deque(maxlen=self.MAX_SAMPLES)  # Timeline of totals
+        self._history = {}  # ("qt" | "py", class) -> deque of counts
+        self._flagged = {}  # ("qt" | "py", class) -> growth when flagged
+        self._actions = []  # Actions since the last census
+
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.timeout.connect(self.take)
+
+    def track(self, signal, action: str):
+        """Counts again after every emission of 'signal' (e.g. date_changed)."""
+        signal.connect(lambda *_: self.action_done(action))
+
+    def action_done(self, action: str):
+        self._actions.append(action)
+        self._settle_timer.start(self.SETTLE_MS)  # Restarted by bursts
+
+    # --- Counting ---
+    def take(self) -> dict:
+        """Takes a census now and returns the newly flagged classes."""
+        started = time.perf_counter()
+        qt_counts = count_qobjects()
+        py_counts = count_python_objects()
+        sample = {
+            "time": time.strftime("%H:%M:%S"),
+            "actions": tuple(self._actions),
+            "qobjects": sum(qt_counts.values()),
+            "python_objects": sum(py_counts.values()),
+            "rss_bytes": _rss_bytes(),
+            "census_ms": 0.0,
+        }
+        self._actions = []
+
+        newly_flagged = {}
+        for kind, counts in (("qt", qt_counts), ("py", py_counts)):
+            keys = {key for key in self._history if key[0] == kind}
+            keys.update((kind, name) for name in counts)
+            for key in keys:
+                history = self._history.setdefault(key, deque(maxlen=self.WINDOW))
+                history.append(counts.get(key[1], 0))
+                growth = self._growth(history)
+                if growth is None:
+                    self._flagged.pop(key, None)
+                elif key not in self._flagged:
+                    newly_flagged[key] = growth
+                    self._flagged[key] = growth
+        sample["census_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.samples.append(sample)
+
+        for (kind, name), growth in newly_flagged.items():
+            history = list(self._history[(kind, name)])
+            print(f"Possible leak: {'QObject' if kind == 'qt' else 'Python'} "
+                  f"{name} grew by {growth} over {len(history)} censuses "
+                  f"({' -> '.join(map(str, history))}) after "
+                  f"{', '.join(sample['actions']) or 'manual census'}", file=sys.stderr)
+        return newly_flagged
+
+    def _growth(self, history: deque):
+        """Growth of the count's floor if it rose in every block, else None."""
+        if len(history) < self.WINDOW:
+            return None
+        counts = list(history)
+        size = self.WINDOW // self.BLOCKS
+        floors = [min(counts[i:i + size]) for i in range(0, size * self.BLOCKS, size)]
+        if any(b <= a for a, b in zip(floors, floors[1:])):
+            return None
+        growth = floors[-1] - floors[0]
+        needed = max(self.MIN_GROWTH, floors[0] * self.MIN_RELATIVE_GROWTH)
+        return growth if growth >= needed else None
+
+    # --- Reporting ---
+    def suspects(self) -> list:
+        """Currently flagged classes, largest growth first."""
+        return sorted(
+            ({"kind": kind, "class": name, "growth": growth,
+              "counts": list(self._history[(kind, name)])}
+             for (kind, name), growth in self._flagged.items()),
+            key=lambda s: -s["growth"])
+
+    def report(self) -> dict:
+        first = self.samples[0] if self.samples else None
+        last = self.samples[-1] if self.samples else None
+        return {
+            "censuses": len(self.samples),
+            "qobjects": [first["qobjects"], last["qobjects"]] if first else None,
+            "rss_bytes": [first["rss_bytes"], last["rss_bytes"]] if first else None,
+            "suspects": self.suspects(),
+            "timeline": list(self.samples),
+        }
+
+    def summary(self) -> str:
+        report = self.report()
+        if not report["censuses"]:
+            return "No census taken yet."
+        lines = [f"{report['censuses']} censuses; live QObjects "
+                 f"{report['qobjects'][0]} -> {report['qobjects'][1]}"]
+        if report["rss_bytes"][0] and report["rss_bytes"][1]:
+            lines.append(f"Resident memory {report['rss_bytes'][0] / 2**20:.1f} -> "
+                         f"{report['rss_bytes'][1] / 2**20:.1f} MiB")
+        suspects = report["suspects"]
+        lines.append(f"{len(suspects)} class(es) growing steadily" + (":" if suspects else "."))
+        for s in suspects[:15]:
+            lines.append(f"  {'QObject' if s['kind'] == 'qt' else 'Python'} {s['class']}: "
+                         f"+{s['growth']} ({' -> '.join(map(str, s['counts']))})")
+        return "\n".join(lines)
+
+    def dump(self, path: str = None):
+        path = path or self.report_file
+        if not path:
+            return
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=4)
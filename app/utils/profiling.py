@@ -0,0 +1,169 @@
+"""
+Opt-in timing instrumentation.
+
+Enabled with the ZENITH_PROFILE environment variable (any value but "0")
+or "profiling": true in settings.json. install_default_hooks() then wraps
+the instrumented methods in place; when profiling is off nothing is
+wrapped, so the disabled cost is zero. Timings are kept per operation as a
+rolling window (for percentiles) plus cumulative log-scale buckets, and
+can be dumped as JSON.
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+ENV_VAR = "ZENITH_PROFILE"
+# Upper bucket bounds in milliseconds; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+def is_enabled(settings_file: str = None, env_var: str = ENV_VAR,
+               setting: str = "profiling") -> bool:
+    """
+    Whether a developer option was requested by env var (any value but "0")
+    or a true 'setting' in the settings file. Read before the data manager
+    exists, so the file is parsed directly.
+    """
+    value = os.environ.get(env_var)
+    if value is not None:
+        return value not in ("", "0")
+    if settings_file and os.path.exists(settings_file):
+        try:
+            with open(settings_file, encoding='utf-8') as f:
+                return bool(json.load(f).get(setting, False))
+        except (OSError, ValueError, AttributeError):
+            return False
+    return False
+
+
+class Histogram:
+    """Rolling window of recent durations plus cumulative buckets."""
+
+    def __init__(self, window: int = 1000):
+        self.recent = deque(maxlen=window)
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        self.recent.append(ms)
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def summary(self) -> dict:
+        recent = sorted(self.recent)
+
+        def percentile(p):
+            return recent[min(len(recent) - 1, int(p * len(recent)))] if recent else 0.0
+
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": self.max_ms,
+            "buckets": {
+                (f"<={bound}" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}"): n
+                for i, (bound, n) in enumerate(zip(BUCKET_BOUNDS_MS + (None,), self.buckets))
+                if n
+            },
+        }
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self._histograms = {}
+        self._lock = threading.Lock()  # Analytics loaders run in worker threads
+        self._installed = []  # (owner, attribute, original)
+
+    def record(self, name: str, ms: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: h.summary() for name, h in sorted(self._histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def dump(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "operations": self.snapshot()}, f, indent=4)
+
+    # --- Instrumentation ---
+    def install(self, owner, attribute: str, name: str = None, name_fn=None):
+        """
+        Replaces 'owner.attribute' with a timing wrapper. 'name_fn(*args)'
+        can derive the operation name from the call (e.g. the file saved).
+        """
+        original = getattr(owner, attribute)
+        label = name or f"{owner.__name__}.{attribute}"
+        profiler = self
+        # PyQt drops surplus signal arguments by inspecting the slot; a
+        # *args wrapper would receive them all, so trim to what fits
+        parameters = inspect.signature(original).parameters.values()
+        max_args = None if any(p.kind == p.VAR_POSITIONAL for p in parameters) else sum(
+            p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in parameters)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            if max_args is not None:
+                args = args[:max_args]
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                profiler.record(name_fn(*args, **kwargs) if name_fn else label,
+                                (time.perf_counter() - start) * 1000)
+
+        setattr(owner, attribute, timed)
+        self._installed.append((owner, attribute, original))
+        self.enabled = True
+
+    def uninstall(self):
+        """Restores every wrapped method."""
+        for owner, attribute, original in reversed(self._installed):
+            setattr(owner, attribute, original)
+        self._installed = []
+        self.enabled = False
+
+
+PROFILER = Profiler()
+
+
+def install_default_hooks(profiler: Profiler = PROFILER):
+    """Wraps the controller, main window, data manager and analytics entry points."""
+    from ..controllers.app_controller import AppController
+    from ..views.main_window import MainWindow
+    from ..views.analytics_view_dialog import AnalyticsViewDialog
+    from ..models.data_manager import DataManager
+
+    def file_label(action):
+        return lambda self, filepath, *args, **kwargs: \
+            f"DataManager.{action}:{os.path.basename(filepath)}"
+
+    profiler.install(AppController, "update_task_list")
+    profiler.install(MainWindow, "display_tasks")
+    profiler.install(DataManager, "_load_json", name_fn=file_label("load"))
+    profiler.install(DataManager, "_write_json", name_fn=file_label("save"))
+    profiler.install(AnalyticsViewDialog, "__init__", "AnalyticsViewDialog.construct")
+    profiler.install(AnalyticsViewDialog, "_ensure_tab_built", "AnalyticsViewDialog.build_tab")
@@ -0,0 +1,173 @@
+"""
+Desktop reminders for the daily plan. Every pending reminder is an entry
+in one min-heap ordered by fire time, and a single-shot QTimer is armed for
+the earliest entry only, so nothing polls. Changed plans are diffed per
+task: untouched tasks keep their heap entries, changed or removed tasks
+are invalidated lazily by a generation number. Tomorrow's plan is always
+loaded ahead of time so early-morning reminders and the ends of overnight
+tasks survive midnight.
+"""
+import heapq
+import itertools
+from datetime import date, datetime, time, timedelta
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+REMINDER_START = "start"
+REMINDER_END = "end"
+_ROLLOVER = "rollover"
+
+
+class ReminderScheduler(QObject):
+    """Emits 'reminder_due(kind, task)' ahead of task starts and at task ends."""
+    reminder_due = pyqtSignal(str, object)  # (kind, DisplayTask)
+
+    MAX_TIMER_MS = 60 * 60 * 1000  # Re-arm at least hourly in case the clock jumps
+    LATE_GRACE = timedelta(minutes=5)  # Reminders missed by more are dropped
+
+    def __init__(self, plan_provider, lead_minutes: int = 10, clock=datetime.now, parent=None):
+        super().__init__(parent)
+        self._plan_provider = plan_provider  # date -> list of display tasks
+        self.lead_minutes = lead_minutes
+        self._clock = clock
+
+        self._heap = []  # (fire_at, seq, kind, key, generation)
+        self._seq = itertools.count()  # Tie-breaker; tasks never get compared
+        self._entries = {}  # (date_str, task_id) -> (signature, generation, task)
+        self._generations = itertools.count(1)
+        self._days = []  # Dates whose plans are loaded, oldest first
+        self._rollover_at = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire_due)
+
+    def is_running(self) -> bool:
+        return self._rollover_at is not None
+
+    def start(self):
+        """Loads today's and tomorrow's plans and arms the timer."""
+        self.stop()
+        self._load_window(self._clock().date())
+        self._arm()
+
+    def stop(self):
+        self._timer.stop()
+        self._heap = []
+        self._entries = {}
+        self._days = []
+        self._rollover_at = None
+
+    def refresh(self):
+        """Re-reads the loaded days' plans after a routine or progress change."""
+        if not self.is_running():
+            return
+        today = self._clock().date()
+        for day in self._days:
+            if day >= today:
+                self._load_day(day)
+        self._arm()
+
+    def set_lead_minutes(self, lead_minutes: int):
+        """Changes how early start reminders fire; every start is rescheduled."""
+        self.lead_minutes = lead_minutes
+        if self.is_running():
+            self.start()
+
+    # --- Plan loading ---
+    def _load_window(self, today: date):
+        """Keeps yesterday (overnight ends), today and tomorrow loaded."""
+        window = [today - timedelta(days=1), today, today + timedelta(days=1)]
+        kept = {d.isoformat() for d in window}
+        self._entries = {key: entry for key, entry in self._entries.items()
+                         if key[0] in kept}
+        self._days = [d for d in self._days if d in window]
+        for day in window:
+            if day not in self._days:
+                self._load_day(day)
+
+        self._rollover_at = datetime.combine(today + timedelta(days=1), time())
+        self._push(self._rollover_at, _ROLLOVER, None, None)
+
+    def _load_day(self, day: date):
+        date_str = day.isoformat()
+        start_of_day = datetime.combine(day, time())
+        now = self._clock()
+
+        seen = set()
+        for task in self._plan_provider(day):
+            start, end = task.start_minutes, task.end_minutes
+            if start is None:
+                continue
+            key = (date_str, task.id)
+            seen.add(key)
+            signature = (start, end, task.completed, task.name)
+            existing = self._entries.get(key)
+            if existing and existing[0] == signature:
+                continue  # Its heap entries are still valid
+
+            generation = next(self._generations)
+            self._entries[key] = (signature, generation, task)
+            if task.completed:
+                continue  # No reminders for finished tasks
+
+            start_at = start_of_day + timedelta(minutes=start)
+            events = [(start_at - timedelta(minutes=self.lead_minutes), REMINDER_START)]
+            if end is not None and end != start:
+                end_at = start_of_day + timedelta(minutes=end)
+                if end < start:  # Overnight task ends tomorrow
+                    end_at += timedelta(days=1)
+                events.append((end_at, REMINDER_END))
+            for fire_at, kind in events:
+                if fire_at >= now:
+                    self._push(fire_at, kind, key, generation)
+
+        # Tasks removed from the plan invalidate their entries
+        for key in [k for k in self._entries if k[0] == date_str and k not in seen]:
+            del self._entries[key]
+        if day not in self._days:
+            self._days.append(day)
+            self._days.sort()
+
+    # --- Heap ---
+    def _push(self, fire_at: datetime, kind: str, key, generation):
+        heapq.heappush(self._heap, (fire_at, next(self._seq), kind, key, generation))
+
+    def _is_valid(self, entry) -> bool:
+        fire_at, _, kind, key, generation = entry
+        if kind == _ROLLOVER:
+            return fire_at == self._rollover_at
+        current = self._entries.get(key)
+        return current is not None and current[1] == generation
+
+    def _compact(self):
+        """Drops invalidated entries once they outnumber the live ones."""
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = [e for e in self._heap if self._is_valid(e)]
+            heapq.heapify(self._heap)
+
+    def _arm(self):
+        """Arms the timer for the earliest live entry."""
+        self._compact()
+        while self._heap and not self._is_valid(self._heap[0]):
+            heapq.heappop(self._heap)
+        if not self._heap:
+            self._timer.stop()
+            return
+        delay = (self._heap[0][0] - self._clock()).total_seconds() * 1000
+        self._timer.start(int(min(max(delay, 0), self.MAX_TIMER_MS)))
+
+    def _fire_due(self):
+        now = self._clock()
+        rolled_over = False
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_valid(entry):
+                continue
+            fire_at, _, kind, key, _ = entry
+            if kind == _ROLLOVER:
+                rolled_over = True
+            elif now - fire_at <= self.LATE_GRACE:
+                self.reminder_due.emit(kind, self._entries[key][2])
+        if rolled_over:
+            self._load_window(now.date())
+        self._arm()
@@ -0,0 +1,76 @@
+"""
+Single-instance guard.
+
+The first launch listens on a local socket (a named pipe on Windows) named
+after the user and the data directory. A later launch finds it, asks that
+instance to come to the front and exits before loading any data, so only
+one process ever owns the data files in normal use.
+"""
+import getpass
+import hashlib
+import os
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+
+ACTIVATE = b"activate\n"
+
+
+def server_name(data_dir: str) -> str:
+    """One name per user and data directory."""
+    key = f"{getpass.getuser()}:{os.path.abspath(data_dir)}"
+    return "zenith-" + hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class SingleInstance(QObject):
+    """Emits 'activation_requested' when another launch forwards to this one."""
+    activation_requested = pyqtSignal()
+
+    TIMEOUT_MS = 500
+
+    def __init__(self, data_dir: str, parent=None):
+        super().__init__(parent)
+        self.name = server_name(data_dir)
+        self._server = None
+
+    def forward(self) -> bool:
+        """Asks a running instance to activate; True if one answered."""
+        socket = QLocalSocket()
+        socket.connectToServer(self.name)
+        if not socket.waitForConnected(self.TIMEOUT_MS):
+            return False
+        socket.write(ACTIVATE)
+        delivered = socket.waitForBytesWritten(self.TIMEOUT_MS)
+        socket.disconnectFromServer()
+        return delivered
+
+    def listen(self) -> bool:
+        """
+        Becomes the running instance. False if another instance got there
+        first (two simultaneous launches) and was forwarded to instead.
+        """
+        server = QLocalServer(self)
+        server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        if not server.listen(self.name):
+            if server.serverError() != QAbstractSocket.SocketError.AddressInUseError:
+                return True  # No guard, but nothing to forward to either
+            if self.forward():
+                return False
+            # Left behind by a crashed instance
+            QLocalServer.removeServer(self.name)
+            if not server.listen(self.name):
+                return True
+        server.newConnection.connect(self._on_connection)
+        self._server = server
+        return True
+
+    def _on_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self._on_message(s))
+            socket.disconnected.connect(socket.deleteLater)
+            if socket.bytesAvailable():
+                self._on_message(socket)
+
+    def _on_message(self, socket):
+        if ACTIVATE.strip() in bytes(socket.readAll()):
+            self.activation_requested.emit()
@@ -41,6 +41,7 @@ def get_theme(theme_name="dark"):
         QLabel#headerLabel {{ font-size: 26px; font-weight: 700; color: {p['text-primary']}; }}
         QLabel#dateLabel {{ font-size: 16px; font-weight: 600; color: {p['text-primary']}; }}
         QLabel#progressLabel {{ font-size: 13px; font-weight: 600; text-transform: uppercase; color: {p['text-secondary']}; }}
+        QLabel#conflictLabel {{ font-size: 13px; font-weight: 600; color: #EF4444; }}
         QLabel#noTasksLabel {{ font-size: 16px; color: {p['text-secondary']}; font-style: italic; }}
         QLabel#taskNotesLabel {{
             font-size: 13px;
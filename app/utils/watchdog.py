@@ -0,0 +1,160 @@
+"""
+Event loop stall detection.
+
+A QTimer on the GUI thread records a heartbeat every HEARTBEAT_MS; a daemon
+thread checks it and, once the GUI thread has missed its beat by more than
+the threshold, captures the GUI thread's Python stack with
+sys._current_frames(). When the heartbeat resumes, the stall's duration is
+known and it is logged with the controller operation found in the stack
+(the outermost frame of a method of 'operation_owner'). The worst stalls
+are kept for the in-app viewer.
+
+While the GUI thread runs C code holding the GIL (e.g. a large json.dumps),
+the watcher can only sample afterwards; such stalls are still recorded
+with their duration, marked as not captured.
+"""
+import inspect
+import sys
+import threading
+import time
+import traceback
+from bisect import insort
+from datetime import datetime
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+ENV_VAR = "ZENITH_WATCHDOG"
+
+
+class StallWatchdog(QObject):
+    """Emits 'stall_detected(record)' after each stall over the threshold."""
+    stall_detected = pyqtSignal(dict)
+
+    HEARTBEAT_MS = 50
+    MAX_STACK_FRAMES = 40
+    MAX_KEPT = 20  # Worst stalls kept for the viewer
+
+    def __init__(self, threshold_ms: int = 250, operation_owner=None,
+                 log_file: str = None, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.log_file = log_file
+        self.stall_count = 0
+        # Code objects of the owner's methods, unwrapped (e.g. from profiling)
+        self._owner_codes = {}
+        if operation_owner is not None:
+            for name, member in vars(operation_owner).items():
+                if inspect.isfunction(member):
+                    code = inspect.unwrap(member).__code__
+                    self._owner_codes[code] = f"{operation_owner.__name__}.{name}"
+
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._pending = None  # Stack captured for the stall in progress
+        self._worst = []  # (-duration_ms, seq, record), worst first
+        self._seq = 0
+        self._gui_thread_id = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._beat)
+
+    # --- Control ---
+    def start(self):
+        """Starts watching; must be called on the GUI thread."""
+        if self._thread is not None:
+            return
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+        self._timer.start(self.HEARTBEAT_MS)
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    # --- Results ---
+    def worst_stalls(self) -> list:
+        """The longest stalls so far, longest first."""
+        with self._lock:
+            return [record for _, _, record in self._worst]
+
+    def clear(self):
+        with self._lock:
+            self._worst = []
+            self.stall_count = 0
+
+    # --- GUI thread ---
+    def _beat(self):
+        now = time.monotonic()
+        with self._lock:
+            gap = now - self._last_beat
+            self._last_beat = now
+            pending, self._pending = self._pending, None
+        # A beat may be late by up to one interval without a stall
+        if gap - self.HEARTBEAT_MS / 1000 < self.threshold:
+            return
+        record = {
+            "at": datetime.now().isoformat(timespec='seconds'),
+            "duration_ms": round(gap * 1000),  # Time the loop went without a beat
+            "operation": pending["operation"] if pending else None,
+            "stack": pending["stack"] if pending else None,
+        }
+        self._record(record)
+
+    def _record(self, record: dict):
+        with self._lock:
+            self.stall_count += 1
+            self._seq += 1
+            insort(self._worst, (-record["duration_ms"], self._seq, record))
+            del self._worst[self.MAX_KEPT:]
+        self._log(record)
+        self.stall_detected.emit(record)
+
+    def _log(self, record: dict):
+        lines = [f"[{record['at']}] UI stalled for {record['duration_ms']} ms"
+                 f" during {record['operation'] or 'unknown operation'}"]
+        lines.extend(record["stack"] or ["  (stack not captured)\n"])
+        text = lines[0] + "\n" + "".join(lines[1:])
+        print(text, file=sys.stderr)
+        if self.log_file:
+            try:
+                with open(self.log_file, 'a', encoding='utf-8') as f:
+                    f.write(text + "\n")
+            except OSError as e:
+                print(f"Could not write stall log: {e}", file=sys.stderr)
+
+    # --- Watcher thread ---
+    def _watch(self):
+        interval = min(self.threshold / 2, self.HEARTBEAT_MS / 1000)
+        while not self._stop.wait(interval):
+            with self._lock:
+                late = time.monotonic() - self._last_beat - self.HEARTBEAT_MS / 1000
+                if late < self.threshold or self._pending is not None:
+                    continue
+            sample = self._capture()
+            with self._lock:
+                if self._pending is None:
+                    self._pending = sample
+
+    def _capture(self) -> dict:
+        frame = sys._current_frames().get(self._gui_thread_id)
+        if frame is None:
+            return {"operation": None, "stack": None}
+        operation = None
+        walker = frame
+        while walker is not None:
+            # Keep walking outwards: the outermost owner method is the operation
+            operation = self._owner_codes.get(walker.f_code, operation)
+            walker = walker.f_back
+        stack = traceback.format_stack(frame, limit=self.MAX_STACK_FRAMES)
+        return {"operation": operation, "stack": stack}
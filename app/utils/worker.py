@@ -0,0 +1,78 @@
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a Worker (QRunnable cannot emit signals itself)."""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class Worker(QRunnable):
+    """Runs a callable on the global thread pool and reports the result."""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(fn, on_finished, on_error=None, *args, **kwargs) -> Worker:
+    """
+    Starts 'fn(*args, **kwargs)' in a worker thread. 'on_finished' receives
+    the result on the GUI thread (queued signal). Returns the worker so the
+    caller can keep its signals alive.
+    """
+    worker = Worker(fn, *args, **kwargs)
+    worker.signals.finished.connect(on_finished)
+    if on_error:
+        worker.signals.error.connect(on_error)
+    QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+class MainThreadCall(QObject):
+    """
+    Runs callables on the GUI thread for other threads (e.g. the API server),
+    blocking the caller until the result is ready, so they never touch the
+    model while the GUI is using it. Create it on the GUI thread.
+    """
+    _requested = pyqtSignal(object)
+
+    def __init__(self, timeout: float = 10.0, parent=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self._thread_id = threading.get_ident()
+        self._requested.connect(self._run)  # Queued when emitted from another thread
+
+    def __call__(self, fn):
+        if threading.get_ident() == self._thread_id:
+            return fn()
+        job = {"fn": fn, "done": threading.Event(), "cancelled": False}
+        self._requested.emit(job)
+        if not job["done"].wait(self.timeout):
+            job["cancelled"] = True
+            raise TimeoutError("The app is busy; try again.")
+        if "error" in job:
+            raise job["error"]
+        return job["result"]
+
+    def _run(self, job):
+        if job["cancelled"]:
+            return
+        try:
+            job["result"] = job["fn"]()
+        except Exception as e:
+            job["error"] = e
+        finally:
+            job["done"].set()
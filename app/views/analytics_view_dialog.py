@@ -1,27 +1,40 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QWidget, QTabWidget, QLabel, QGridLayout, QSizePolicy
+    QDialog, QVBoxLayout, QHBoxLayout, QWidget, QTabWidget, QLabel, QComboBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
-# Ensure all necessary Chart components are imported
-from PyQt6.QtCharts import (
-    QChart, QChartView, QBarSeries, QBarSet, QPieSeries, QPieSlice,
-    QBarCategoryAxis, QValueAxis
-)
-from PyQt6.QtGui import QPainter, QColor, QFont, QBrush, QPen
-from PyQt6.QtCore import Qt, QDate
-from datetime import timedelta
+from PyQt6.QtCharts import QChartView
+from PyQt6.QtGui import QPainter, QColor
+from PyQt6.QtCore import Qt
+from datetime import date
+from .heatmap_widget import HeatmapWidget
+from .charts import create_trend_chart, create_allocation_chart, progress_to_points
+from ..utils.worker import run_in_background
+from ..utils.downsampling import lttb
 
 
 class AnalyticsViewDialog(QDialog):
-    def __init__(self, weekly_data, category_data, heatmap_data, categories, theme_palette, parent=None):
+    TREND_RANGES = [("Last 7 Days", 7), ("Last 30 Days", 30), ("Last 90 Days", 90),
+                    ("Last 365 Days", 365), ("All Time", None)]
+    MIN_TREND_POINTS = 60
+    PIXELS_PER_POINT = 4
+
+    def __init__(self, progress_provider, first_tracked_date, category_loader, heatmap_years, streak_loader, categories, theme_palette, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Analytics Dashboard")
         # Increased size slightly for better chart display
         self.setMinimumSize(850, 700)
 
-        # Store data passed from controller
-        self.weekly_data = weekly_data
-        self.category_data = category_data
-        self.heatmap_data = heatmap_data
+        # Callables passed from controller; each runs in a worker thread
+        # the first time its tab is shown
+        self.category_loader = category_loader
+        self.streak_loader = streak_loader
+        # Callable (end_date, days) -> progress map, used by the trend
+        # chart ranges and the heatmap years
+        self.progress_provider = progress_provider
+        self.first_tracked_date = first_tracked_date
+        self._trend_cache = {}  # days -> progress map
+        self.heatmap_years = heatmap_years or [date.today().year]
+        self._heatmap_cache = {}
         self.categories = categories  # Needed for pie chart colors
         self.theme = theme_palette  # The dictionary with theme colors
 
@@ -45,217 +58,311 @@ class AnalyticsViewDialog(QDialog):
         main_layout.addWidget(title)
         main_layout.addSpacing(15)
 
-        # Use tabs for different views
-        tabs = QTabWidget()
-        tabs.addTab(self._create_weekly_chart_tab(), "Weekly Completion")
-        tabs.addTab(self._create_category_chart_tab(), "Time Allocation")
-        tabs.addTab(self._create_heatmap_tab(), "Progress Heatmap")
-
-        main_layout.addWidget(tabs)
-
-    def _apply_chart_theme(self, chart: QChart):
-        """Applies common theme elements to a QChart."""
-        chart.setTitleFont(QFont("Segoe UI Variable", 16, QFont.Weight.Bold))
-        chart.setTitleBrush(QBrush(self.text_color))
-        # Use surface color for chart BG
-        chart.setBackgroundBrush(QBrush(self.surface_color))
-        chart.legend().setLabelColor(self.text_color)
-        chart.legend().setFont(QFont("Segoe UI Variable", 10))
-
-    def _create_weekly_chart_tab(self) -> QWidget:
-        """Creates the tab containing the 7-day completion bar chart."""
-        bar_set = QBarSet("Completion")
-        bar_set.setColor(self.accent_color)  # Use theme accent
-        bar_set.setLabelColor(self.text_color)  # Label on top of bar
-
-        dates = []
-        categories = []  # For x-axis labels
-        today = QDate.currentDate()
-        for i in range(6, -1, -1):  # Iterate from 6 days ago up to today
-            date = today.addDays(-i)
-            date_str = date.toString("yyyy-MM-dd")
-            categories.append(date.toString("ddd d"))  # e.g., "Sat 26"
-            progress = self.weekly_data.get(date_str, 0)
-            # Use 0 for days with no tasks, visually cleaner than gaps
-            bar_set.append(max(progress, 0))  # Ensure non-negative value
-
-        series = QBarSeries()
-        series.append(bar_set)
-        series.setLabelsVisible(True)  # Show percentage on top of bars
-        series.setLabelsFormat("@value%")  # Format label as percentage
-
-        chart = QChart()
-        chart.addSeries(series)
-        chart.setTitle("Last 7 Days Completion")
-        chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
-
-        # X-Axis (Categories for days)
-        axis_x = QBarCategoryAxis()
-        axis_x.append(categories)
-        # Use secondary color for axes
-        axis_x.setLabelsColor(self.secondary_text_color)
-        axis_x.setLabelsFont(QFont("Segoe UI Variable", 10))
-        chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
-        series.attachAxis(axis_x)
-
-        # Y-Axis (Value Axis for percentage)
-        axis_y = QValueAxis()
-        axis_y.setRange(0, 100)
-        axis_y.setTickCount(6)  # 0, 20, 40, 60, 80, 100
-        axis_y.setLabelFormat("%d%%")
-        axis_y.setLabelsColor(self.secondary_text_color)
-        axis_y.setLabelsFont(QFont("Segoe UI Variable", 10))
-        axis_y.setGridLineVisible(True)  # Show subtle grid lines
-        axis_y.setGridLineColor(self.border_color)
-        chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
-        series.attachAxis(axis_y)
-
-        chart.legend().setVisible(False)  # Hide legend for single series
-        self._apply_chart_theme(chart)  # Apply common styling
+        # --- Lazy tabs: (title, data loader, builder) ---
+        # Pages start as a loading placeholder and are built on first show.
+        self._tab_specs = [
+            ("Completion Trend", None, self._create_trend_tab),
+            ("Time Allocation", self.category_loader,
+             self._create_category_chart_tab),
+            ("Progress Heatmap", None, self._create_heatmap_tab),
+            ("Streaks & Rates", self.streak_loader, self._create_streaks_tab),
+        ]
+        self._tab_pages = []
+        self._tab_state = {}  # index -> "loading" | "built"
+        self._workers = []  # Keep worker signals alive until they report
+        self._closed = False
+
+        self.tabs = QTabWidget()
+        for title, _, _ in self._tab_specs:
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            page_layout.addWidget(self._create_loading_label())
+            self._tab_pages.append(page)
+            self.tabs.addTab(page, title)
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
+
+        main_layout.addWidget(self.tabs)
+        self._ensure_tab_built(self.tabs.currentIndex())
+
+    def _create_loading_label(self, text="Loading...") -> QLabel:
+        label = QLabel(text)
+        label.setObjectName("noTasksLabel")
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        return label
+
+    def _ensure_tab_built(self, index: int):
+        """Builds a tab the first time it is shown, loading its data off-thread."""
+        if index < 0 or index in self._tab_state:
+            return
+        _, loader, builder = self._tab_specs[index]
+        if loader is None:
+            self._tab_state[index] = "built"
+            self._set_tab_content(index, builder())
+            return
+
+        self._tab_state[index] = "loading"
+        worker = run_in_background(
+            loader,
+            lambda data, i=index: self._on_tab_data_loaded(i, data),
+            lambda message, i=index: self._on_tab_data_failed(i, message))
+        self._workers.append(worker)
+
+    def done(self, result):
+        # Results that arrive after closing are dropped
+        self._closed = True
+        super().done(result)
+
+    def _on_tab_data_loaded(self, index: int, data):
+        if self._closed:
+            return
+        self._tab_state[index] = "built"
+        _, _, builder = self._tab_specs[index]
+        self._set_tab_content(index, builder(data))
+
+    def _on_tab_data_failed(self, index: int, message: str):
+        if self._closed:
+            return
+        print(f"Error loading analytics data: {message}")
+        self._set_tab_content(index, self._create_loading_label(
+            f"Could not load data:\n{message}"))
+
+    def _set_tab_content(self, index: int, widget: QWidget):
+        """Replaces the placeholder of a tab page with its real content."""
+        layout = self._tab_pages[index].layout()
+        while layout.count():
+            old = layout.takeAt(0).widget()
+            if old:
+                old.deleteLater()
+        layout.addWidget(widget)
+
+    def _create_trend_tab(self) -> QWidget:
+        """Creates the tab with the completion trend over a selectable range."""
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # --- Range selector ---
+        selector_layout = QHBoxLayout()
+        selector_layout.addStretch()
+        self.trend_range_selector = QComboBox()
+        for label, days in self.TREND_RANGES:
+            self.trend_range_selector.addItem(label, days)
+        selector_layout.addWidget(self.trend_range_selector)
+        layout.addLayout(selector_layout)
+
+        self._trend_layout = layout
+        layout.addWidget(self._create_loading_label())
+        self.trend_range_selector.currentIndexChanged.connect(
+            lambda _: self._show_trend_range(self.trend_range_selector.currentData()))
+        self._show_trend_range(self.trend_range_selector.currentData())
+        return container
+
+    def _trend_days(self, days) -> int:
+        """Number of days for a range entry (None = all time)."""
+        if days is None:
+            return max((date.today() - self.first_tracked_date).days + 1, 1)
+        return days
+
+    def _show_trend_range(self, days):
+        """Shows one range, loading its progress off-thread the first time."""
+        days = self._trend_days(days)
+        if days in self._trend_cache:
+            self._set_trend_chart(self._create_trend_chart(
+                self._trend_cache[days], days))
+            return
+
+        self._set_trend_chart(self._create_loading_label())
+        worker = run_in_background(
+            self.progress_provider,
+            lambda data, d=days: self._on_trend_range_loaded(d, data),
+            None, date.today(), days)
+        self._workers.append(worker)
+
+    def _on_trend_range_loaded(self, days: int, progress_map: dict):
+        self._trend_cache[days] = progress_map
+        if self._closed:
+            return
+        if self._trend_days(self.trend_range_selector.currentData()) == days:
+            self._set_trend_chart(self._create_trend_chart(progress_map, days))
+
+    def _set_trend_chart(self, widget: QWidget):
+        # The chart sits below the selector row
+        if self._trend_layout.count() > 1:
+            old = self._trend_layout.takeAt(1).widget()
+            if old:
+                old.deleteLater()
+        self._trend_layout.addWidget(widget)
+
+    def _create_trend_chart(self, progress_map: dict, days: int) -> QWidget:
+        """Creates an area chart of daily completion, downsampled to fit."""
+        points = progress_to_points(progress_map)
+        if not points:
+            return self._create_loading_label("No completion data for this range.")
+
+        # Keep roughly one point per few pixels of plot width
+        max_points = max(self.MIN_TREND_POINTS,
+                         self.tabs.width() // self.PIXELS_PER_POINT)
+        chart = create_trend_chart(
+            lttb(points, max_points), days,
+            f"Daily Completion ({self.trend_range_selector.currentText()})",
+            self.theme)
 
         chart_view = QChartView(chart)
         chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
         return chart_view
 
-    def _create_category_chart_tab(self) -> QWidget:
-        """Creates the tab containing the category time allocation pie chart."""
-        series = QPieSeries()
-        series.setHoleSize(0.35)  # Make it a donut chart
+    def _create_category_chart_tab(self, category_data: dict) -> QWidget:
+        """
+        Creates the tab containing the category time allocation pie chart.
+        'category_data' maps a period label (e.g. "Typical Week") to
+        minutes per category name.
+        """
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # --- Period selector ---
+        selector_layout = QHBoxLayout()
+        selector_layout.addStretch()
+        period_selector = QComboBox()
+        period_selector.addItems(list(category_data.keys()))
+        selector_layout.addWidget(period_selector)
+        layout.addLayout(selector_layout)
+
+        def show_period(period):
+            # Replace the chart below the selector
+            if layout.count() > 1:
+                old = layout.takeAt(1).widget()
+                if old:
+                    old.deleteLater()
+            layout.addWidget(self._create_category_chart(
+                category_data.get(period, {}), period))
+
+        period_selector.currentTextChanged.connect(show_period)
+        show_period(period_selector.currentText())
+        return container
 
-        total_hours = sum(self.category_data.values())
-        if total_hours <= 0:  # Handle case with no data
-            # Optionally return a widget showing "No data"
+    def _create_category_chart(self, minutes_by_category: dict, period: str) -> QWidget:
+        """Creates the pie chart for one period's allocation."""
+        if sum(minutes_by_category.values()) <= 0:  # Handle case with no data
             no_data_label = QLabel("No time allocation data available.")
             no_data_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             return no_data_label
 
-        # Map category names to colors from the loaded categories
-        color_map = {cat['name']: QColor(cat['color'])
-                     for cat in self.categories}
-        default_color = QColor(self.theme['text-secondary'])
-
-        # Sort data for consistent slice order (optional but nice)
-        sorted_categories = sorted(
-            self.category_data.items(), key=lambda item: item[1], reverse=True)
-
-        for name, hours in sorted_categories:
-            if hours <= 0:
-                continue
-            percentage = (hours / total_hours) * 100
-            # Label format: Category Name (X.Yh, Z.Z%)
-            label = f"{name}\n({hours:.1f}h, {percentage:.1f}%)"
-            slice_ = QPieSlice(label, percentage)
-            slice_.setColor(color_map.get(name, default_color))
-            slice_.setLabelFont(
-                QFont("Segoe UI Variable", 9, QFont.Weight.Bold))
-            # Use primary text for labels
-            slice_.setLabelColor(self.text_color)
-            # Explode slice on hover for interactivity
-            slice_.hovered.connect(
-                lambda state, s=slice_: s.setExploded(state))
-
-            series.append(slice_)
-
-        # Labels outside the slices
-        series.setLabelsPosition(QPieSlice.LabelPosition.LabelOutside)
-        series.setLabelsVisible(True)
-
-        chart = QChart()
-        chart.addSeries(series)
-        chart.setTitle("Weekly Time Allocation by Category")
-        chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
-
-        chart.legend().setVisible(False)  # Labels on slices are sufficient
-        self._apply_chart_theme(chart)  # Apply common styling
-        # Specific styling for pie chart labels
-        for s in series.slices():
-            s.setLabelBrush(QBrush(self.text_color))
+        chart = create_allocation_chart(
+            minutes_by_category, self.categories,
+            f"Time Allocation by Category ({period})", self.theme)
 
         chart_view = QChartView(chart)
         chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
         return chart_view
 
     def _create_heatmap_tab(self) -> QWidget:
-        """Creates the tab containing the 35-day calendar heatmap."""
+        """Creates the tab containing the full-year calendar heatmap."""
         container = QWidget()
-        layout = QGridLayout(container)
-        layout.setSpacing(4)  # Tighter spacing for heatmap cells
-
-        today = QDate.currentDate()
-        # Calculate start date: Go back to the Sunday before the date 34 days ago
-        start_date_calc = today.addDays(-34)
-        day_of_week_start = start_date_calc.dayOfWeek() % 7  # 0=Sun, 6=Sat
-        start_date = start_date_calc.addDays(-day_of_week_start)
-
-        # Add day labels (Mon-Sun or Sun-Sat based on locale preference?)
-        # Let's use Mon-Sun common in many places
-        days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        for col, day in enumerate(days):
-            label = QLabel(day)
-            label.setObjectName("heatmapDayLabel")
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(label, 0, col)
-
-        # Create 5 rows x 7 columns grid
-        num_rows = 5
-        for i in range(num_rows * 7):  # 35 days total
-            current_date = start_date.addDays(i)
-            date_str = current_date.toString("yyyy-MM-dd")
-            # Use -2 for dates outside range
-            progress = self.heatmap_data.get(date_str, -2)
-
-            day_cell = QLabel(current_date.toString("d"))  # Day number
-            day_cell.setFixedSize(45, 45)  # Slightly larger cells
-            day_cell.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            # Determine color and tooltip based on progress
-            tooltip_text = f"{current_date.toString('MMM d, yyyy')}: "
-            # Date outside the 35-day range (e.g., future dates if start wasn't Sunday)
-            if progress == -2:
-                # Use base background
-                color_hex = QColor(self.theme['bg-base']).name()
-                tooltip_text += "N/A"
-            elif progress == -1:  # No tasks scheduled
-                color_hex = self.theme['bg-surface-2']  # Use input background
-                tooltip_text += "No tasks"
-            else:  # Valid progress day
-                color_hex = self._get_color_for_progress(progress)
-                tooltip_text += f"{progress}% completed"
-
-            # Apply style and tooltip
-            day_cell.setStyleSheet(f"""
-                background-color: {color_hex};
-                color: {self.theme['text-primary']};
-                border: 1px solid {self.theme['border']};
-                border-radius: 6px;
-                font-weight: 600;
-            """)
-            day_cell.setToolTip(tooltip_text)
-
-            row = i // 7
-            col = i % 7
-            layout.addWidget(day_cell, row + 1, col)  # +1 for header row
-
-        # Add stretchers to push grid to top-left if needed
-        layout.setRowStretch(num_rows + 1, 1)
-        layout.setColumnStretch(7, 1)
-
-        # Optionally add a color scale legend here
-
+        layout = QVBoxLayout(container)
+        layout.setSpacing(10)
+
+        # --- Year selector ---
+        selector_layout = QHBoxLayout()
+        selector_layout.addStretch()
+        self.heatmap_year_selector = QComboBox()
+        for year in sorted(self.heatmap_years, reverse=True):
+            self.heatmap_year_selector.addItem(str(year), year)
+        selector_layout.addWidget(self.heatmap_year_selector)
+        layout.addLayout(selector_layout)
+
+        # --- Single painted widget for all cells ---
+        self.heatmap_widget = HeatmapWidget(self.theme)
+        layout.addWidget(self.heatmap_widget)
+
+        self.heatmap_year_selector.currentIndexChanged.connect(
+            lambda _: self._show_heatmap_year(self.heatmap_year_selector.currentData()))
+        self._show_heatmap_year(self.heatmap_year_selector.currentData())
         return container
 
-    def _get_color_for_progress(self, progress: int) -> str:
-        """Returns a hex color string for the heatmap based on progress %."""
-        if progress < 0:
-            return self.theme['bg-surface-2']  # No tasks
-        if progress == 0:
-            return self.theme['border']  # Zero completion
-
-        # Create a gradient using the secondary accent color for heatmap
-        base_color = QColor(self.theme['accent-secondary'])
-        # Alpha from 0.1 (low) to 1.0 (high)
-        alpha = 0.1 + (progress / 100.0) * 0.9
-        base_color.setAlphaF(alpha)
-
-        # Return in #AARRGGBB format for QSS
-        return base_color.name(QColor.NameFormat.HexArgb)
+    def _show_heatmap_year(self, year: int):
+        """Displays a full Jan-Dec year, fetching its progress only once."""
+        if year is None:
+            return
+        start = date(year, 1, 1)
+        end = date(year, 12, 31)
+        if year in self._heatmap_cache:
+            self.heatmap_widget.set_range(start, end, self._heatmap_cache[year])
+            return
+
+        # Show the empty grid straight away, fill it in when the data arrives
+        self.heatmap_widget.set_range(start, end, {})
+        # Only days up to today can have progress
+        last_day = min(end, date.today())
+        days = (last_day - start).days + 1
+        if days <= 0:
+            self._heatmap_cache[year] = {}
+            return
+        worker = run_in_background(
+            self.progress_provider,
+            lambda data, y=year: self._on_heatmap_year_loaded(y, data),
+            None, last_day, days)
+        self._workers.append(worker)
+
+    def _on_heatmap_year_loaded(self, year: int, progress_map: dict):
+        self._heatmap_cache[year] = progress_map
+        if self._closed:
+            return
+        if self.heatmap_year_selector.currentData() == year:
+            self.heatmap_widget.set_range(
+                date(year, 1, 1), date(year, 12, 31), progress_map)
+
+    def _create_streaks_tab(self, report: dict) -> QWidget:
+        """Creates the tab with streaks, completion rates and skipped tasks."""
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setSpacing(12)
+
+        def format_rate(rate):
+            return "-" if rate is None else f"{rate}%"
+
+        # --- Overall summary ---
+        overall = report["overall"]
+        summary_layout = QHBoxLayout()
+        for caption, value in [
+            ("Current Streak", f"{overall['current_streak']} days"),
+            ("Longest Streak", f"{overall['longest_streak']} days"),
+            (f"Last {report['days']} Days",
+             format_rate(overall['completion_rate'])),
+        ]:
+            label = QLabel(f"{caption}\n{value}")
+            label.setObjectName("dateLabel")
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            summary_layout.addWidget(label)
+        layout.addLayout(summary_layout)
+
+        # --- Per-task table ---
+        table = QTableWidget(len(report["tasks"]), 4)
+        table.setHorizontalHeaderLabels(
+            ["Task Name", "Current Streak", "Longest Streak", f"Last {report['days']} Days"])
+        table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        table.verticalHeader().setVisible(False)
+        table.setAlternatingRowColors(True)
+        for row, task in enumerate(report["tasks"]):
+            table.setItem(row, 0, QTableWidgetItem(task["name"]))
+            table.setItem(row, 1, QTableWidgetItem(
+                str(task["current_streak"])))
+            table.setItem(row, 2, QTableWidgetItem(
+                str(task["longest_streak"])))
+            table.setItem(row, 3, QTableWidgetItem(
+                format_rate(task["completion_rate"])))
+        layout.addWidget(table)
+
+        # --- Most skipped ---
+        skipped_lines = [f"{item['name']}: skipped {item['skipped']} of {item['scheduled']}"
+                         for item in report["most_skipped"]]
+        skipped_label = QLabel("Most skipped: " + (
+            ", ".join(skipped_lines) if skipped_lines else "nothing skipped"))
+        skipped_label.setWordWrap(True)
+        layout.addWidget(skipped_label)
+        return container
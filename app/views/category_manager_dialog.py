@@ -1,14 +1,15 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
     QPushButton, QLineEdit, QColorDialog, QWidget, QLabel,
-    QMessageBox
+    QMessageBox, QInputDialog
 )
 from PyQt6.QtGui import QColor, QPixmap, QPainter, QIcon
 from PyQt6.QtCore import QSize, Qt
 # --- FIX: Import the correct function name 'get_icon' ---
 from ..utils.icons import get_icon
 # -------------------------------------------------------
-import uuid
+from ..models.data_manager import CategoryError, ExternalChangeError
+from ..models.data_lock import DataLockError
 
 
 class CategoryManagerDialog(QDialog):
@@ -18,13 +19,16 @@ class CategoryManagerDialog(QDialog):
         "#EC4899", "#0EA5E9", "#6D28D9", "#F97316", "#A0A0B0"
     ]
 
-    def __init__(self, categories: list, uncategorized_id: str, parent=None):
+    def __init__(self, store, uncategorized_id: str, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Manage Categories")
         self.setMinimumWidth(500)
 
-        self.categories = categories  # Working copy
+        # Changes are applied (and saved) through the DataManager right away
+        self.store = store
         self.uncategorized_id = uncategorized_id
+        self.changed = False
+        self.reassigned = {}  # Deleted/merged category ID -> ID its tasks moved to
         # Default to last preset (grey)
         self.current_color = self.PRESET_COLORS[-1]
 
@@ -105,9 +109,15 @@ class CategoryManagerDialog(QDialog):
         self.delete_btn.setIconSize(QSize(16, 16))
         # -----------------------------------------------
 
+        self.merge_btn = QPushButton("Merge Into...")
+        self.merge_btn.setObjectName("dialogSecondaryButton")
+        self.merge_btn.setToolTip(
+            "Move all tasks of the selected category to another one")
+
         btn_layout.addStretch()
         btn_layout.addWidget(self.add_btn)
         btn_layout.addWidget(self.update_btn)
+        btn_layout.addWidget(self.merge_btn)
         btn_layout.addWidget(self.delete_btn)
         main_layout.addLayout(btn_layout)
 
@@ -116,6 +126,7 @@ class CategoryManagerDialog(QDialog):
         self.add_btn.clicked.connect(self.add_category)
         self.update_btn.clicked.connect(self.update_category)
         self.delete_btn.clicked.connect(self.delete_category)
+        self.merge_btn.clicked.connect(self.merge_category)
 
     def _create_color_icon(self, color_str: str) -> QIcon:
         size = 16
@@ -131,23 +142,24 @@ class CategoryManagerDialog(QDialog):
 
     def _load_categories_list(self):
         self.list_widget.clear()
+        categories = self.store.get_categories()
         sorted_categories = sorted(
-            [c for c in self.categories if c['id'] != self.uncategorized_id],
-            key=lambda x: x['name'].lower()
+            [c for c in categories if c.id != self.uncategorized_id],
+            key=lambda x: x.name.lower()
         )
         uncategorized = next(
-            (c for c in self.categories if c['id'] == self.uncategorized_id), None)
+            (c for c in categories if c.id == self.uncategorized_id), None)
         if uncategorized:
             sorted_categories.insert(0, uncategorized)
 
         for category in sorted_categories:
-            item = QListWidgetItem(category['name'])
+            item = QListWidgetItem(category.name)
             item.setData(Qt.ItemDataRole.UserRole, category)
-            item.setIcon(self._create_color_icon(category['color']))
-            if category['id'] == self.uncategorized_id:
+            item.setIcon(self._create_color_icon(category.color))
+            if category.id == self.uncategorized_id:
                 item.setFlags(
                     item.flags() & ~Qt.ItemFlag.ItemIsSelectable & ~Qt.ItemFlag.ItemIsEnabled)
-                item.setText(f"{category['name']} (Default)")
+                item.setText(f"{category.name} (Default)")
             self.list_widget.addItem(item)
         self._clear_form()
 
@@ -163,9 +175,9 @@ class CategoryManagerDialog(QDialog):
 
         category_data = current_item.data(Qt.ItemDataRole.UserRole)
         if category_data:
-            self.name_input.setText(category_data['name'])
-            self.set_color(category_data['color'])
-            is_uncategorized = (category_data['id'] == self.uncategorized_id)
+            self.name_input.setText(category_data.name)
+            self.set_color(category_data.color)
+            is_uncategorized = (category_data.id == self.uncategorized_id)
             self.name_input.setEnabled(not is_uncategorized)
 
     def set_color(self, color_str: str):
@@ -180,66 +192,59 @@ class CategoryManagerDialog(QDialog):
         if color.isValid():
             self.set_color(color.name())
 
-    def add_category(self):
-        name = self.name_input.text().strip()
-        if not name:
-            QMessageBox.warning(self, "Input Error",
-                                "Category name cannot be empty.")
-            return
-
-        if any(cat['name'].lower() == name.lower() for cat in self.categories):
-            QMessageBox.warning(self, "Input Error",
-                                f"A category named '{name}' already exists.")
-            return
-
-        new_category = {"id": f"cat-{uuid.uuid4()}", "name": name,
-                        "color": self.current_color}
-        self.categories.append(new_category)
+    def _apply(self, change, *args):
+        """Runs a store mutation, reporting CategoryError to the user."""
+        try:
+            result = change(*args)
+        except CategoryError as e:
+            QMessageBox.warning(self, "Input Error", str(e))
+            return None
+        except (ExternalChangeError, DataLockError) as e:
+            # Nothing was overwritten; show what is on disk
+            if isinstance(e, ExternalChangeError):
+                QMessageBox.warning(self, "Not Saved", f"{e}\nThe latest data has been loaded.")
+            else:
+                QMessageBox.warning(self, "Not Saved", f"{e}\nPlease try again.")
+            try:
+                self.store.reload()
+            except DataLockError:
+                pass  # Still being written; the next change checks again
+            result = None
+        self.changed = True
         self._load_categories_list()
+        return result
 
-    def update_category(self):
+    def _selected_category(self, action: str):
         current_item = self.list_widget.currentItem()
         if not current_item:
             QMessageBox.information(
-                self, "Selection Required", "Please select a category to update.")
-            return
-
-        original_data = current_item.data(Qt.ItemDataRole.UserRole)
-        original_id = original_data['id']
+                self, "Selection Required", f"Please select a category to {action}.")
+            return None
+        return current_item.data(Qt.ItemDataRole.UserRole)
 
-        if original_id == self.uncategorized_id:
-            QMessageBox.warning(
-                self, "Cannot Edit", "The default 'Uncategorized' category cannot be modified.")
-            return
-
-        new_name = self.name_input.text().strip()
-        if not new_name:
-            QMessageBox.warning(self, "Input Error",
-                                "Category name cannot be empty.")
-            return
+    def add_category(self):
+        self._apply(self.store.add_category,
+                    self.name_input.text(), self.current_color)
 
-        if any(cat['name'].lower() == new_name.lower() and cat['id'] != original_id for cat in self.categories):
-            QMessageBox.warning(
-                self, "Input Error", f"Another category named '{new_name}' already exists.")
-            return
+    def update_category(self):
+        category_data = self._selected_category("update")
+        if category_data:
+            self._apply(self.store.update_category, category_data.id,
+                        self.name_input.text(), self.current_color)
 
-        for i, category in enumerate(self.categories):
-            if category['id'] == original_id:
-                self.categories[i]['name'] = new_name
-                self.categories[i]['color'] = self.current_color
-                break
-        self._load_categories_list()
+    def _record_reassignment(self, source_id: str, target_id: str):
+        # Keep chains flat: A -> B then B -> C means A -> C
+        for old_id, new_id in self.reassigned.items():
+            if new_id == source_id:
+                self.reassigned[old_id] = target_id
+        self.reassigned[source_id] = target_id
 
     def delete_category(self):
-        current_item = self.list_widget.currentItem()
-        if not current_item:
-            QMessageBox.information(
-                self, "Selection Required", "Please select a category to delete.")
+        category_data = self._selected_category("delete")
+        if not category_data:
             return
-
-        category_data = current_item.data(Qt.ItemDataRole.UserRole)
-        category_id = category_data['id']
-        category_name = category_data['name']
+        category_id = category_data.id
+        category_name = category_data.name
 
         if category_id == self.uncategorized_id:
             QMessageBox.warning(
@@ -253,9 +258,29 @@ class CategoryManagerDialog(QDialog):
                                      QMessageBox.StandardButton.No)
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.categories = [
-                cat for cat in self.categories if cat['id'] != category_id]
-            self._load_categories_list()
+            if self._apply(self.store.delete_category, category_id) is not None:
+                self._record_reassignment(category_id, self.uncategorized_id)
+
+    def merge_category(self):
+        category_data = self._selected_category("merge")
+        if not category_data:
+            return
+        targets = [c for c in self.store.get_categories()
+                   if c.id != category_data.id]
+        names = [c.name for c in targets]
+        name, ok = QInputDialog.getItem(
+            self, "Merge Category",
+            f"Move all tasks of '{category_data.name}' to:", names, 0, False)
+        if not ok:
+            return
+        target_id = targets[names.index(name)].id
+        moved = self._apply(self.store.merge_categories,
+                            [category_data.id], target_id)
+        if moved is not None:
+            self._record_reassignment(category_data.id, target_id)
+            QMessageBox.information(
+                self, "Categories Merged",
+                f"Moved {moved} task(s) from '{category_data.name}' to '{name}'.")
 
     def get_categories(self) -> list:
-        return self.categories
+        return self.store.get_categories()
@@ -0,0 +1,147 @@
+from PyQt6.QtCharts import (
+    QChart, QPieSeries, QPieSlice, QLineSeries, QAreaSeries,
+    QDateTimeAxis, QValueAxis
+)
+from PyQt6.QtGui import QColor, QFont, QBrush, QPen
+from PyQt6.QtCore import Qt, QDate, QDateTime, QTime
+from datetime import date
+
+# Shared chart builders, used by the analytics dialog and by the headless
+# report generator (report.py). They only need a theme palette dict.
+
+ANIMATION_POINT_LIMIT = 60  # Above this, series animations are disabled
+
+
+def apply_chart_theme(chart: QChart, theme: dict):
+    """Applies common theme elements to a QChart."""
+    text_color = QColor(theme['text-primary'])
+    chart.setTitleFont(QFont("Segoe UI Variable", 16, QFont.Weight.Bold))
+    chart.setTitleBrush(QBrush(text_color))
+    # Use surface color for chart BG
+    chart.setBackgroundBrush(QBrush(QColor(theme['bg-surface'])))
+    chart.legend().setLabelColor(text_color)
+    chart.legend().setFont(QFont("Segoe UI Variable", 10))
+
+
+def progress_to_points(progress_map: dict) -> list:
+    """
+    Converts a {date_str: percentage} map to sorted (msecs, percentage)
+    points. Days without tasks (-1) are left out rather than drawn as 0%.
+    """
+    points = []
+    for date_str in sorted(progress_map):
+        progress = progress_map[date_str]
+        if progress < 0:
+            continue
+        day = date.fromisoformat(date_str)
+        msecs = QDateTime(QDate(day.year, day.month, day.day),
+                          QTime(0, 0)).toMSecsSinceEpoch()
+        points.append((msecs, progress))
+    return points
+
+
+def create_trend_chart(points: list, days: int, title: str, theme: dict, animate: bool = True) -> QChart:
+    """Creates an area chart of daily completion from (msecs, %) points."""
+    accent_color = QColor(theme['accent-primary'])
+    secondary_text_color = QColor(theme['text-secondary'])
+
+    upper = QLineSeries()
+    lower = QLineSeries()
+    for msecs, progress in points:
+        upper.append(float(msecs), float(progress))
+        lower.append(float(msecs), 0.0)
+    series = QAreaSeries(upper, lower)
+    # QAreaSeries doesn't own its boundary series; keep them alive with it
+    upper.setParent(series)
+    lower.setParent(series)
+    fill = QColor(accent_color)
+    fill.setAlphaF(0.35)
+    series.setBrush(QBrush(fill))
+    series.setPen(QPen(accent_color, 2))
+    series.setPointsVisible(len(points) <= 31)
+
+    chart = QChart()
+    chart.addSeries(series)
+    chart.setTitle(title)
+    # Animating hundreds of points makes every redraw slow
+    if animate and len(points) <= ANIMATION_POINT_LIMIT:
+        chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
+    else:
+        chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
+
+    axis_x = QDateTimeAxis()
+    axis_x.setFormat("ddd d" if days <= 7 else (
+        "MMM d" if days <= 120 else "MMM yyyy"))
+    axis_x.setTickCount(min(len(points), 8) if len(points) > 1 else 2)
+    axis_x.setLabelsColor(secondary_text_color)
+    axis_x.setLabelsFont(QFont("Segoe UI Variable", 10))
+    axis_x.setGridLineVisible(False)
+    chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
+    series.attachAxis(axis_x)
+
+    axis_y = QValueAxis()
+    axis_y.setRange(0, 100)
+    axis_y.setTickCount(6)  # 0, 20, 40, 60, 80, 100
+    axis_y.setLabelFormat("%d%%")
+    axis_y.setLabelsColor(secondary_text_color)
+    axis_y.setLabelsFont(QFont("Segoe UI Variable", 10))
+    axis_y.setGridLineVisible(True)  # Show subtle grid lines
+    axis_y.setGridLineColor(QColor(theme['border']))
+    chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
+    series.attachAxis(axis_y)
+
+    chart.legend().setVisible(False)  # Hide legend for single series
+    apply_chart_theme(chart, theme)  # Apply common styling
+    return chart
+
+
+def create_allocation_chart(minutes_by_category: dict, categories: list, title: str,
+                            theme: dict, animate: bool = True) -> QChart:
+    """Creates the category time allocation donut chart."""
+    text_color = QColor(theme['text-primary'])
+    series = QPieSeries()
+    series.setHoleSize(0.35)  # Make it a donut chart
+
+    total_minutes = sum(minutes_by_category.values())
+
+    # Map category names to colors from the loaded categories
+    color_map = {cat.name: QColor(cat.color) for cat in categories}
+    default_color = QColor(theme['text-secondary'])
+
+    # Sort data for consistent slice order (optional but nice)
+    sorted_categories = sorted(
+        minutes_by_category.items(), key=lambda item: item[1], reverse=True)
+
+    for name, minutes in sorted_categories:
+        if minutes <= 0:
+            continue
+        hours = minutes / 60
+        percentage = (minutes / total_minutes) * 100
+        # Label format: Category Name (X.Yh, Z.Z%)
+        label = f"{name}\n({hours:.1f}h, {percentage:.1f}%)"
+        slice_ = QPieSlice(label, percentage)
+        slice_.setColor(color_map.get(name, default_color))
+        slice_.setLabelFont(QFont("Segoe UI Variable", 9, QFont.Weight.Bold))
+        # Use primary text for labels
+        slice_.setLabelColor(text_color)
+        # Explode slice on hover for interactivity
+        slice_.hovered.connect(lambda state, s=slice_: s.setExploded(state))
+
+        series.append(slice_)
+
+    # Labels outside the slices
+    series.setLabelsPosition(QPieSlice.LabelPosition.LabelOutside)
+    series.setLabelsVisible(True)
+
+    chart = QChart()
+    chart.addSeries(series)
+    chart.setTitle(title)
+    if animate:
+        chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
+
+    chart.legend().setVisible(False)  # Labels on slices are sufficient
+    apply_chart_theme(chart, theme)  # Apply common styling
+    # Specific styling for pie chart labels
+    for s in series.slices():
+        s.setLabelBrush(QBrush(text_color))
+    return chart
@@ -0,0 +1,50 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+    QPushButton, QLabel
+)
+from PyQt6.QtCore import Qt
+
+
+class CopyTasksDialog(QDialog):
+    """Picks the templates the selected tasks are copied to."""
+
+    def __init__(self, template_names: list, task_count: int, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Copy Tasks")
+        self.setMinimumSize(320, 380)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+        layout.addWidget(QLabel(f"Copy {task_count} task(s) to:"))
+
+        self.template_list = QListWidget()
+        for name in template_names:
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.template_list.addItem(item)
+        layout.addWidget(self.template_list)
+
+        hint = QLabel("Tasks with the same ID in a target are replaced.")
+        hint.setWordWrap(True)
+        layout.addWidget(hint)
+
+        # --- Buttons ---
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setObjectName("dialogSecondaryButton")
+        self.copy_button = QPushButton("Copy")
+        self.copy_button.setObjectName("dialogPrimaryButton")
+        btn_layout.addWidget(self.cancel_button)
+        btn_layout.addWidget(self.copy_button)
+        layout.addLayout(btn_layout)
+
+        self.cancel_button.clicked.connect(self.reject)
+        self.copy_button.clicked.connect(self.accept)
+
+    def selected_templates(self) -> list:
+        return [self.template_list.item(i).text()
+                for i in range(self.template_list.count())
+                if self.template_list.item(i).checkState() == Qt.CheckState.Checked]
@@ -0,0 +1,73 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+    QPushButton, QLabel, QSpinBox
+)
+from PyQt6.QtCore import Qt
+from ..models.time_utils import format_time_12h
+
+
+class FreeSlotsDialog(QDialog):
+    """Lists the free gaps of a template so they can be filled with tasks."""
+
+    def __init__(self, interval_index, template_name: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Free Time - {template_name}")
+        self.setMinimumSize(420, 420)
+        self.interval_index = interval_index
+        self.selected_slot = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        # --- Minimum gap length ---
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Show gaps of at least"))
+        self.min_length_input = QSpinBox()
+        self.min_length_input.setRange(5, 24 * 60)
+        self.min_length_input.setSingleStep(15)
+        self.min_length_input.setValue(15)
+        self.min_length_input.setSuffix(" min")
+        filter_layout.addWidget(self.min_length_input)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+
+        self.slot_list = QListWidget()
+        layout.addWidget(self.slot_list)
+
+        # --- Buttons ---
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        self.close_button = QPushButton("Close")
+        self.close_button.setObjectName("dialogSecondaryButton")
+        self.fill_button = QPushButton("Add Task Here")
+        self.fill_button.setObjectName("dialogPrimaryButton")
+        btn_layout.addWidget(self.close_button)
+        btn_layout.addWidget(self.fill_button)
+        layout.addLayout(btn_layout)
+
+        self.min_length_input.valueChanged.connect(self._load_slots)
+        self.slot_list.itemDoubleClicked.connect(lambda _: self._fill_selected())
+        self.fill_button.clicked.connect(self._fill_selected)
+        self.close_button.clicked.connect(self.reject)
+        self._load_slots()
+
+    def _load_slots(self):
+        self.slot_list.clear()
+        for start, end in self.interval_index.free_slots(self.min_length_input.value()):
+            length = (end - start) % (24 * 60) or 24 * 60
+            hours, minutes = divmod(length, 60)
+            duration = f"{hours}h {minutes:02d}m" if hours else f"{minutes}m"
+            item = QListWidgetItem(
+                f"{format_time_12h(start)} - {format_time_12h(end)}   ({duration})")
+            item.setData(Qt.ItemDataRole.UserRole, (start, end))
+            self.slot_list.addItem(item)
+        self.fill_button.setEnabled(self.slot_list.count() > 0)
+        if self.slot_list.count():
+            self.slot_list.setCurrentRow(0)
+
+    def _fill_selected(self):
+        item = self.slot_list.currentItem()
+        if item:
+            self.selected_slot = item.data(Qt.ItemDataRole.UserRole)
+            self.accept()
@@ -0,0 +1,207 @@
+from PyQt6.QtWidgets import QWidget, QToolTip, QSizePolicy
+from PyQt6.QtCore import Qt, QRectF, QEvent, QSize
+from PyQt6.QtGui import QPainter, QColor, QFont
+from datetime import date, timedelta
+
+
+class HeatmapWidget(QWidget):
+    """
+    A calendar heatmap that paints any number of weeks (e.g. a GitHub-style
+    53x7 year view) in a single paintEvent. Columns are weeks, rows are
+    weekdays (Mon-Sun). Colors are precomputed once per data set, and
+    tooltips come from hit-testing the cell under the cursor.
+    """
+
+    DAY_LABELS = ["Mon", "", "Wed", "", "Fri", "", "Sun"]
+    MIN_CELL = 6
+    MAX_CELL = 40
+
+    def __init__(self, theme_palette: dict, parent=None):
+        super().__init__(parent)
+        self.theme = theme_palette
+        self.setMouseTracking(True)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding,
+                           QSizePolicy.Policy.Expanding)
+
+        self._label_font = QFont("Segoe UI Variable", 9)
+        self._label_color = QColor(self.theme['text-secondary'])
+        self._border_color = QColor(self.theme['border'])
+
+        # --- Color lookup: one QColor per progress value, built once ---
+        self._out_of_range_color = QColor(self.theme['bg-base'])
+        self._no_tasks_color = QColor(self.theme['bg-surface-2'])
+        self._progress_colors = [self._color_for_progress(p)
+                                 for p in range(101)]
+
+        # Data (set via set_range)
+        self._start_date = date.today()
+        self._num_days = 0
+        self._offset = 0  # Weekday of the first day (0=Mon)
+        self._num_weeks = 0
+        self._progress = []  # Progress value per day index
+        self._colors = []  # Precomputed QColor per day index
+
+        # Geometry (recomputed on resize only)
+        self._cell = 0
+        self._gap = 0
+        self._origin_x = 0
+        self._origin_y = 0
+
+    # --- Data ---
+    def set_range(self, start_date: date, end_date: date, progress_map: dict):
+        """
+        Sets the date range to display. 'progress_map' maps ISO date strings
+        to a percentage, -1 (no tasks) or is missing (no data).
+        """
+        self._start_date = start_date
+        self._num_days = max((end_date - start_date).days + 1, 0)
+        self._offset = start_date.weekday()
+        self._num_weeks = -(-(self._offset + self._num_days) // 7)
+
+        self._progress = []
+        self._colors = []
+        for i in range(self._num_days):
+            progress = progress_map.get(
+                (start_date + timedelta(days=i)).isoformat(), -2)
+            self._progress.append(progress)
+            if progress == -2:
+                self._colors.append(self._out_of_range_color)
+            elif progress < 0:
+                self._colors.append(self._no_tasks_color)
+            else:
+                self._colors.append(self._progress_colors[min(progress, 100)])
+
+        self._update_geometry()
+        self.update()
+
+    def _color_for_progress(self, progress: int) -> QColor:
+        """Same gradient as the original label-based heatmap."""
+        if progress == 0:
+            return QColor(self.theme['border'])
+        color = QColor(self.theme['accent-secondary'])
+        color.setAlphaF(0.1 + (progress / 100.0) * 0.9)
+        return color
+
+    # --- Geometry ---
+    def _label_width(self) -> int:
+        return 34
+
+    def _label_height(self) -> int:
+        return 18
+
+    def _update_geometry(self):
+        if self._num_weeks == 0:
+            self._cell = 0
+            return
+        avail_w = self.width() - self._label_width()
+        avail_h = self.height() - self._label_height()
+        pitch = min(avail_w / self._num_weeks, avail_h / 7)
+        pitch = max(self.MIN_CELL, min(pitch, self.MAX_CELL + 4))
+        self._gap = max(1, int(pitch * 0.12))
+        self._cell = max(1, int(pitch) - self._gap)
+
+        grid_w = self._num_weeks * (self._cell + self._gap)
+        grid_h = 7 * (self._cell + self._gap)
+        self._origin_x = self._label_width() + max(0, (avail_w - grid_w) // 2)
+        self._origin_y = self._label_height() + max(0, (avail_h - grid_h) // 2)
+
+    def resizeEvent(self, event):
+        self._update_geometry()
+        super().resizeEvent(event)
+
+    def sizeHint(self) -> QSize:
+        return QSize(self._label_width() + max(self._num_weeks, 5) * 16,
+                     self._label_height() + 7 * 16)
+
+    def minimumSizeHint(self) -> QSize:
+        return QSize(self._label_width() + max(self._num_weeks, 1) * self.MIN_CELL,
+                     self._label_height() + 7 * self.MIN_CELL)
+
+    def _cell_rect(self, col: int, row: int) -> QRectF:
+        pitch = self._cell + self._gap
+        return QRectF(self._origin_x + col * pitch, self._origin_y + row * pitch,
+                      self._cell, self._cell)
+
+    def _index_at(self, pos):
+        """Returns the day index under 'pos', or -1 if none."""
+        if self._cell == 0:
+            return -1
+        pitch = self._cell + self._gap
+        x = pos.x() - self._origin_x
+        y = pos.y() - self._origin_y
+        if x < 0 or y < 0:
+            return -1
+        col, row = int(x // pitch), int(y // pitch)
+        if col >= self._num_weeks or row >= 7:
+            return -1
+        if x - col * pitch > self._cell or y - row * pitch > self._cell:
+            return -1  # Inside the gap between cells
+        index = col * 7 + row - self._offset
+        return index if 0 <= index < self._num_days else -1
+
+    # --- Painting ---
+    def paintEvent(self, event):
+        if self._cell == 0:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        pitch = self._cell + self._gap
+        radius = min(3.0, self._cell / 4)
+        dirty = QRectF(event.rect())
+
+        # Cells
+        painter.setPen(Qt.PenStyle.NoPen)
+        for index, color in enumerate(self._colors):
+            slot = index + self._offset
+            rect = self._cell_rect(slot // 7, slot % 7)
+            if not dirty.intersects(rect):
+                continue
+            painter.setBrush(color)
+            painter.drawRoundedRect(rect, radius, radius)
+
+        # Weekday labels
+        painter.setFont(self._label_font)
+        painter.setPen(self._label_color)
+        for row, label in enumerate(self.DAY_LABELS):
+            if label:
+                painter.drawText(QRectF(0, self._origin_y + row * pitch,
+                                        self._label_width() - 6, self._cell),
+                                 Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                                 label)
+
+        # Month labels (above the first week containing the 1st)
+        last_month = None
+        for col in range(self._num_weeks):
+            index = max(col * 7 - self._offset, 0)
+            if index >= self._num_days:
+                break
+            day = self._start_date + timedelta(days=index)
+            if day.month != last_month:
+                last_month = day.month
+                painter.drawText(QRectF(self._origin_x + col * pitch, self._origin_y - self._label_height(),
+                                        pitch * 4, self._label_height()),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                                 day.strftime("%b"))
+        painter.end()
+
+    # --- Tooltips ---
+    def event(self, event):
+        if event.type() == QEvent.Type.ToolTip:
+            index = self._index_at(event.pos())
+            if index < 0:
+                QToolTip.hideText()
+                event.ignore()
+                return True
+            QToolTip.showText(event.globalPos(), self._tooltip_for(index), self)
+            return True
+        return super().event(event)
+
+    def _tooltip_for(self, index: int) -> str:
+        day = self._start_date + timedelta(days=index)
+        progress = self._progress[index]
+        text = f"{day.strftime('%b')} {day.day}, {day.year}: "
+        if progress == -2:
+            return text + "N/A"
+        if progress == -1:
+            return text + "No tasks"
+        return text + f"{progress}% completed"
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QScrollArea, QProgressBar, QGraphicsDropShadowEffect
+    QPushButton, QScrollArea, QProgressBar, QGraphicsDropShadowEffect,
+    QLineEdit, QListWidget, QListWidgetItem, QMessageBox
     # QStyle is no longer needed here
 )
 from PyQt6.QtCore import QDate, pyqtSignal, Qt, QSize, QTimer, QTime
@@ -12,6 +13,8 @@ from ..utils.theme import THEME_PALETTES  # Keep for shadow color if needed
 from .theme_switch import ThemeSwitch
 from .task_card_widget import TaskCardWidget
 from .custom_date_edit import CustomDateEdit
+from ..models.time_utils import is_time_within
+from datetime import date
 
 
 class MainWindow(QMainWindow):
@@ -20,12 +23,19 @@ class MainWindow(QMainWindow):
     manage_routines_requested = pyqtSignal()
     completion_toggled = pyqtSignal(str, bool)
     analytics_requested = pyqtSignal()
+    reminders_toggled = pyqtSignal(bool)
+    search_changed = pyqtSignal(str)
+
+    SEARCH_DELAY_MS = 150  # Debounce between keystrokes and a search
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Zenith Routine Dashboard")
         self.setMinimumSize(900, 750)
         self.task_widgets = []
+        self._theme_name = "dark"
+        self._notice = None  # Non-modal reminder box, replaced by the next one
+        self.stats_provider = None  # task_id -> streak/rate dict, set by the controller
         self._setup_ui()
 
         self.highlight_timer = QTimer(self)
@@ -58,10 +68,25 @@ class MainWindow(QMainWindow):
         self.analytics_button.setToolTip("Show Analytics")
         # ---------------------------------------------------------
 
+        self.reminders_button = QPushButton()
+        self.reminders_button.setObjectName("iconButton")
+        self.reminders_button.setIconSize(QSize(22, 22))
+        self.reminders_button.setCheckable(True)
+
         self.theme_switch = ThemeSwitch()
 
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search tasks, notes, categories...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedWidth(280)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+
         header_layout.addWidget(self.header_label)
         header_layout.addStretch()
+        header_layout.addWidget(self.search_input)
+        header_layout.addWidget(self.reminders_button)
         header_layout.addWidget(self.analytics_button)
         header_layout.addWidget(self.theme_switch)
         self.main_layout.addLayout(header_layout)
@@ -120,6 +145,13 @@ class MainWindow(QMainWindow):
         self.scroll_area.setWidget(self.scroll_content)
         self.main_layout.addWidget(self.scroll_area)  # Add scroll area
 
+        # --- Search results (replace the task list while searching) ---
+        self.search_results = QListWidget()
+        self.search_results.setObjectName("searchResults")
+        self.search_results.setWordWrap(True)
+        self.search_results.hide()
+        self.main_layout.addWidget(self.search_results)
+
         # --- Bottom Button ---
         self.manage_routines_button = QPushButton("Manage Routines")
         self.manage_routines_button.setObjectName("primaryButton")
@@ -143,12 +175,18 @@ class MainWindow(QMainWindow):
             self.manage_routines_requested.emit)
         self.theme_switch.toggled.connect(self.theme_changed.emit)
         self.analytics_button.clicked.connect(self.analytics_requested.emit)
+        self.reminders_button.toggled.connect(self._on_reminders_toggled)
+        self.search_input.textChanged.connect(self._on_search_text_changed)
+        self.search_timer.timeout.connect(
+            lambda: self.search_changed.emit(self.search_input.text().strip()))
 
         # Set initial date label after widgets are created
         self._on_date_changed(self.date_selector.date())
 
     def update_theme_elements(self, theme_name: str):
         """Update icons based on the selected theme."""
+        self._theme_name = theme_name
+        self._update_reminders_button()
         # --- FIX: Load the correct icon based on theme name ---
         if theme_name == "dark":
             self.analytics_button.setIcon(get_icon("analytics_light"))
@@ -163,6 +201,87 @@ class MainWindow(QMainWindow):
         # Settings icon on the bottom button remains white regardless of theme
         self.manage_routines_button.setIcon(get_icon("settings_white"))
 
+    def show_notice(self, title: str, message: str):
+        """Shows a non-modal notice (e.g. a reminder when there is no tray icon)."""
+        if self._notice is not None:
+            self._notice.destroyed.disconnect(self._forget_notice)
+            self._notice.close()
+        self._notice = QMessageBox(QMessageBox.Icon.Information, title, message,
+                                   QMessageBox.StandardButton.Ok, self)
+        self._notice.setModal(False)
+        self._notice.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self._notice.destroyed.connect(self._forget_notice)
+        self._notice.show()
+
+    def _forget_notice(self, notice=None):
+        self._notice = None
+
+    def bring_to_front(self):
+        """Restores and focuses the window (e.g. when the app is launched again)."""
+        if self.isMinimized():
+            self.showNormal()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def set_reminders_enabled(self, enabled: bool):
+        """Sets the reminder toggle without emitting 'reminders_toggled'."""
+        self.reminders_button.blockSignals(True)
+        self.reminders_button.setChecked(enabled)
+        self.reminders_button.blockSignals(False)
+        self._update_reminders_button()
+
+    def _on_reminders_toggled(self, enabled: bool):
+        self._update_reminders_button()
+        self.reminders_toggled.emit(enabled)
+
+    def _update_reminders_button(self):
+        suffix = "_light" if self._theme_name == "dark" else "_dark"
+        if self.reminders_button.isChecked():
+            self.reminders_button.setIcon(get_icon("bell" + suffix))
+            self.reminders_button.setToolTip("Task reminders are on")
+        else:
+            self.reminders_button.setIcon(get_icon("bell-off" + suffix))
+            self.reminders_button.setToolTip("Task reminders are off")
+
+    # --- Search ---
+    def _on_search_text_changed(self, text: str):
+        if text.strip():
+            self.search_timer.start()  # Restarts on every keystroke
+        else:
+            self.search_timer.stop()
+            self.search_results.hide()
+            self.scroll_area.show()
+
+    def show_search_results(self, results: list):
+        """Lists matching tasks with their templates and completion history."""
+        self.search_results.clear()
+        if not results:
+            item = QListWidgetItem(
+                f"No tasks match '{self.search_input.text().strip()}'.")
+            item.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.search_results.addItem(item)
+        for result in results:
+            history = result['history']
+            if history['scheduled']:
+                done = (f"Done {history['completed']} of {history['scheduled']} "
+                        f"({history['completion_rate']}%)")
+            else:
+                done = "Not tracked yet"
+            if history['last_completed']:
+                last = date.fromisoformat(history['last_completed'])
+                done += f"  ·  Last done {last.strftime('%b')} {last.day}, {last.year}"
+            if history['current_streak']:
+                done += f"  ·  Streak {history['current_streak']} days"
+            item = QListWidgetItem(
+                f"{result['name']}  ·  {result['category_name']}\n"
+                f"In: {', '.join(result['templates'])}\n{done}")
+            if result['notes']:
+                item.setToolTip(result['notes'])
+            self.search_results.addItem(item)
+        self.scroll_area.hide()
+        self.search_results.show()
+
     def _clear_task_list(self):
         # ... (same as before) ...
         self.task_widgets = []
@@ -186,7 +305,8 @@ class MainWindow(QMainWindow):
             self.task_list_layout.addStretch(1)
         else:
             for task_data in tasks:
-                card = TaskCardWidget(task_data, self.scroll_content)
+                card = TaskCardWidget(task_data, self.scroll_content,
+                                      stats_provider=self.stats_provider)
                 card.completion_toggled.connect(self.completion_toggled.emit)
                 self.task_list_layout.addWidget(card)
                 self.task_widgets.append(card)
@@ -215,12 +335,10 @@ class MainWindow(QMainWindow):
     def _update_current_task_highlight(self):
         # ... (same as before) ...
         is_today = (self.get_current_date() == QDate.currentDate())
-        current_time_str = QTime.currentTime().toString("HH:mm")
+        now = QTime.currentTime()
+        now_minutes = now.hour() * 60 + now.minute()
 
         for card in self.task_widgets:
-            is_current = False
-            if is_today and not card.checkbox.isChecked():
-                if card.start_time and card.end_time:
-                    if card.start_time <= current_time_str < card.end_time:
-                        is_current = True
+            is_current = (is_today and not card.checkbox.isChecked()
+                          and is_time_within(now_minutes, card.start_minutes, card.end_minutes))
             card.set_is_current(is_current)
@@ -0,0 +1,77 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QPushButton, QLabel, QHeaderView, QFileDialog
+)
+from PyQt6.QtCore import Qt, QTimer
+
+
+class ProfilerDialog(QDialog):
+    """Developer view of the profiler's per-operation timings."""
+    COLUMNS = ["Operation", "Calls", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)"]
+    REFRESH_MS = 1000
+
+    def __init__(self, profiler, dump_path: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Profiler")
+        self.setMinimumSize(640, 360)
+        self.profiler = profiler
+        self.dump_path = dump_path
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+        layout.addWidget(QLabel("Timings over the last 1000 calls of each operation."))
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        # --- Buttons ---
+        btn_layout = QHBoxLayout()
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.setObjectName("dialogSecondaryButton")
+        self.dump_button = QPushButton("Save JSON...")
+        self.dump_button.setObjectName("dialogSecondaryButton")
+        self.close_button = QPushButton("Close")
+        self.close_button.setObjectName("dialogPrimaryButton")
+        btn_layout.addWidget(self.reset_button)
+        btn_layout.addWidget(self.dump_button)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.close_button)
+        layout.addLayout(btn_layout)
+
+        self.reset_button.clicked.connect(self._reset)
+        self.dump_button.clicked.connect(self._dump)
+        self.close_button.clicked.connect(self.accept)
+
+        # Live while open; the dialog is non-modal so timings keep coming in
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(self.REFRESH_MS)
+        self.refresh()
+
+    def refresh(self):
+        snapshot = self.profiler.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, stats) in enumerate(snapshot.items()):
+            values = [name, str(stats["count"])] + [
+                f"{stats[key]:.2f}" for key in ("mean_ms", "p50_ms", "p95_ms", "max_ms")]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def _reset(self):
+        self.profiler.reset()
+        self.refresh()
+
+    def _dump(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Profile", self.dump_path, "JSON Files (*.json)")
+        if path:
+            self.profiler.dump(path)
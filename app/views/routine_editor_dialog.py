@@ -1,34 +1,51 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QTableWidget,
+    QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QTableView,
     QPushButton, QHeaderView, QAbstractItemView,
-    QTableWidgetItem, QMessageBox, QSpacerItem, QSizePolicy
+    QMessageBox, QSpacerItem, QSizePolicy, QLabel, QInputDialog, QMenu,
+    QLineEdit
 )
-from PyQt6.QtCore import Qt, QSize, QTime
+from PyQt6.QtCore import Qt, QSize
 # --- FIX: Import the correct function name ---
 from ..utils.icons import get_icon
 # ------------------------------------------
 from .task_dialog import TaskDialog
-from .category_manager_dialog import CategoryManagerDialog
+from .free_slots_dialog import FreeSlotsDialog
+from .copy_tasks_dialog import CopyTasksDialog
+from .routine_table_model import RoutineTableModel, RoutineSortProxyModel
+from ..models.time_utils import MINUTES_PER_DAY
+from ..models.records import Task
+from ..models.intervals import find_conflicts, conflicting_ids, IntervalIndex
+import html
 import uuid
 
 
 class RoutineEditorDialog(QDialog):
     # Keep track of the controller to call back for saving categories
     controller = None
+    MAX_CONFLICTS_SHOWN = 3
+    BUILTIN_TEMPLATES = ["default", "Monday", "Tuesday", "Wednesday",
+                         "Thursday", "Friday", "Saturday", "Sunday"]
+    DEFAULT_SUGGESTION_START = 9 * 60  # Suggestions start looking at 9:00 AM
+    SUGGESTION_LENGTHS = (60, 30, 15)  # Preferred new-task lengths, in order
 
-    def __init__(self, routines_data: dict, categories: list, uncategorized_id: str, parent=None):
+    def __init__(self, routines_data, categories: list, uncategorized_id: str, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Manage Routine Templates")
         self.setMinimumSize(800, 600)
 
-        self.routines = routines_data  # Working copy
+        self.routines = routines_data  # RoutineEditSession (copy-on-write)
         self.categories = categories  # Keep local ref for task dialog
         self.uncategorized_id = uncategorized_id
         self.current_day = "default"
+        self._interval_indexes = {}  # template name -> IntervalIndex
+
+        self.table_model = RoutineTableModel(categories, uncategorized_id, self)
+        self.proxy_model = RoutineSortProxyModel(self)
+        self.proxy_model.setSourceModel(self.table_model)
 
         self._setup_ui()
         self._connect_signals()
-        self.day_selector.setCurrentText("default")  # Trigger initial load
+        self.day_selection_changed(self.day_selector.currentText())  # Initial load
 
     def _setup_ui(self):
         layout = QVBoxLayout(self)
@@ -38,12 +55,18 @@ class RoutineEditorDialog(QDialog):
         # --- Top controls ---
         top_layout = QHBoxLayout()
         self.day_selector = QComboBox()
-        self.day_selector.addItems([
-            "default", "Monday", "Tuesday", "Wednesday",
-            "Thursday", "Friday", "Saturday", "Sunday"
-        ])
+        self.day_selector.addItems(self.BUILTIN_TEMPLATES)
+        # Named templates used by recurrence rules (e.g. "Holiday")
+        self.day_selector.addItems(sorted(
+            name for name in self.routines if name not in self.BUILTIN_TEMPLATES))
         top_layout.addWidget(self.day_selector)
 
+        self.new_template_btn = QPushButton("New Template")
+        self.new_template_btn.setObjectName("secondaryButton")
+        self.new_template_btn.setToolTip(
+            "Create a named template for recurrence rules")
+        top_layout.addWidget(self.new_template_btn)
+
         self.manage_categories_btn = QPushButton("Manage Categories")
         self.manage_categories_btn.setObjectName("secondaryButton")
         # Can add category icon later if needed
@@ -72,26 +95,64 @@ class RoutineEditorDialog(QDialog):
         self.delete_task_btn.setIconSize(QSize(16, 16))
         # -----------------------------------------------
 
+        self.free_slots_btn = QPushButton("Fill Gaps")
+        self.free_slots_btn.setObjectName("dialogSecondaryButton")
+        self.free_slots_btn.setToolTip("Show the free time in this template")
+
+        top_layout.addWidget(self.free_slots_btn)
         top_layout.addWidget(self.add_task_btn)
         top_layout.addWidget(self.edit_task_btn)
         top_layout.addWidget(self.delete_task_btn)
+
+        # --- Bulk operations on the selected rows / whole template ---
+        self.bulk_btn = QPushButton("Bulk")
+        self.bulk_btn.setObjectName("dialogSecondaryButton")
+        bulk_menu = QMenu(self.bulk_btn)
+        self.copy_action = bulk_menu.addAction("Copy Selected to Templates...")
+        self.shift_action = bulk_menu.addAction("Shift Selected Times...")
+        self.recategorize_action = bulk_menu.addAction("Change Category of Selected...")
+        bulk_menu.addSeparator()
+        self.duplicate_action = bulk_menu.addAction("Duplicate Template...")
+        self.bulk_btn.setMenu(bulk_menu)
+        top_layout.addWidget(self.bulk_btn)
         layout.addLayout(top_layout)
 
+        # --- Search (filters this template, lists matches in the others) ---
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Filter tasks by name, notes or category...")
+        self.search_input.setClearButtonEnabled(True)
+        search_layout.addWidget(self.search_input)
+        self.search_hint = QLabel()
+        self.search_hint.setTextFormat(Qt.TextFormat.RichText)
+        self.search_hint.hide()
+        search_layout.addWidget(self.search_hint)
+        layout.addLayout(search_layout)
+
         # --- Task table ---
-        self.task_table = QTableWidget()
-        self.task_table.setColumnCount(4)
-        self.task_table.setHorizontalHeaderLabels(
-            ["Task Name", "Category", "Start Time", "End Time"])
+        self.task_table = QTableView()
+        self.task_table.setModel(self.proxy_model)
+        self.task_table.setEditTriggers(
+            QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.task_table.setSortingEnabled(True)
+        self.task_table.sortByColumn(2, Qt.SortOrder.AscendingOrder)
         self.task_table.horizontalHeader().setSectionResizeMode(
             0, QHeaderView.ResizeMode.Stretch)
         self.task_table.setSelectionBehavior(
             QAbstractItemView.SelectionBehavior.SelectRows)
         self.task_table.setSelectionMode(
-            QAbstractItemView.SelectionMode.SingleSelection)
+            QAbstractItemView.SelectionMode.ExtendedSelection)
         self.task_table.verticalHeader().setVisible(False)
         self.task_table.setAlternatingRowColors(True)  # Improves readability
         layout.addWidget(self.task_table)
 
+        # --- Conflict summary (hidden while the template has no overlaps) ---
+        self.conflict_label = QLabel()
+        self.conflict_label.setObjectName("conflictLabel")
+        self.conflict_label.setWordWrap(True)
+        self.conflict_label.hide()
+        layout.addWidget(self.conflict_label)
+
         # --- Bottom buttons ---
         bottom_layout = QHBoxLayout()
         bottom_layout.addStretch()
@@ -106,178 +167,311 @@ class RoutineEditorDialog(QDialog):
         self.day_selector.currentTextChanged.connect(
             self.day_selection_changed)
         self.manage_categories_btn.clicked.connect(self.open_category_manager)
+        self.new_template_btn.clicked.connect(self.create_template)
         self.add_task_btn.clicked.connect(self.add_task)
+        self.free_slots_btn.clicked.connect(self.show_free_slots)
         self.edit_task_btn.clicked.connect(self.edit_task)
         self.delete_task_btn.clicked.connect(self.delete_task)
         self.task_table.doubleClicked.connect(
             self.edit_task)  # Double-click to edit
+        self.search_input.textChanged.connect(self.apply_search)
+        self.search_hint.linkActivated.connect(self.day_selector.setCurrentText)
+        self.copy_action.triggered.connect(self.copy_selected_to_templates)
+        self.shift_action.triggered.connect(self.shift_selected)
+        self.recategorize_action.triggered.connect(self.recategorize_selected)
+        self.duplicate_action.triggered.connect(self.duplicate_template)
 
     def day_selection_changed(self, day):
         """Loads tasks when a different day template is selected."""
         self.current_day = day
         self.load_tasks_for_selected_day()
+        self.apply_search(self.search_input.text())
+
+    def apply_search(self, text: str):
+        """Filters the table and links other templates with saved matches."""
+        self.proxy_model.set_search(text)
+        counts = {}
+        if text.strip() and self.controller:
+            counts = self.controller.search_template_counts(text)
+        links = [f'<a href="{html.escape(name)}">{html.escape(name)}</a> ({count})'
+                 for name, count in counts.items() if name != self.current_day]
+        self.search_hint.setText("Also in: " + ", ".join(links))
+        self.search_hint.setVisible(bool(links))
+
+    def create_template(self):
+        """Adds an empty named template and selects it."""
+        name, ok = QInputDialog.getText(self, "New Template", "Template name:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        if name in self.routines or name in self.BUILTIN_TEMPLATES:
+            QMessageBox.warning(self, "Input Error",
+                                f"A template named '{name}' already exists.")
+            return
+        self.routines.edit(name)
+        self.day_selector.addItem(name)
+        self.day_selector.setCurrentText(name)
 
     def load_tasks_for_selected_day(self):
-        """Refreshes the table with tasks for the currently selected day template."""
-        self.task_table.setRowCount(0)  # Clear existing rows
-        tasks = self.routines.get(self.current_day, [])
-        # Sort tasks by start time before displaying
-        sorted_tasks = sorted(
-            tasks, key=lambda x: x.get('start_time', '00:00'))
-
-        category_map = {cat['id']: cat['name'] for cat in self.categories}
-        uncategorized_name = category_map.get(
-            self.uncategorized_id, "Uncategorized")
-
-        # Disable sorting during population
-        self.task_table.setSortingEnabled(False)
-        for row, task in enumerate(sorted_tasks):
-            self.task_table.insertRow(row)
-
-            # Task Name (with ID stored as data)
-            name_item = QTableWidgetItem(task.get('name', ''))
-            name_item.setData(Qt.ItemDataRole.UserRole,
-                              task.get('id', ''))  # Store ID
-            self.task_table.setItem(row, 0, name_item)
-
-            # Category Name
-            category_id = task.get('category', self.uncategorized_id)
-            category_name = category_map.get(category_id, uncategorized_name)
-            category_item = QTableWidgetItem(category_name)
-            # Make category column read-only in table view
-            category_item.setFlags(category_item.flags()
-                                   & ~Qt.ItemFlag.ItemIsEditable)
-            self.task_table.setItem(row, 1, category_item)
-
-            # Start Time (formatted)
-            start_time_str = QTime.fromString(
-                task.get('start_time', ''), "HH:mm").toString("h:mm AP")
-            start_item = QTableWidgetItem(start_time_str)
-            start_item.setFlags(start_item.flags() & ~
-                                Qt.ItemFlag.ItemIsEditable)
-            self.task_table.setItem(row, 2, start_item)
-
-            # End Time (formatted)
-            end_time_str = QTime.fromString(
-                task.get('end_time', ''), "HH:mm").toString("h:mm AP")
-            end_item = QTableWidgetItem(end_time_str)
-            end_item.setFlags(end_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            self.task_table.setItem(row, 3, end_item)
-
-        self.task_table.setSortingEnabled(True)  # Re-enable sorting
+        """Points the table model at the currently selected day template."""
+        # Shows the live list; it is copied on the first edit
+        self.table_model.set_tasks(self.routines.get(self.current_day, []))
+        self._update_conflicts()
+
+    def _writable_tasks(self) -> list:
+        """Switches the table to the session's own copy of the template."""
+        tasks = self.routines.edit(self.current_day)
+        if tasks is not self.table_model.tasks:
+            self.table_model.adopt_copy(tasks)
+        return tasks
+
+    def _update_conflicts(self):
+        """Highlights overlapping rows and summarizes the conflicts."""
+        conflicts = find_conflicts(self.table_model.tasks)
+        self.table_model.set_conflict_ids(conflicting_ids(conflicts))
+
+        if not conflicts:
+            self.conflict_label.hide()
+            return
+        shown = [f"'{a.name}' overlaps '{b.name}'"
+                 for a, b in conflicts[:self.MAX_CONFLICTS_SHOWN]]
+        more = len(conflicts) - len(shown)
+        summary = f"{len(conflicts)} conflict(s): " + "; ".join(shown)
+        if more > 0:
+            summary += f" (+{more} more)"
+        self.conflict_label.setText(summary)
+        self.conflict_label.show()
+
+    def _selected_task(self):
+        """The task of the selected row, or None."""
+        index = self.task_table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.table_model.task_at(self.proxy_model.mapToSource(index).row())
+
+    def _selected_tasks(self) -> list:
+        """The tasks of every selected row, in table order."""
+        rows = sorted(self.proxy_model.mapToSource(index).row()
+                      for index in self.task_table.selectionModel().selectedRows())
+        return [self.table_model.task_at(row) for row in rows]
+
+    def _interval_index(self) -> IntervalIndex:
+        """The current template's interval index, built once per change."""
+        index = self._interval_indexes.get(self.current_day)
+        if index is None:
+            index = IntervalIndex(self.table_model.tasks)
+            self._interval_indexes[self.current_day] = index
+        return index
+
+    def _template_changed(self):
+        """Drops the current template's index and re-checks conflicts."""
+        self._interval_indexes.pop(self.current_day, None)
+        self._update_conflicts()
+
+    def _suggest_slot(self):
+        """
+        Smart Time Suggestion: the first free gap after the selected task
+        (or 9:00 AM), preferring an hour and settling for less if needed.
+        """
+        index = self._interval_index()
+        after = self.DEFAULT_SUGGESTION_START
+        selected = self._selected_task()
+        if selected and selected.end_minutes is not None:
+            after = selected.end_minutes
+        for length in self.SUGGESTION_LENGTHS:
+            slot = index.first_free_slot(length, after)
+            if slot:
+                return slot
+        return None
 
     def add_task(self):
         """Opens the TaskDialog to add a new task to the current template."""
-        # Smart Time Suggestion Logic
-        default_task_data = {}
-        tasks_on_current_day = self.routines.get(self.current_day, [])
-        if tasks_on_current_day:
-            try:
-                latest_task = max(tasks_on_current_day, key=lambda x: QTime.fromString(
-                    x.get('end_time', '00:00'), "HH:mm"))
-                last_end_time = QTime.fromString(
-                    latest_task.get('end_time', '00:00'), "HH:mm")
-                default_task_data['start_time'] = last_end_time.toString(
-                    "HH:mm")
-                default_task_data['end_time'] = last_end_time.addSecs(
-                    3600).toString("HH:mm")
-                default_task_data['category'] = latest_task.get(
-                    'category', self.uncategorized_id)
-            except Exception as e:
-                print(f"Error suggesting time: {e}")
-
-        if 'start_time' not in default_task_data:
-            default_task_data['start_time'] = "09:00"
-            default_task_data['end_time'] = "10:00"
-        if 'category' not in default_task_data:
-            default_task_data['category'] = self.uncategorized_id
+        self._add_task_in_slot(self._suggest_slot())
+
+    def show_free_slots(self):
+        """Opens the list of free gaps; picking one adds a task there."""
+        dialog = FreeSlotsDialog(
+            self._interval_index(), self.current_day, parent=self)
+        if dialog.exec() and dialog.selected_slot:
+            self._add_task_in_slot(dialog.selected_slot)
+
+    def _add_task_in_slot(self, slot):
+        default_task_data = Task(category=self.uncategorized_id)
+        if slot:
+            start, end = slot
+            default_task_data.set_times(start, end)
+            # Continue the category of the task right before the slot
+            previous = self._interval_index().task_before(start)
+            if previous and previous.category:
+                default_task_data.category = previous.category
+        else:
+            default_task_data.set_times(9 * 60, 10 * 60)
 
         dialog = TaskDialog(categories=self.categories,
-                            task_data=default_task_data, parent=self)
+                            task_data=default_task_data,
+                            interval_index=self._interval_index(),
+                            parent=self)
         if dialog.exec():
             new_task_data = dialog.get_data()
-            if not new_task_data.get('name'):
+            if not new_task_data['name']:
                 QMessageBox.warning(self, "Input Error",
                                     "Task name cannot be empty.")
                 return
 
-            new_task_data['id'] = f"task-{uuid.uuid4()}"
-            if self.current_day not in self.routines:
-                self.routines[self.current_day] = []
-            self.routines[self.current_day].append(new_task_data)
-            self.load_tasks_for_selected_day()
+            self._writable_tasks()
+            self.table_model.add_task(Task(id=f"task-{uuid.uuid4()}", **new_task_data))
+            self._template_changed()
 
     def edit_task(self):
         """Opens the TaskDialog to edit the selected task."""
-        selected_row = self.task_table.currentRow()
-        if selected_row < 0:
+        task_to_edit = self._selected_task()
+        if not task_to_edit:
             QMessageBox.information(
                 self, "Selection Required", "Please select a task to edit.")
             return
 
-        task_id = self.task_table.item(
-            selected_row, 0).data(Qt.ItemDataRole.UserRole)
-        tasks_on_current_day = self.routines.get(self.current_day, [])
-        task_to_edit = next(
-            (t for t in tasks_on_current_day if t.get('id') == task_id), None)
-
-        if not task_to_edit:
-            QMessageBox.critical(
-                self, "Error", "Could not find the selected task data.")
-            return
-
+        task_id = task_to_edit.id
         dialog = TaskDialog(categories=self.categories,
-                            task_data=task_to_edit, parent=self)
+                            task_data=task_to_edit,
+                            interval_index=IntervalIndex(
+                                self.table_model.tasks, exclude_id=task_id),
+                            parent=self)
         if dialog.exec():
             updated_task_data = dialog.get_data()
-            if not updated_task_data.get('name'):
+            if not updated_task_data['name']:
                 QMessageBox.warning(self, "Input Error",
                                     "Task name cannot be empty.")
                 return
 
-            for i, task in enumerate(tasks_on_current_day):
-                if task.get('id') == task_id:
-                    tasks_on_current_day[i].update(updated_task_data)
-                    break
-            self.load_tasks_for_selected_day()
+            self._writable_tasks()
+            self.table_model.update_task(task_id, updated_task_data)
+            self._template_changed()
 
     def delete_task(self):
-        """Deletes the selected task from the current template."""
-        selected_row = self.task_table.currentRow()
-        if selected_row < 0:
+        """Deletes the selected tasks from the current template."""
+        tasks = self._selected_tasks()
+        if not tasks:
             QMessageBox.information(
                 self, "Selection Required", "Please select a task to delete.")
             return
 
-        task_id = self.task_table.item(
-            selected_row, 0).data(Qt.ItemDataRole.UserRole)
-        task_name = self.task_table.item(selected_row, 0).text()
-
+        what = (f"the task '{tasks[0].name}'" if len(tasks) == 1
+                else f"{len(tasks)} tasks")
         reply = QMessageBox.question(self, 'Confirm Deletion',
-                                     f"Are you sure you want to delete the task '{task_name}' from the '{self.current_day}' template?",
+                                     f"Are you sure you want to delete {what} from the '{self.current_day}' template?",
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                      QMessageBox.StandardButton.No)
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.routines[self.current_day] = [
-                task for task in self.routines.get(self.current_day, []) if task.get('id') != task_id
-            ]
-            self.load_tasks_for_selected_day()
+            self._writable_tasks()
+            self.table_model.remove_tasks(task.id for task in tasks)
+            self._template_changed()
+
+    # --- Bulk operations ---
+    def _require_selection(self) -> list:
+        tasks = self._selected_tasks()
+        if not tasks:
+            QMessageBox.information(
+                self, "Selection Required", "Please select one or more tasks.")
+        return tasks
+
+    def copy_selected_to_templates(self):
+        """Copies the selected tasks into other templates in one pass."""
+        tasks = self._require_selection()
+        if not tasks:
+            return
+        targets = [self.day_selector.itemText(i) for i in range(self.day_selector.count())
+                   if self.day_selector.itemText(i) != self.current_day]
+        dialog = CopyTasksDialog(targets, len(tasks), parent=self)
+        if not dialog.exec():
+            return
+
+        # Copies keep their IDs, so completion history and streaks are shared
+        copied_ids = {task.id for task in tasks}
+        for name in dialog.selected_templates():
+            # A weekday without an override starts from the default template
+            target = self.routines.edit(name, inherit_from="default")
+            target[:] = [t for t in target if t.id not in copied_ids]
+            target.extend(task.copy() for task in tasks)
+            self._interval_indexes.pop(name, None)
+
+    def shift_selected(self):
+        """Moves the selected tasks earlier or later by N minutes."""
+        tasks = self._require_selection()
+        if not tasks:
+            return
+        minutes, ok = QInputDialog.getInt(
+            self, "Shift Times", "Minutes to shift (negative = earlier):",
+            15, -MINUTES_PER_DAY + 1, MINUTES_PER_DAY - 1, 5)
+        if not ok or minutes == 0:
+            return
+
+        changes = {}
+        for task in tasks:
+            start, end = task.start_minutes, task.end_minutes
+            if start is None or end is None:
+                continue
+            changes[task.id] = {
+                'start_minutes': (start + minutes) % MINUTES_PER_DAY,
+                'end_minutes': (end + minutes) % MINUTES_PER_DAY,
+            }
+        self._writable_tasks()
+        self.table_model.update_tasks(changes)
+        self._template_changed()
+
+    def recategorize_selected(self):
+        """Assigns one category to all selected tasks."""
+        tasks = self._require_selection()
+        if not tasks:
+            return
+        names = [cat.name for cat in self.categories]
+        name, ok = QInputDialog.getItem(
+            self, "Change Category", "New category:", names, 0, False)
+        if not ok:
+            return
+        category_id = next(cat.id for cat in self.categories if cat.name == name)
+        self._writable_tasks()
+        self.table_model.update_tasks(
+            {task.id: {'category': category_id} for task in tasks})
+        self._template_changed()
+
+    def duplicate_template(self):
+        """Copies the whole current template under another name."""
+        existing = [self.day_selector.itemText(i) for i in range(self.day_selector.count())]
+        choices = [name for name in existing if name != self.current_day]
+        name, ok = QInputDialog.getItem(
+            self, "Duplicate Template",
+            f"Copy '{self.current_day}' to (pick or type a new name):",
+            choices, 0, True)
+        name = name.strip()
+        if not ok or not name or name == self.current_day:
+            return
+        if self.routines.get(name):
+            reply = QMessageBox.question(
+                self, "Replace Template",
+                f"The '{name}' template already has tasks. Replace them?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+
+        self.routines.edit(name)[:] = [task.copy() for task in self.table_model.tasks]
+        self._interval_indexes.pop(name, None)
+        if name not in existing:
+            self.day_selector.addItem(name)
+        self.day_selector.setCurrentText(name)
 
     def open_category_manager(self):
-        """Opens the dialog for managing categories."""
-        categories_copy = [cat.copy() for cat in self.categories]
-        cat_dialog = CategoryManagerDialog(
-            categories_copy, self.uncategorized_id, parent=self)
-
-        if cat_dialog.exec():
-            updated_categories = cat_dialog.get_categories()
-            if updated_categories != self.categories:
-                self.categories = updated_categories
-                if self.controller:
-                    self.controller.save_categories_and_update(self.categories)
-                self.load_tasks_for_selected_day()
-
-    def get_updated_routines(self) -> dict:
-        """Returns the modified routines dict when the dialog is accepted."""
+        """Opens the category manager; changes are saved right away."""
+        if not self.controller:
+            return
+        cat_dialog = self.controller.manage_categories(parent=self)
+        if cat_dialog.changed:
+            # Tasks already copied into this session follow deletes/merges too
+            self.routines.reassign_categories(cat_dialog.reassigned)
+            self.categories = cat_dialog.get_categories()
+            self.table_model.set_categories(self.categories)
+
+    def get_updated_routines(self):
+        """Returns the editing session when the dialog is accepted."""
         return self.routines
@@ -0,0 +1,207 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QBrush, QColor
+from ..models.time_utils import format_time_12h
+from ..models.search_index import tokenize
+
+
+class RoutineTableModel(QAbstractTableModel):
+    """
+    Table model over one template's task list (the list itself, edited in
+    place). An ID -> row index makes lookups O(1), and every edit emits only
+    the rows/cells it touched instead of repopulating the view.
+    """
+    COLUMNS = ["Task Name", "Category", "Start Time", "End Time"]
+    SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+    CONFLICT_BRUSH = QBrush(QColor(239, 68, 68, 70))
+
+    def __init__(self, categories: list, uncategorized_id: str, parent=None):
+        super().__init__(parent)
+        self._tasks = []
+        self._rows_by_id = {}
+        self._conflict_ids = set()
+        self.uncategorized_id = uncategorized_id
+        self.set_categories(categories)
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self._tasks[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return task.name
+            if column == 1:
+                return self.category_name(task)
+            if column == 2:
+                return format_time_12h(task.start_minutes)
+            return format_time_12h(task.end_minutes)
+        if role == Qt.ItemDataRole.UserRole:
+            return task.id or ''
+        if role == self.SORT_ROLE:
+            if column == 0:
+                return task.name.lower()
+            if column == 1:
+                return self.category_name(task).lower()
+            minutes = task.start_minutes if column == 2 else task.end_minutes
+            return -1 if minutes is None else minutes
+        if task.id in self._conflict_ids:
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return self.CONFLICT_BRUSH
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return "Overlaps another task in this template"
+        return None
+
+    # --- Lookups ---
+    def category_name(self, task) -> str:
+        return self._category_names.get(task.category, self._uncategorized_name)
+
+    @property
+    def tasks(self) -> list:
+        return self._tasks
+
+    def row_of(self, task_id):
+        return self._rows_by_id.get(task_id, -1)
+
+    def task_at(self, row: int):
+        return self._tasks[row] if 0 <= row < len(self._tasks) else None
+
+    def task_by_id(self, task_id):
+        return self.task_at(self.row_of(task_id))
+
+    def _reindex(self, first_row: int = 0):
+        for row in range(first_row, len(self._tasks)):
+            self._rows_by_id[self._tasks[row].id] = row
+
+    # --- Edits ---
+    def set_tasks(self, tasks: list):
+        """Shows another template (a reset, e.g. on day switch)."""
+        self.beginResetModel()
+        self._tasks = tasks
+        self._rows_by_id = {}
+        self._reindex()
+        self._conflict_ids = set()
+        self.endResetModel()
+
+    def adopt_copy(self, tasks: list):
+        """
+        Swaps in an equal copy of the current list (copy-on-write). Rows and
+        IDs are unchanged, so no signals are needed.
+        """
+        self._tasks = tasks
+
+    def add_task(self, task):
+        row = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.append(task)
+        self._rows_by_id[task.id] = row
+        self.endInsertRows()
+
+    def add_tasks(self, tasks: list):
+        """Appends several tasks with a single rowsInserted."""
+        if not tasks:
+            return
+        first = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), first, first + len(tasks) - 1)
+        self._tasks.extend(tasks)
+        self._reindex(first)
+        self.endInsertRows()
+
+    def update_tasks(self, changes_by_id: dict):
+        """Applies {task_id: changes} and emits one dataChanged over the rows."""
+        rows = []
+        for task_id, changes in changes_by_id.items():
+            row = self.row_of(task_id)
+            if row >= 0:
+                self._tasks[row].update(changes)
+                rows.append(row)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 0),
+                                  self.index(max(rows), len(self.COLUMNS) - 1))
+
+    def remove_tasks(self, task_ids):
+        """Removes several tasks in one pass (a single model reset)."""
+        task_ids = set(task_ids)
+        self.beginResetModel()
+        self._tasks[:] = [t for t in self._tasks if t.id not in task_ids]
+        self._rows_by_id = {}
+        self._reindex()
+        self.endResetModel()
+
+    def update_task(self, task_id, changes: dict) -> bool:
+        row = self.row_of(task_id)
+        if row < 0:
+            return False
+        self._tasks[row].update(changes)
+        self._emit_row_changed(row)
+        return True
+
+    def remove_task(self, task_id) -> bool:
+        row = self.row_of(task_id)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._tasks[row]
+        del self._rows_by_id[task_id]
+        self._reindex(row)
+        self.endRemoveRows()
+        return True
+
+    def set_categories(self, categories: list):
+        self._category_names = {cat.id: cat.name for cat in categories}
+        self._uncategorized_name = self._category_names.get(
+            self.uncategorized_id, "Uncategorized")
+        if self._tasks:
+            self.dataChanged.emit(self.index(0, 1), self.index(len(self._tasks) - 1, 1))
+
+    def set_conflict_ids(self, conflict_ids: set):
+        """Highlights conflicting rows, repainting only rows whose state changed."""
+        changed = self._conflict_ids ^ conflict_ids
+        self._conflict_ids = conflict_ids
+        for task_id in changed:
+            row = self.row_of(task_id)
+            if row >= 0:
+                self._emit_row_changed(row)
+
+    def _emit_row_changed(self, row: int):
+        self.dataChanged.emit(self.index(row, 0),
+                              self.index(row, len(self.COLUMNS) - 1))
+
+
+class RoutineSortProxyModel(QSortFilterProxyModel):
+    """
+    Sorts by the model's SORT_ROLE (minutes for the time columns) and
+    filters rows to tasks whose name, notes or category contain every
+    search word.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(RoutineTableModel.SORT_ROLE)
+        self.setDynamicSortFilter(True)
+        self._search_words = []
+
+    def set_search(self, text: str):
+        self._search_words = tokenize(text)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._search_words:
+            return True
+        model = self.sourceModel()
+        task = model.task_at(source_row)
+        haystack = " ".join((task.name, task.notes,
+                             model.category_name(task))).casefold()
+        return all(word in haystack for word in self._search_words)
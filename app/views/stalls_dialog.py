@@ -0,0 +1,77 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
+    QPlainTextEdit, QPushButton, QLabel, QSplitter
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFontDatabase
+
+
+class StallsDialog(QDialog):
+    """Developer view of the worst UI stalls and the stacks captured for them."""
+
+    def __init__(self, watchdog, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("UI Stalls")
+        self.setMinimumSize(760, 480)
+        self.watchdog = watchdog
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.stall_list = QListWidget()
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        splitter.addWidget(self.stall_list)
+        splitter.addWidget(self.stack_view)
+        splitter.setSizes([160, 320])
+        layout.addWidget(splitter)
+
+        # --- Buttons ---
+        btn_layout = QHBoxLayout()
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.setObjectName("dialogSecondaryButton")
+        self.close_button = QPushButton("Close")
+        self.close_button.setObjectName("dialogPrimaryButton")
+        btn_layout.addWidget(self.clear_button)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.close_button)
+        layout.addLayout(btn_layout)
+
+        self.stall_list.currentItemChanged.connect(self._show_stack)
+        self.clear_button.clicked.connect(self._clear)
+        self.close_button.clicked.connect(self.accept)
+        self.watchdog.stall_detected.connect(lambda _: self.refresh())
+        self.refresh()
+
+    def refresh(self):
+        self.summary_label.setText(
+            f"{self.watchdog.stall_count} stall(s) over "
+            f"{round(self.watchdog.threshold * 1000)} ms; the worst are listed.")
+        self.stall_list.clear()
+        for record in self.watchdog.worst_stalls():
+            item = QListWidgetItem(
+                f"{record['duration_ms']} ms  ·  "
+                f"{record['operation'] or 'unknown operation'}  ·  {record['at']}")
+            item.setData(Qt.ItemDataRole.UserRole, record)
+            self.stall_list.addItem(item)
+        if self.stall_list.count():
+            self.stall_list.setCurrentRow(0)
+        else:
+            self.stack_view.clear()
+
+    def _show_stack(self, item, _previous=None):
+        if item is None:
+            self.stack_view.clear()
+            return
+        record = item.data(Qt.ItemDataRole.UserRole)
+        self.stack_view.setPlainText(
+            "".join(record["stack"]) if record["stack"] else "(stack not captured)")
+
+    def _clear(self):
+        self.watchdog.clear()
+        self.refresh()
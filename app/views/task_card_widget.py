@@ -1,27 +1,32 @@
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QCheckBox
-from PyQt6.QtCore import pyqtSignal, Qt, QTime
+from PyQt6.QtCore import pyqtSignal, Qt, QEvent
+from ..models.time_utils import format_time_12h
 
 
 class TaskCardWidget(QWidget):
     completion_toggled = pyqtSignal(str, bool)
 
-    def __init__(self, task_info: dict, parent=None):
+    def __init__(self, task_info, parent=None, stats_provider=None):
+        """
+        'task_info' is a DisplayTask record; 'stats_provider(task_id)' returns
+        the streak/rate dict shown as the tooltip, asked only on hover.
+        """
         super().__init__(parent)
         self.setObjectName("taskCard")
 
-        self.task_id = task_info.get('id')
-        self.start_time = task_info.get('start_time', '')
-        self.end_time = task_info.get('end_time', '')
-        is_completed = task_info.get('completed', False)
+        self.task_id = task_info.id
+        self._stats_provider = stats_provider
+        # Minutes since midnight (None if the time is missing)
+        self.start_minutes = task_info.start_minutes
+        self.end_minutes = task_info.end_minutes
+        is_completed = task_info.completed
 
-        name = task_info.get('name', 'Unnamed Task')
-        notes = task_info.get('notes', '')
-        category_color = task_info.get('category_color', '#A0A0B0')
+        name = task_info.name or 'Unnamed Task'
+        notes = task_info.notes
+        category_color = task_info.category_color
 
-        start_time_12h = QTime.fromString(
-            self.start_time, "HH:mm").toString("h:mm AP")
-        end_time_12h = QTime.fromString(
-            self.end_time, "HH:mm").toString("h:mm AP")
+        start_time_12h = format_time_12h(self.start_minutes)
+        end_time_12h = format_time_12h(self.end_minutes)
 
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 20, 0)  # No left margin
@@ -66,6 +71,17 @@ class TaskCardWidget(QWidget):
         self.checkbox.stateChanged.connect(self._on_toggle)
         self.set_completed_style(is_completed)
 
+    def event(self, event):
+        # --- Streak / completion-rate tooltip, current as of each hover ---
+        if event.type() == QEvent.Type.ToolTip and self._stats_provider:
+            stats = self._stats_provider(self.task_id)
+            rate = stats.get('completion_rate')
+            self.setToolTip(
+                f"Current streak: {stats.get('current_streak', 0)} days\n"
+                f"Longest streak: {stats.get('longest_streak', 0)} days\n"
+                f"Last 30 days: {'-' if rate is None else f'{rate}%'}")
+        return super().event(event)
+
     def _on_toggle(self, state):
         is_checked = state == Qt.CheckState.Checked.value
         self.set_completed_style(is_checked)
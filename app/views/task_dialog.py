@@ -1,16 +1,19 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QLineEdit, QTimeEdit, QTextEdit,
-    QPushButton, QHBoxLayout, QSpacerItem, QSizePolicy, QComboBox
+    QPushButton, QHBoxLayout, QSpacerItem, QSizePolicy, QComboBox, QLabel
 )
 from PyQt6.QtCore import QTime
 
 
 class TaskDialog(QDialog):
-    def __init__(self, categories: list, task_data=None, parent=None):
+    def __init__(self, categories: list, task_data=None, interval_index=None, parent=None):
+        """'task_data' is the Task to prefill from (times may be None)."""
         super().__init__(parent)
         self.setWindowTitle("Task Details" if not task_data else "Edit Task")
         self.setMinimumWidth(400)
         self.categories = categories
+        # Other tasks of the template, checked on every time change
+        self.interval_index = interval_index
 
         main_layout = QVBoxLayout(self)
         form_layout = QFormLayout()
@@ -32,7 +35,7 @@ class TaskDialog(QDialog):
         self.category_input = QComboBox()
         self.category_input.setObjectName("formInput")
         for category in self.categories:
-            self.category_input.addItem(category['name'], category['id'])
+            self.category_input.addItem(category.name, category.id)
 
         self.notes_input = QTextEdit()
         self.notes_input.setObjectName("formInput")
@@ -47,6 +50,13 @@ class TaskDialog(QDialog):
         form_layout.addRow("Notes:", self.notes_input)
         main_layout.addLayout(form_layout)
 
+        # Live overlap warning
+        self.conflict_label = QLabel()
+        self.conflict_label.setObjectName("conflictLabel")
+        self.conflict_label.setWordWrap(True)
+        self.conflict_label.hide()
+        main_layout.addWidget(self.conflict_label)
+
         # Button Layout
         btn_layout = QHBoxLayout()
         btn_layout.addSpacerItem(QSpacerItem(
@@ -65,23 +75,48 @@ class TaskDialog(QDialog):
 
         # Populate data
         if task_data:
-            self.name_input.setText(task_data.get('name', ''))
-            self.start_time_input.setTime(QTime.fromString(
-                task_data.get('start_time', '09:00'), "HH:mm"))
-            self.end_time_input.setTime(QTime.fromString(
-                task_data.get('end_time', '10:00'), "HH:mm"))
-            self.notes_input.setText(task_data.get('notes', ''))
+            self.name_input.setText(task_data.name)
+            start = task_data.start_minutes
+            end = task_data.end_minutes
+            start = 9 * 60 if start is None else start
+            end = 10 * 60 if end is None else end
+            self.start_time_input.setTime(QTime(start // 60, start % 60))
+            self.end_time_input.setTime(QTime(end // 60, end % 60))
+            self.notes_input.setText(task_data.notes)
             # Set category dropdown
-            category_id = task_data.get('category')
-            index = self.category_input.findData(category_id)
+            index = self.category_input.findData(task_data.category)
             if index != -1:
                 self.category_input.setCurrentIndex(index)
 
-    def get_data(self):
+        self.start_time_input.timeChanged.connect(self._update_conflict_warning)
+        self.end_time_input.timeChanged.connect(self._update_conflict_warning)
+        self._update_conflict_warning()
+
+    def _update_conflict_warning(self):
+        """Shows which tasks the current times would overlap."""
+        if self.interval_index is None:
+            return
+        start = self.start_time_input.time()
+        end = self.end_time_input.time()
+        overlapping = self.interval_index.overlapping(
+            start.hour() * 60 + start.minute(), end.hour() * 60 + end.minute())
+        if not overlapping:
+            self.conflict_label.hide()
+            return
+        names = ", ".join(f"'{task.name}'" for task in overlapping[:3])
+        if len(overlapping) > 3:
+            names += f" and {len(overlapping) - 3} more"
+        self.conflict_label.setText(f"Overlaps {names}")
+        self.conflict_label.show()
+
+    def get_data(self) -> dict:
+        """The entered values as Task fields (for Task(...) or Task.update)."""
+        start = self.start_time_input.time()
+        end = self.end_time_input.time()
         return {
             "name": self.name_input.text().strip(),
-            "start_time": self.start_time_input.time().toString("HH:mm"),
-            "end_time": self.end_time_input.time().toString("HH:mm"),
+            "start_minutes": start.hour() * 60 + start.minute(),
+            "end_minutes": end.hour() * 60 + end.minute(),
             "notes": self.notes_input.toPlainText().strip(),
             "category": self.category_input.currentData()  # Get ID from dropdown
         }
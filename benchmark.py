@@ -0,0 +1,236 @@
+"""
+Model benchmarks over synthetic datasets.
+
+Generates a deterministic dataset per size (see app/models/synthetic_data.py)
+in a temporary directory, times the DataManager hot paths on it and compares
+them with the recorded baselines in benchmark_baseline.json. Timings are
+normalized by a short pure-Python calibration loop, so baselines recorded on
+one machine remain meaningful on another. The best of --repeat runs is
+compared (as with timeit; saves fsync, so their medians are mostly disk
+noise), and a benchmark slower than its baseline by more than --tolerance
+fails the run (exit code 1).
+
+Examples:
+    python benchmark.py                             # all sizes, compare
+    python benchmark.py --size small medium --repeat 10
+    python benchmark.py --update-baseline           # record new baselines
+    python benchmark.py --json results.json
+
+Each size also reports the memory per template task and per display entry,
+as slotted records versus the equivalent dicts.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+from app.models.data_manager import DataManager
+from app.models.synthetic_data import SIZES, DEFAULT_END_DATE, generate_dataset
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'benchmark_baseline.json')
+DEFAULT_TOLERANCE = 2.0
+# Slowdowns smaller than this are timer noise, whatever the ratio
+NOISE_FLOOR_MS = 1.0
+
+
+def calibrate(rounds: int = 5) -> float:
+    """Milliseconds for a fixed dict/sort workload (best of 'rounds')."""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        table = {f"key-{i}": i * 7 % 1013 for i in range(100_000)}
+        sorted(table.items(), key=lambda item: item[1])
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def _cold(model: DataManager):
+    """Drops derived/persisted analytics so each run recomputes them."""
+    model.analytics_cache.clear()
+    model._allocation_cache = {}
+
+
+def make_benchmarks(paths: dict) -> dict:
+    """name -> (setup(model), run(model)); setup's time isn't measured."""
+    today = DEFAULT_END_DATE
+    sample_id = {}
+
+    def first_task(model):
+        sample_id.setdefault('id', model.get_tasks_for_display(today)[0].id)
+
+    return {
+        "load": (None, lambda model: DataManager(**paths)),
+        "save_routines": (None, lambda model: model._save_routines()),
+        "save_progress": (None, lambda model: model._save_progress()),
+        "get_tasks_for_display": (
+            None, lambda model: model.get_tasks_for_display(today)),
+        # Alternates between completing and un-completing, each with a save
+        "toggle_task_completion": (
+            first_task, lambda model: model.toggle_task_completion(today, sample_id['id'])),
+        "get_progress_for_date_range_365": (
+            _cold, lambda model: model.get_progress_for_date_range(today, 365)),
+        "get_allocated_time_by_category": (
+            _cold, lambda model: model.get_allocated_time_by_category()),
+        "get_allocated_minutes_by_category_year": (
+            _cold, lambda model: model.get_allocated_minutes_by_category(
+                today - timedelta(days=364), today)),
+    }
+
+
+def _allocated_bytes(build) -> int:
+    """Bytes still allocated by what 'build()' returns."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()  # Held while measuring
+        size = tracemalloc.get_traced_memory()[0] - before
+        del kept
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def measure_memory(model: DataManager) -> dict:
+    """Bytes per task and per display entry, as records and as dicts."""
+    tasks = [task for template in model.routines.values() for task in template]
+    days = [DEFAULT_END_DATE - timedelta(days=i) for i in range(30)]
+    display_count = sum(len(model.get_routine_for_date(day)) for day in days)
+
+    def task_dicts():
+        # The in-memory shape before records: the file dict plus parsed minutes
+        return [{**task.to_dict(), "start_minutes": task.start_minutes,
+                 "end_minutes": task.end_minutes} for task in tasks]
+
+    def display_dicts():
+        entries = []
+        for day in days:
+            for entry in model.get_tasks_for_display(day):
+                entries.append({**entry.to_dict(), "start_minutes": entry.start_minutes,
+                                "end_minutes": entry.end_minutes,
+                                "completed": entry.completed,
+                                "category_name": entry.category_name,
+                                "category_color": entry.category_color})
+        return entries
+
+    def display_records():
+        return [model.get_tasks_for_display(day) for day in days]
+
+    per = max(1, len(tasks))
+    per_display = max(1, display_count)
+    return {
+        "task_record_bytes": _allocated_bytes(lambda: [t.copy() for t in tasks]) / per,
+        "task_dict_bytes": _allocated_bytes(task_dicts) / per,
+        "display_record_bytes": _allocated_bytes(display_records) / per_display,
+        "display_dict_bytes": _allocated_bytes(display_dicts) / per_display,
+    }
+
+
+def run_size(size: str, repeat: int) -> dict:
+    """Median and best milliseconds per benchmark for one dataset size."""
+    with tempfile.TemporaryDirectory(prefix=f"zenith-bench-{size}-") as data_dir:
+        paths = generate_dataset(data_dir, **SIZES[size])
+        model = DataManager(**paths)
+        results = {}
+        for name, (setup, run) in make_benchmarks(paths).items():
+            timings = []
+            for _ in range(repeat):
+                if setup:
+                    setup(model)
+                start = time.perf_counter()
+                run(model)
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = {"median_ms": statistics.median(timings),
+                             "best_ms": min(timings)}
+        return results, measure_memory(model)
+
+
+def compare(results: dict, baseline: dict, scale: float, tolerance: float) -> list:
+    """(size, name, ms, expected ms) for every benchmark over its budget."""
+    regressions = []
+    for size, benchmarks in results.items():
+        for name, timing in benchmarks.items():
+            recorded = baseline.get("sizes", {}).get(size, {}).get(name)
+            if recorded is None:
+                continue
+            expected = recorded["best_ms"] * scale
+            if timing["best_ms"] > max(expected * tolerance, expected + NOISE_FLOOR_MS):
+                regressions.append((size, name, timing["best_ms"], expected))
+    return regressions
+
+
+def print_table(results: dict, baseline: dict, scale: float):
+    print(f"{'size':<8} {'benchmark':<40} {'median ms':>10} {'best ms':>10} {'baseline':>10}")
+    for size, benchmarks in results.items():
+        for name, timing in benchmarks.items():
+            recorded = baseline.get("sizes", {}).get(size, {}).get(name)
+            expected = f"{recorded['best_ms'] * scale:10.2f}" if recorded else f"{'-':>10}"
+            print(f"{size:<8} {name:<40} {timing['median_ms']:10.2f} "
+                  f"{timing['best_ms']:10.2f} {expected}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Zenith data model.")
+    parser.add_argument("--size", nargs="+", choices=list(SIZES), default=list(SIZES),
+                        help="dataset sizes to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per benchmark; the best is compared (default 5)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown factor over the baseline (default 2.0)")
+    parser.add_argument("--baseline", default=BASELINE_FILE,
+                        help="baseline file (default benchmark_baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="record these results as the new baseline")
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    calibration_ms = calibrate()
+    results, memory = {}, {}
+    for size in args.size:
+        results[size], memory[size] = run_size(size, max(1, args.repeat))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    # How much slower this machine is than the one that recorded the baseline
+    scale = calibration_ms / baseline["calibration_ms"] if baseline.get("calibration_ms") else 1.0
+
+    print(f"calibration: {calibration_ms:.2f} ms (x{scale:.2f} of baseline machine)")
+    print_table(results, baseline, scale)
+    print()
+    print(f"{'size':<8} {'bytes/task':>12} {'as dict':>10} {'bytes/display':>14} {'as dict':>10}")
+    for size, usage in memory.items():
+        print(f"{size:<8} {usage['task_record_bytes']:12.0f} {usage['task_dict_bytes']:10.0f} "
+              f"{usage['display_record_bytes']:14.0f} {usage['display_dict_bytes']:10.0f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"calibration_ms": calibration_ms, "sizes": results,
+                       "memory": memory}, f, indent=4)
+
+    if args.update_baseline:
+        # Keep sizes that weren't run this time, rescaled to this machine
+        sizes = {size: {name: {key: ms * scale for key, ms in timing.items()}
+                        for name, timing in benchmarks.items()}
+                 for size, benchmarks in baseline.get("sizes", {}).items()}
+        sizes.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({"calibration_ms": calibration_ms, "sizes": sizes}, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, scale, args.tolerance)
+    for size, name, measured, expected in regressions:
+        print(f"REGRESSION {size}/{name}: {measured:.2f} ms, baseline "
+              f"{expected:.2f} ms", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,20 @@
 import sys
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QShortcut, QKeySequence
 from app.views.main_window import MainWindow
 from app.models.data_manager import DataManager
 from app.controllers.app_controller import AppController
 from app.utils.theme import get_theme
+from app.utils import profiling, watchdog, census
+from app import api_server
+from app.utils.single_instance import SingleInstance
+
+DATA_DIR = 'data'
+SETTINGS_FILE = 'data/settings.json'
+PROFILE_DUMP_FILE = 'data/profile.json'
+STALL_LOG_FILE = 'data/stalls.log'
+CENSUS_REPORT_FILE = 'data/census.json'
 
 
 def main():
@@ -17,22 +27,82 @@ def main():
     # modern Qt versions, so these lines are not essential.
     # -------------------------------------------------------------
 
+    # A second launch hands over to the running instance before loading anything
+    instance = SingleInstance(DATA_DIR)
+    if instance.forward() or not instance.listen():
+        return 0
+
+    # Profiling hooks go in before anything is constructed (the data
+    # manager loads its files in __init__)
+    profiling_enabled = profiling.is_enabled(SETTINGS_FILE)
+    if profiling_enabled:
+        profiling.install_default_hooks()
+        app.aboutToQuit.connect(lambda: profiling.PROFILER.dump(PROFILE_DUMP_FILE))
+
     # Initialize model, view, controller
     data_manager = DataManager(
         routines_file='data/routines.json',
         progress_file='data/progress.json',
         categories_file='data/categories.json',
-        settings_file='data/settings.json'
+        settings_file=SETTINGS_FILE
     )
 
     main_view = MainWindow()
     controller = AppController(model=data_manager, view=main_view)
+    instance.activation_requested.connect(main_view.bring_to_front)
+
+    if profiling_enabled:
+        from app.views.profiler_dialog import ProfilerDialog
+        profiler_shortcut = QShortcut(QKeySequence("Ctrl+Shift+P"), main_view)
+        profiler_shortcut.activated.connect(
+            lambda: ProfilerDialog(profiling.PROFILER, PROFILE_DUMP_FILE, main_view).show())
+
+    if profiling.is_enabled(SETTINGS_FILE, watchdog.ENV_VAR, "stall_watchdog"):
+        from app.views.stalls_dialog import StallsDialog
+        stall_watchdog = watchdog.StallWatchdog(
+            threshold_ms=data_manager.load_settings().get("stall_threshold_ms", 250),
+            operation_owner=AppController, log_file=STALL_LOG_FILE, parent=main_view)
+        stall_watchdog.start()
+        app.aboutToQuit.connect(stall_watchdog.stop)
+        stalls_shortcut = QShortcut(QKeySequence("Ctrl+Shift+S"), main_view)
+        stalls_shortcut.activated.connect(
+            lambda: StallsDialog(stall_watchdog, main_view).show())
+
+    if profiling.is_enabled(SETTINGS_FILE, census.ENV_VAR, "object_census"):
+        object_census = census.ObjectCensus(CENSUS_REPORT_FILE, parent=main_view)
+        object_census.track(main_view.date_changed, "navigate")
+        object_census.track(main_view.completion_toggled, "toggle")
+        object_census.track(main_view.manage_routines_requested, "routine editor")
+        object_census.track(main_view.analytics_requested, "analytics")
+        object_census.track(main_view.search_changed, "search")
+        app.aboutToQuit.connect(object_census.dump)
+
+        def show_census():
+            object_census.take()
+            QMessageBox.information(main_view, "Object Census", object_census.summary())
+
+        census_shortcut = QShortcut(QKeySequence("Ctrl+Shift+C"), main_view)
+        census_shortcut.activated.connect(show_census)
+
+    if profiling.is_enabled(SETTINGS_FILE, api_server.ENV_VAR, "api_server"):
+        from app.utils.worker import MainThreadCall
+        # Model calls run on the GUI thread, serialized with the window's own
+        server = api_server.ApiServer(
+            data_manager,
+            port=data_manager.load_settings().get("api_port", api_server.DEFAULT_PORT),
+            call=MainThreadCall(parent=main_view), on_change=controller.refresh)
+        try:
+            server.start()
+            print(f"API server on {server.url}")
+            app.aboutToQuit.connect(server.stop)
+        except OSError as e:
+            print(f"Could not start the API server: {e}", file=sys.stderr)
 
     controller.init_app()
     main_view.show()
 
-    sys.exit(app.exec())
+    return app.exec()
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+Headless analytics report generator.
+
+Renders the analytics charts to PNG/PDF with an offscreen QChartView and
+writes the underlying series as CSV, without opening the GUI. The data is
+loaded once; chart rendering for several ranges runs in worker processes.
+
+Examples:
+    python report.py                                # last 30 days, png + csv
+    python report.py --range 2025-01-01:2025-03-31 --format pdf csv
+    python report.py --monthly 2025 --jobs 4 --out reports/2025
+"""
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+# Must be set before any Qt import, also in spawned worker processes
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from app.models.data_manager import DataManager  # noqa: E402
+
+FORMATS = ("png", "pdf", "csv")
+CHART_SIZE = (1200, 700)
+MAX_TREND_POINTS = CHART_SIZE[0] // 4
+
+
+def parse_date_range(text: str):
+    """Parses 'YYYY-MM-DD:YYYY-MM-DD' into a (label, start, end) range."""
+    try:
+        start_str, end_str = text.split(':')
+        start, end = date.fromisoformat(start_str), date.fromisoformat(end_str)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid range '{text}', expected YYYY-MM-DD:YYYY-MM-DD")
+    if end < start:
+        raise argparse.ArgumentTypeError(f"Range '{text}' ends before it starts")
+    return (f"{start.isoformat()}_{end.isoformat()}", start, end)
+
+
+def month_ranges(year: int) -> list:
+    """One (label, start, end) range per month of 'year'."""
+    ranges = []
+    for month in range(1, 13):
+        start = date(year, month, 1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        ranges.append((start.strftime("%Y-%m"), start,
+                      next_month - timedelta(days=1)))
+    return ranges
+
+
+def collect_range_data(model: DataManager, label: str, start: date, end: date) -> dict:
+    """Computes the series for one range; the result is plain, picklable data."""
+    days = (end - start).days + 1
+    return {
+        "label": label,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "days": days,
+        "progress": model.get_progress_for_date_range(end, days),
+        "allocation": model.get_allocated_minutes_by_category(start, end),
+    }
+
+
+def write_csv(job: dict, out_dir: str) -> list:
+    """Writes the daily completion and allocation series of one range."""
+    daily_path = os.path.join(out_dir, f"{job['label']}_daily.csv")
+    with open(daily_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "completion_percent"])
+        for date_str in sorted(job["progress"]):
+            progress = job["progress"][date_str]
+            # Days without tasks are left empty
+            writer.writerow([date_str, progress if progress >= 0 else ""])
+
+    allocation_path = os.path.join(out_dir, f"{job['label']}_allocation.csv")
+    with open(allocation_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["category", "minutes", "hours"])
+        for name, minutes in sorted(job["allocation"].items(), key=lambda item: -item[1]):
+            writer.writerow([name, minutes, f"{minutes / 60:.2f}"])
+    return [daily_path, allocation_path]
+
+
+# --- Rendering (runs in worker processes) ---
+def _init_renderer():
+    """Creates the QApplication a process needs before building charts."""
+    from PyQt6.QtWidgets import QApplication
+    if QApplication.instance() is None:
+        _init_renderer.app = QApplication([])
+
+
+def render_charts(job: dict, formats: list, out_dir: str, theme: dict, categories: list) -> list:
+    """Renders the trend and allocation charts of one range to PNG and/or PDF."""
+    from PyQt6.QtCharts import QChartView
+    from PyQt6.QtGui import QPainter, QPdfWriter, QPageSize, QPageLayout
+    from PyQt6.QtCore import QRectF, QMarginsF
+    from app.views.charts import (
+        create_trend_chart, create_allocation_chart, progress_to_points)
+    from app.utils.downsampling import lttb
+
+    _init_renderer()
+    period = f"{job['start']} to {job['end']}"
+
+    views = []
+    points = progress_to_points(job["progress"])
+    if points:
+        views.append(("trend", create_trend_chart(
+            lttb(points, MAX_TREND_POINTS), job["days"],
+            f"Daily Completion ({period})", theme, animate=False)))
+    if sum(job["allocation"].values()) > 0:
+        views.append(("allocation", create_allocation_chart(
+            job["allocation"], categories,
+            f"Time Allocation by Category ({period})", theme, animate=False)))
+
+    chart_views = []
+    for name, chart in views:
+        view = QChartView(chart)
+        view.setRenderHint(QPainter.RenderHint.Antialiasing)
+        view.resize(*CHART_SIZE)
+        chart_views.append((name, view))
+
+    written = []
+    if "png" in formats:
+        for name, view in chart_views:
+            path = os.path.join(out_dir, f"{job['label']}_{name}.png")
+            view.grab().save(path, "PNG")
+            written.append(path)
+
+    if "pdf" in formats and chart_views:
+        path = os.path.join(out_dir, f"{job['label']}.pdf")
+        writer = QPdfWriter(path)
+        writer.setPageLayout(QPageLayout(
+            QPageSize(QPageSize.PageSizeId.A4), QPageLayout.Orientation.Landscape,
+            QMarginsF(10, 10, 10, 10)))
+        writer.setResolution(150)
+        painter = QPainter(writer)
+        for i, (_, view) in enumerate(chart_views):
+            if i > 0:
+                writer.newPage()
+            page = painter.viewport()
+            view.render(painter, QRectF(0, 0, page.width(), page.height()))
+        painter.end()
+        written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate analytics reports without opening the GUI.")
+    parser.add_argument("--data-dir", default="data",
+                        help="Directory containing the app's JSON files (default: data)")
+    parser.add_argument("--out", default="reports",
+                        help="Output directory (default: reports)")
+    parser.add_argument("--range", dest="ranges", action="append", type=parse_date_range,
+                        default=[], metavar="START:END",
+                        help="Date range to report on; can be repeated")
+    parser.add_argument("--monthly", type=int, action="append", default=[], metavar="YEAR",
+                        help="One report per month of YEAR; can be repeated")
+    parser.add_argument("--last", type=int, metavar="DAYS",
+                        help="Report on the last DAYS days (default when no range is given: 30)")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["png", "csv"],
+                        help="Output formats (default: png csv)")
+    parser.add_argument("--theme", choices=["dark", "light"],
+                        help="Chart theme (default: the app's saved theme)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes used for rendering")
+    args = parser.parse_args(argv)
+
+    ranges = list(args.ranges)
+    for year in args.monthly:
+        ranges.extend(month_ranges(year))
+    if args.last or not ranges:
+        days = args.last or 30
+        end = date.today()
+        ranges.append((f"last_{days}_days", end - timedelta(days=days - 1), end))
+
+    # --- Load the model once for every range ---
+    model = DataManager(
+        routines_file=os.path.join(args.data_dir, 'routines.json'),
+        progress_file=os.path.join(args.data_dir, 'progress.json'),
+        categories_file=os.path.join(args.data_dir, 'categories.json'),
+        settings_file=os.path.join(args.data_dir, 'settings.json')
+    )
+    jobs = [collect_range_data(model, *r) for r in ranges]
+    model.flush_analytics_cache()
+
+    os.makedirs(args.out, exist_ok=True)
+    written = []
+    if "csv" in args.format:
+        for job in jobs:
+            written.extend(write_csv(job, args.out))
+
+    chart_formats = [f for f in args.format if f in ("png", "pdf")]
+    if chart_formats:
+        from app.utils.theme import THEME_PALETTES
+        theme_name = args.theme or model.load_settings().get("theme", "dark")
+        theme = THEME_PALETTES.get(theme_name, THEME_PALETTES["dark"])
+        categories = model.get_categories()
+        workers = max(1, min(args.jobs, len(jobs)))
+
+        if workers == 1:
+            for job in jobs:
+                written.extend(render_charts(
+                    job, chart_formats, args.out, theme, categories))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_renderer) as pool:
+                futures = [pool.submit(render_charts, job, chart_formats, args.out, theme, categories)
+                           for job in jobs]
+                for future in futures:
+                    written.extend(future.result())
+
+    for path in written:
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
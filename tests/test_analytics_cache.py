@@ -0,0 +1,32 @@
+from app.models.analytics_cache import AnalyticsCache
+
+
+def test_a_changed_fingerprint_is_a_miss(tmp_path):
+    cache = AnalyticsCache(str(tmp_path / "cache.json"))
+    cache.put("progress", "v1", {"2025-01-01": 50})
+    assert cache.get("progress", "v1") == {"2025-01-01": 50}
+    assert cache.get("progress", "v2", default="miss") == "miss"
+
+    cache.put("progress", "v2", {"2025-01-01": 100})
+    assert cache.get("progress", "v1") is None
+    assert cache.get("progress", "v2") == {"2025-01-01": 100}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    value = "x" * 40  # 42 bytes serialized
+    cache = AnalyticsCache(str(tmp_path / "cache.json"), max_bytes=100)
+    cache.put("a", "f", value)
+    cache.put("b", "f", value)
+    assert cache.get("a", "f") == value  # 'b' is now the least recently used
+    cache.put("c", "f", value)
+    assert cache.get("b", "f") is None
+    assert cache.get("a", "f") == value and cache.get("c", "f") == value
+
+
+def test_entries_survive_a_flush_and_reload(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = AnalyticsCache(path)
+    cache.put("streaks", "f", {"current": 3})
+    cache.flush()
+    assert AnalyticsCache(path).get("streaks", "f") == {"current": 3}
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.json"]  # No temp files left
@@ -0,0 +1,54 @@
+import json
+from http.client import HTTPConnection
+
+import pytest
+
+from app.api_server import ApiServer
+from app.models.data_manager import DataManager
+from app.models.records import Task
+
+
+@pytest.fixture
+def api(tmp_path):
+    model = DataManager(*(str(tmp_path / name) for name in (
+        "routines.json", "progress.json", "categories.json", "settings.json")))
+    model.save_routine_for_day("default", [Task("t1", "Run", 420, 480)])
+    server = ApiServer(model, port=0)
+    server.start()
+    yield server
+    server.stop()
+
+
+def request(api, method, path, headers=None, body=None):
+    connection = HTTPConnection("127.0.0.1", api.port, timeout=5)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        raw = response.read()
+        return response.status, response.getheader("ETag"), json.loads(raw) if raw else None
+    finally:
+        connection.close()
+
+
+def test_a_matching_etag_gets_304_until_the_data_changes(api):
+    status, etag, payload = request(api, "GET", "/api/tasks")
+    assert status == 200 and etag and payload["tasks"][0]["id"] == "t1"
+    assert request(api, "GET", "/api/tasks", {"If-None-Match": etag}) == (304, etag, None)
+
+    status, _, _ = request(api, "POST", "/api/tasks/t1/toggle",
+                           {"Content-Type": "application/json"}, b"{}")
+    assert status == 200
+    status, new_etag, payload = request(api, "GET", "/api/tasks", {"If-None-Match": etag})
+    assert status == 200 and new_etag != etag and payload["tasks"][0]["completed"]
+
+
+def test_other_hosts_are_refused(api):
+    status, _, payload = request(api, "GET", "/api/tasks", {"Host": "evil.example:8765"})
+    assert status == 403 and payload == {"error": "Host not allowed."}
+    assert request(api, "GET", "/api/tasks", {"Host": f"localhost:{api.port}"})[0] == 200
+
+
+def test_posts_must_be_json(api):
+    status, _, _ = request(api, "POST", "/api/tasks/t1/toggle",
+                           {"Content-Type": "text/plain"}, b"{}")
+    assert status == 415
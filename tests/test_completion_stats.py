@@ -0,0 +1,47 @@
+import random
+from datetime import date, timedelta
+
+from app.models.completion_stats import CompletionStats
+
+ORIGIN = date(2025, 1, 1)
+END = date(2025, 3, 31)
+TASKS = {"run", "read", "sleep"}
+
+
+def scheduled_for(day: date) -> set:
+    # 'read' only on weekdays, and nothing at all on the 1st of a month
+    if day.day == 1:
+        return set()
+    return TASKS if day.weekday() < 5 else TASKS - {"read"}
+
+
+def build(progress: dict) -> CompletionStats:
+    return CompletionStats(ORIGIN, END, TASKS, scheduled_for, progress)
+
+
+def summary(stats: CompletionStats) -> dict:
+    ranges = [(ORIGIN, END), (date(2025, 2, 10), date(2025, 3, 9)), (END, END)]
+    return {
+        key: (stats.current_streak(key, END), stats.longest_streak(key),
+              [stats.counts(key, start, end) for start, end in ranges],
+              [stats.completion_rate(key, start, end) for start, end in ranges])
+        for key in sorted(TASKS) + [CompletionStats.OVERALL]
+    } | {"skipped": stats.most_skipped(ORIGIN, END)}
+
+
+def test_incremental_toggles_match_a_rebuilt_engine():
+    rng = random.Random(7)
+    days = [ORIGIN + timedelta(days=i) for i in range((END - ORIGIN).days + 1)]
+    progress = {day.isoformat(): sorted(scheduled_for(day)) for day in days[::2]}
+    stats = build(progress)
+
+    for _ in range(300):
+        day, task_id = rng.choice(days), rng.choice(sorted(TASKS))
+        completed = progress.setdefault(day.isoformat(), [])
+        if task_id in completed:
+            completed.remove(task_id)
+        else:
+            completed.append(task_id)
+        stats.apply_toggle(day, task_id, task_id in completed)
+
+    assert summary(stats) == summary(build(progress))
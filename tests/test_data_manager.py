@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from app.models.data_manager import DataManager, ExternalChangeError
+from app.models.records import Task
+
+
+def make_model(data_dir) -> DataManager:
+    return DataManager(*(str(data_dir / name) for name in (
+        "routines.json", "progress.json", "categories.json", "settings.json")))
+
+
+def test_a_refused_save_leaves_memory_unchanged(tmp_path):
+    model = make_model(tmp_path)
+    model.add_category("Reading", "#123456")
+    (tmp_path / "categories.json").write_text(json.dumps([]))  # Another program
+    names = [cat.name for cat in model.get_categories()]
+    versions = model.get_versions()
+
+    with pytest.raises(ExternalChangeError):
+        model.add_category("Music", "#654321")
+    with pytest.raises(ExternalChangeError):
+        model.delete_category(model.get_categories()[-1].id)
+    assert [cat.name for cat in model.get_categories()] == names
+    assert model.get_versions() == versions
+    assert not model.category_name_taken("Music")
+
+
+def _template(*categories):
+    return [Task(f"t{n}", f"Task {n}", 60 * n, 60 * n + 30, category=category)
+            for n, category in enumerate(categories)]
+
+
+def test_merge_reassigns_every_template_and_removes_the_sources(tmp_path):
+    model = make_model(tmp_path)
+    a = model.add_category("A", "#111111").id
+    b = model.add_category("B", "#222222").id
+    model.save_routine_for_day("default", _template(a, b, "cat-003"))
+    model.save_routine_for_day("Sunday", _template(b))
+
+    assert model.merge_categories([a, b], "cat-003") == 3
+    reloaded = make_model(tmp_path)
+    for store in (model, reloaded):
+        assert {cat.id for cat in store.get_categories()}.isdisjoint({a, b})
+        assert [t.category for t in store.get_routine_for_day("default")] == ["cat-003"] * 3
+        assert [t.category for t in store.get_routine_for_day("Sunday")] == ["cat-003"]
+
+
+def test_delete_moves_tasks_to_uncategorized(tmp_path):
+    model = make_model(tmp_path)
+    reading = model.add_category("Reading", "#111111").id
+    model.save_routine_for_day("default", _template(reading, "cat-003"))
+
+    assert model.delete_category(reading) == 1
+    categories = [t.category for t in make_model(tmp_path).get_routine_for_day("default")]
+    assert categories == [model.get_uncategorized_id(), "cat-003"]
+
+
+def test_a_failed_routines_write_keeps_the_tasks_categories(tmp_path, monkeypatch):
+    model = make_model(tmp_path)
+    source = model.add_category("Reading", "#111111").id
+    model.save_routine_for_day("default", _template(source))
+
+    def fail():
+        raise OSError("disk full")
+    monkeypatch.setattr(model, "_save_routines", fail)
+    with pytest.raises(OSError):
+        model.merge_categories([source], "cat-003")
+    # categories.json was written first; routines.json and memory agree
+    assert source not in {cat.id for cat in make_model(tmp_path).get_categories()}
+    assert [t.category for t in model.get_routine_for_day("default")] == [source]
+    assert [t.category for t in make_model(tmp_path).get_routine_for_day("default")] == [source]
@@ -0,0 +1,21 @@
+from app.models.intervals import IntervalIndex
+from app.models.records import Task
+
+
+def index(*spans):
+    return IntervalIndex([Task(id=f"t{i}", name=f"Task {i}", start_minutes=start, end_minutes=end)
+                          for i, (start, end) in enumerate(spans)])
+
+
+def test_first_free_slot_after_short_early_morning_part_of_overnight_gap():
+    # Free 20:00-03:20; from 01:40 only 100 minutes remain before 03:20
+    assert index((200, 1200)).first_free_slot(120, after=100) == (1200, 1320)
+
+
+def test_first_free_slot_wraps_past_other_full_gaps():
+    assert index((200, 600), (700, 1200)).first_free_slot(150, after=100) == (1200, 1350)
+
+
+def test_first_free_slot_still_prefers_later_today():
+    assert index((200, 600), (700, 1200)).first_free_slot(60, after=100) == (100, 160)
+    assert index((200, 1200)).first_free_slot(500, after=100) is None
@@ -0,0 +1,32 @@
+from app.models.records import Task
+
+
+def test_unparseable_times_are_written_back_unchanged():
+    data = {"id": "t1", "name": "Run", "start_time": "7am", "end_time": "25:00",
+            "notes": "", "category": "cat-001"}
+    task = Task.from_dict(data)
+    assert task.start_minutes is None and task.end_minutes is None
+    assert Task.from_dict(task.to_dict()).to_dict() == data
+
+
+def test_setting_a_time_replaces_the_unparsed_value():
+    task = Task.from_dict({"id": "t1", "name": "Run", "start_time": "7am", "end_time": None})
+    task.set_times(7 * 60, 8 * 60)
+    data = task.to_dict()
+    assert (data["start_time"], data["end_time"]) == ("07:00", "08:00")
+    assert Task.from_dict({"id": "t2", "start_time": "09:30"}).to_dict()["start_time"] == "09:30"
+
+
+def test_keys_missing_from_the_file_are_not_written_as_null():
+    data = {"id": "t1", "name": "Run", "start_time": "07:00", "end_time": "08:00"}
+    task = Task.from_dict(data)
+    assert task.to_dict() == data
+    assert task.copy().to_dict() == data
+
+
+def test_a_missing_key_is_written_once_it_gets_a_value():
+    task = Task.from_dict({"id": "t1", "name": "Run"})
+    task.update({"notes": "Easy pace", "category": "cat-002"})
+    data = task.to_dict()
+    assert (data["notes"], data["category"]) == ("Easy pace", "cat-002")
+    assert "start_time" not in data
@@ -0,0 +1,31 @@
+import json
+from datetime import date
+
+from app.models.data_manager import DataManager
+from app.models.recurrence import RecurrenceIndex
+
+
+def test_first_listed_interval_rule_wins_across_periods():
+    rules = [
+        {"type": "interval", "every": 2, "start": "2025-01-02", "template": "A"},
+        {"type": "interval", "every": 3, "start": "2025-01-01", "template": "B"},
+        {"type": "interval", "every": 2, "start": "2025-01-01", "template": "C"},
+    ]
+    index = RecurrenceIndex(rules, ["default", "A", "B", "C"])
+    assert index.resolve(date(2025, 1, 7)) == "B"  # B and C match; B is listed first
+    assert index.resolve(date(2025, 1, 4)) == "A"  # A and B match; A is listed first
+    assert index.resolve(date(2025, 1, 3)) == "C"  # Only C matches
+
+
+def test_invalid_rules_in_the_file_are_skipped(tmp_path, capsys):
+    rules = [
+        {"type": "monthly", "day": 40, "template": "A"},
+        {"type": "date", "date": "2025-01-05", "template": "A"},
+        "not a rule",
+    ]
+    (tmp_path / "recurrence.json").write_text(json.dumps(rules))
+    model = DataManager(*(str(tmp_path / name) for name in (
+        "routines.json", "progress.json", "categories.json", "settings.json")))
+    assert model.get_recurrence_rules() == [rules[1]]
+    warnings = capsys.readouterr().err
+    assert "rule 1" in warnings and "rule 3" in warnings